@@ -1,5 +1,5 @@
 import argparse
-from lib.operations import copy_files
+from lib.operations import HARDLINKS, HARDLINKS_LINK, copy_files
 
 
 def main():
@@ -9,9 +9,16 @@ def main():
     parser.add_argument(
         "--copy-list", help="Path to the copy list CSV file", required=True
     )
+    parser.add_argument(
+        "--hardlinks",
+        help="How to handle files that are hard links of another file in the list: "
+        "link them to its copy, skip them or copy them like any other file",
+        choices=HARDLINKS,
+        default=HARDLINKS_LINK,
+    )
     args = parser.parse_args()
 
-    copy_files(args.copy_list)
+    copy_files(args.copy_list, hardlinks=args.hardlinks)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,77 @@
 import argparse
+from lib.get_file_creation_date.file_type import FILE_TYPES
+from lib.get_file_creation_date.get_file_creation_date import (
+    DEFAULT_REGISTRY,
+    STRATEGIES,
+    STRATEGY_OLDEST,
+)
 from lib.operations import generate_copy_list
+from lib.scan_filter import CONFIG_KEYS, ScanFilter, read_scan_rules
+
+
+def _parse_route(value):
+    """Parses PROVIDER=TYPE[,TYPE...] or PROVIDER=all into (provider, file types)."""
+    provider_name, separator, file_types = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected PROVIDER=TYPES, got '{value}'")
+    if provider_name not in DEFAULT_REGISTRY.provider_names:
+        raise argparse.ArgumentTypeError(
+            f"unknown provider '{provider_name}', "
+            f"choose from {', '.join(DEFAULT_REGISTRY.provider_names)}"
+        )
+    if file_types == "all":
+        return provider_name, None
+
+    file_types = [file_type for file_type in file_types.split(",") if file_type]
+    unknown = [file_type for file_type in file_types if file_type not in FILE_TYPES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown file types {', '.join(unknown)}, "
+            f"choose from {', '.join(FILE_TYPES)}"
+        )
+    return provider_name, file_types
+
+
+def _parse_timeout(value):
+    """Parses SECONDS or PROVIDER=SECONDS into (provider or None, seconds)."""
+    provider_name, separator, seconds = value.rpartition("=")
+    if separator and provider_name not in DEFAULT_REGISTRY.provider_names:
+        raise argparse.ArgumentTypeError(
+            f"unknown provider '{provider_name}', "
+            f"choose from {', '.join(DEFAULT_REGISTRY.provider_names)}"
+        )
+    try:
+        seconds = float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of seconds '{seconds}'")
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"timeout must be positive, got {seconds}")
+    return provider_name or None, seconds
+
+
+def _read_config(path):
+    """Reads the scan rules of a config file."""
+    try:
+        return read_scan_rules(path)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _split_list(value):
+    """Parses VALUE[,VALUE...] into a list."""
+    return [item for item in value.split(",") if item]
+
+
+def _build_scan_filter(args):
+    """Combines the scan rules of the config file and the command line."""
+    rules = args.config or {}
+    scan_filter = ScanFilter(
+        **{
+            key: rules.get(key, []) + sum(getattr(args, key) or [], [])
+            for key in CONFIG_KEYS
+        }
+    )
+    return scan_filter or None
 
 
 def main():
@@ -16,9 +88,132 @@ def main():
     parser.add_argument(
         "--destination", help="The root destination directory", required=True
     )
+    parser.add_argument(
+        "--workers",
+        help="Number of worker processes used for date extraction",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--scan-threads",
+        help="Number of threads listing directories concurrently, which speeds up "
+        "scanning network shares",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--source-jobs",
+        help="Number of sources processed at the same time, each with its own "
+        "workers",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--jobs-per-device",
+        help="Number of sources on the same device processed at the same time",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--max-depth",
+        help="Number of directory levels below each source to scan "
+        "(0 for only the files directly in the source)",
+        type=int,
+    )
+    parser.add_argument(
+        "--one-file-system",
+        help="Do not scan directories on other file systems than the source, "
+        "e.g. mounted drives",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--include",
+        help="Only analyze files matching one of these globs, e.g. IMG_* "
+        "(comma-separated, can be repeated)",
+        type=_split_list,
+        action="append",
+        metavar="GLOB[,GLOB...]",
+    )
+    parser.add_argument(
+        "--exclude",
+        help="Skip files and directories matching one of these globs, e.g. @eaDir "
+        "or photos/cache (comma-separated, can be repeated)",
+        type=_split_list,
+        action="append",
+        metavar="GLOB[,GLOB...]",
+    )
+    parser.add_argument(
+        "--extensions",
+        help="Only analyze files with one of these extensions, e.g. jpg,heic,mp4 "
+        "(can be repeated)",
+        type=_split_list,
+        action="append",
+        metavar="EXT[,EXT...]",
+    )
+    parser.add_argument(
+        "--exclude-extensions",
+        help="Skip files with one of these extensions (can be repeated)",
+        type=_split_list,
+        action="append",
+        metavar="EXT[,EXT...]",
+    )
+    parser.add_argument(
+        "--config",
+        help="INI file with include, exclude, extensions and exclude_extensions "
+        "lists in a [scan] section, combined with the options above",
+        type=_read_config,
+    )
+    parser.add_argument(
+        "--strategy",
+        help="How to choose among the dates found by the providers",
+        choices=STRATEGIES,
+        default=STRATEGY_OLDEST,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of a persistent cache that reuses dates of unchanged files",
+    )
+    parser.add_argument(
+        "--retry-undated",
+        help="Analyze files again that had no date in a previous run",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--route",
+        help="Only ask a provider for the given file types, e.g. "
+        "HachoirFileCreationDateProvider=jpeg,isobmff or "
+        "HachoirFileCreationDateProvider=all (can be repeated)",
+        type=_parse_route,
+        action="append",
+        metavar="PROVIDER=TYPES",
+    )
+    parser.add_argument(
+        "--provider-timeout",
+        help="Kill a provider that takes longer than this many seconds for a file, "
+        "for all providers (SECONDS) or a single one "
+        "(e.g. HachoirFileCreationDateProvider=10, can be repeated)",
+        type=_parse_timeout,
+        action="append",
+        metavar="[PROVIDER=]SECONDS",
+    )
     args = parser.parse_args()
 
-    generate_copy_list(args.source, args.destination)
+    generate_copy_list(
+        args.source,
+        args.destination,
+        workers=args.workers,
+        strategy=args.strategy,
+        cache_dir=args.cache_dir,
+        retry_undated=args.retry_undated,
+        routes=dict(args.route) if args.route else None,
+        timeouts=dict(args.provider_timeout) if args.provider_timeout else None,
+        scan_threads=args.scan_threads,
+        max_depth=args.max_depth,
+        one_file_system=args.one_file_system,
+        scan_filter=_build_scan_filter(args),
+        source_jobs=args.source_jobs,
+        jobs_per_device=args.jobs_per_device,
+    )
 
 
 if __name__ == "__main__":
@@ -1,26 +1,145 @@
 import re
 import logging
-from datetime import datetime
-from typing import Optional
+import string
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Tuple
 
 try:
     from dateutil import parser as dateutil_parser
+    from dateutil import tz
 
     DATEUTIL_AVAILABLE = True
 except ImportError:
     DATEUTIL_AVAILABLE = False
 
+# Dates outside of this range are considered wrong
+MIN_YEAR = 1980
+MAX_YEAR = 2050
+
+_DIGIT = re.compile(r"\d")
+_DIGIT_GROUP = re.compile(r"\d+")
+_MONTH_NAME = re.compile(
+    r"jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec", re.IGNORECASE
+)
+
+# Maps a text to its shape, e.g. "IMG_20230312.jpg" to "aaa_99999999.aaa"
+_SHAPE_TABLE = str.maketrans(
+    string.digits + string.ascii_letters,
+    "9" * len(string.digits) + "a" * len(string.ascii_letters),
+)
+
+# Parts of a regex that are rewritten to match shapes: escapes are kept,
+# letters and digits are replaced, also inside character classes
+_REGEX_PART = re.compile(r"(\\.)|(\[[^\]]*\])|([A-Za-z])|([0-9])")
+
+# Widths of the fields of fixed-width formats, in the order datetime takes them
+_FIELD_WIDTHS = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+
+# Number of shapes whose strategy is remembered
+SHAPE_CACHE_SIZE = 4096
+
+
+class ShapeCacheInfo(NamedTuple):
+    """Statistics of the shape cache of a DateParser."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _shape(text: str) -> str:
+    """Returns the shape of a text, with digits replaced by 9 and letters by a."""
+    return text.translate(_SHAPE_TABLE)
+
+
+def _may_contain_date(text: str) -> bool:
+    """
+    Checks cheaply if dateutil could find a month and a day in a text.
+
+    That needs two groups of digits, a group long enough to hold a whole date
+    (e.g. "050623") or digits next to a month name. A single short group of
+    digits only ever matches today's month or day by chance.
+    """
+    groups = _DIGIT_GROUP.findall(text)
+    if len(groups) > 1:
+        return True
+    if groups and len(groups[0]) >= 6:
+        return True
+    return bool(groups and _MONTH_NAME.search(text))
+
+
+def _fixed_width_fields(
+    fmt: str,
+) -> Optional[Tuple[int, Tuple[Tuple[int, int], ...]]]:
+    """
+    Returns the length of texts in a fixed-width format and the slices of their
+    fields, in the order datetime takes them.
+
+    Returns None if the format has other directives or does not contain year,
+    month and day.
+    """
+    order = list(_FIELD_WIDTHS)
+    fields = []
+    position = 0
+    for directive, _ in re.findall(r"%(.)|([^%])", fmt):
+        if not directive:
+            position += 1
+            continue
+        if directive not in _FIELD_WIDTHS:
+            return None
+        width = _FIELD_WIDTHS[directive]
+        fields.append((order.index(directive), position, position + width))
+        position += width
+
+    fields.sort()
+    if len(fields) < 3 or [field for field, _, _ in fields] != list(range(len(fields))):
+        return None
+    return position, tuple((start, end) for _, start, end in fields)
+
+
+def _shape_pattern(pattern: str) -> str:
+    """
+    Rewrites a date pattern to match the shapes of the texts it matches.
+
+    Every character the pattern matches is turned into one the rewritten pattern
+    matches, and word characters stay word characters, so a pattern can only
+    match a text where the rewritten one matches its shape.
+    """
+
+    def rewrite(match):
+        escape, char_class, letter, digit = match.groups()
+        if escape:
+            return escape
+        if char_class:
+            char_class = re.sub(r"[0-9]-[0-9]|[0-9]", "9", char_class)
+            return re.sub(r"[A-Za-z]", "a", char_class)
+        return "a" if letter else "9"
+
+    return _REGEX_PART.sub(rewrite, pattern)
+
 
 class DateParser:
     """
     Enhanced date parser supporting multiple formats and patterns.
     """
 
-    def __init__(self):
-        """Initialize the enhanced date parser."""
+    def __init__(self, cache_size: int = SHAPE_CACHE_SIZE):
+        """
+        Initialize the enhanced date parser.
+
+        Args:
+            cache_size: Number of text shapes whose strategy is remembered, 0 to
+                disable the shape cache.
+        """
         self.logger = logging.getLogger(__name__)
 
-        if not DATEUTIL_AVAILABLE:
+        if DATEUTIL_AVAILABLE:
+            # Define tzinfos for "MTS" to use the local system timezone
+            self.tzinfos = {"MTS": tz.tzlocal()}
+        else:
             self.logger.warning(
                 "dateutil not available. Install with: pip install python-dateutil"
             )
@@ -55,65 +174,227 @@ class DateParser:
             (re.compile(pattern, re.IGNORECASE), fmt) for pattern, fmt in self.patterns
         ]
 
-    def parse(self, text: str) -> Optional[datetime]:
+        # The patterns only match fixed-width dates, which are sliced into their
+        # fields instead of being parsed with the slower strptime
+        self.fixed_width_fields = {
+            fmt: _fixed_width_fields(fmt) for _, fmt in self.patterns
+        }
+
+        # All patterns combined into one alternation, each in its own group. A
+        # single search finds the leftmost position where any pattern matches,
+        # and the group tells the first pattern in the list that matches there.
+        self._pattern_groups = []
+        alternatives = []
+        group = 1
+        for pattern, _ in self.compiled_patterns:
+            alternatives.append(f"({pattern.pattern})")
+            self._pattern_groups.append(group)
+            group += 1 + pattern.groups
+        self._group_patterns = {g: i for i, g in enumerate(self._pattern_groups)}
+        self.combined_pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+        # Texts of the same shape, e.g. names written by the same camera, can only
+        # be matched by the same patterns at the same positions. The first pattern
+        # that can match a shape (and the only position where it can) is worked
+        # out once per shape, so later texts skip all other patterns.
+        self.shape_patterns = [
+            re.compile(_shape_pattern(pattern.pattern))
+            for pattern, _ in self.compiled_patterns
+        ]
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._strategies = OrderedDict()
+        self._strategies_lock = threading.Lock()
+
+    def parse(self, text: str, use_dateutil: bool = True) -> Optional[datetime]:
         """
         Parse date from text using multiple strategies.
+
+        Args:
+            text: The text to find a date in.
+            use_dateutil: Whether to fall back to dateutil's fuzzy parsing if
+                none of the patterns match.
         """
-        if not text:
+        # Every supported date contains at least one digit
+        if not text or not _DIGIT.search(text):
             return None
 
         # Strategy 1: Try regex patterns
-        result = self._parse_with_patterns(text)
+        strategy = self._get_strategy(text)
+        if strategy:
+            result = self._parse_with_strategy(text, *strategy)
+        else:
+            result = self._parse_with_patterns(text)
         if result:
             return result
 
-        # Strategy 2: Try dateutil parser (if available)
-        if DATEUTIL_AVAILABLE:
+        # Strategy 2: Try dateutil parser (if available and worth it)
+        if use_dateutil and DATEUTIL_AVAILABLE and _may_contain_date(text):
             result = self._parse_with_dateutil(text)
             if result:
                 return result
 
         return None
 
+    def cache_info(self) -> ShapeCacheInfo:
+        """Returns the hits, misses and size of the shape cache."""
+        return ShapeCacheInfo(
+            self.cache_hits, self.cache_misses, self.cache_size, len(self._strategies)
+        )
+
+    def _get_strategy(self, text: str) -> Optional[Tuple[Optional[int], int]]:
+        """
+        Returns the strategy for the shape of a text, from the cache if possible.
+
+        The strategy is the index of the first pattern that can match the shape
+        (None if none can) and the only position where it can match (None if
+        there are several). Texts that are not ASCII are not cached, as the
+        patterns ignore case and some other letters fold to ASCII ones.
+        """
+        if not self.cache_size or not text.isascii():
+            return None
+
+        shape = _shape(text)
+        with self._strategies_lock:
+            strategy = self._strategies.get(shape)
+            if strategy is not None:
+                self._strategies.move_to_end(shape)
+                self.cache_hits += 1
+                return strategy
+            self.cache_misses += 1
+
+        strategy = self._find_strategy(shape)
+        with self._strategies_lock:
+            self._strategies[shape] = strategy
+            if len(self._strategies) > self.cache_size:
+                self._strategies.popitem(last=False)
+        return strategy
+
+    def _find_strategy(self, shape: str) -> Tuple[Optional[int], Optional[int]]:
+        """Works out the first pattern that can match a shape, and where."""
+        for index, shape_pattern in enumerate(self.shape_patterns):
+            match = shape_pattern.search(shape)
+            if match:
+                position = match.start()
+                if shape_pattern.search(shape, position + 1):
+                    position = None
+                return index, position
+        return None, None
+
+    def _parse_with_strategy(
+        self, text: str, index: Optional[int], position: Optional[int]
+    ) -> Optional[datetime]:
+        """
+        Parse using the patterns that can match the shape of the text.
+
+        Gives the same result as _parse_with_patterns, as the patterns before the
+        given one cannot match the text.
+        """
+        if index is None or "20" not in text:
+            return None
+
+        pattern, fmt = self.compiled_patterns[index]
+        if position is None:
+            match = pattern.search(text)
+        else:
+            match = pattern.match(text, position)
+        if match:
+            parsed_date = self._build_date(match.groups(), fmt, pattern)
+            if parsed_date:
+                return parsed_date
+
+        return self._parse_with_patterns_sequentially(text, index + 1)
+
     def _parse_with_patterns(self, text: str) -> Optional[datetime]:
-        """Parse using predefined regex patterns."""
-        for pattern, fmt in self.compiled_patterns:
+        """
+        Parse using predefined regex patterns.
+
+        The result is the same as trying the patterns one after another and taking
+        the first one whose leftmost match is a valid date. The combined pattern
+        finds the leftmost match of all patterns in one search, so texts without
+        any match are rejected at once, and only the patterns listed before the
+        one that matched still have to be tried.
+        """
+        # Every pattern contains a year starting with "20"
+        if "20" not in text:
+            return None
+
+        match = self.combined_pattern.search(text)
+        if not match:
+            return None
+        index = self._group_patterns[match.lastindex]
+
+        # Earlier patterns take precedence even if they match further right
+        for earlier in range(index):
+            pattern, fmt = self.compiled_patterns[earlier]
+            earlier_match = pattern.search(text)
+            if earlier_match:
+                parsed_date = self._build_date(earlier_match.groups(), fmt, pattern)
+                if parsed_date:
+                    return parsed_date
+                return self._parse_with_patterns_sequentially(text, earlier + 1)
+
+        # Nothing matches before the leftmost match, so it is the pattern's own
+        pattern, fmt = self.compiled_patterns[index]
+        group = self._pattern_groups[index]
+        parsed_date = self._build_date(
+            match.groups()[group : group + pattern.groups], fmt, pattern
+        )
+        if parsed_date:
+            return parsed_date
+        return self._parse_with_patterns_sequentially(text, index + 1)
+
+    def _parse_with_patterns_sequentially(
+        self, text: str, start: int = 0
+    ) -> Optional[datetime]:
+        """Parse by trying the regex patterns one after another, from start on."""
+        for pattern, fmt in self.compiled_patterns[start:]:
             match = pattern.search(text)
             if match:
-                try:
-                    # Handle combined date and time
-                    if len(match.groups()) > 1:
-                        date_str = " ".join(match.groups())
-                    else:
-                        date_str = match.group(1)
-
-                    # Handle special case where format needs underscore
-                    if "_" in fmt and " " in date_str:
-                        date_str = date_str.replace(" ", "_")
-
-                    parsed_date = datetime.strptime(date_str, fmt)
-
-                    if 1980 <= parsed_date.year <= 2050:
-                        self.logger.debug(
-                            f"Parsed '{date_str}' with pattern '{pattern.pattern}'"
-                        )
-                        return parsed_date
-                except (ValueError, IndexError):
-                    continue
+                parsed_date = self._build_date(match.groups(), fmt, pattern)
+                if parsed_date:
+                    return parsed_date
         return None
 
-    def _parse_with_dateutil(self, text: str) -> Optional[datetime]:
-        """Parse using dateutil's flexible parser."""
+    def _build_date(
+        self, groups: Tuple[str, ...], fmt: str, pattern: re.Pattern
+    ) -> Optional[datetime]:
+        """Turns the groups matched by a pattern into a date, if it is valid."""
         try:
-            from dateutil import tz
-            from dateutil.parser import parse as dateutil_parse_func
+            # Handle combined date and time
+            if len(groups) > 1:
+                date_str = " ".join(groups)
+            else:
+                date_str = groups[0]
 
-            # Define tzinfos for "MTS" to use the local system timezone
-            tzinfos = {"MTS": tz.tzlocal()}
+            # Handle special case where format needs underscore
+            if "_" in fmt and " " in date_str:
+                date_str = date_str.replace(" ", "_")
+
+            fixed_width = self.fixed_width_fields.get(fmt)
+            if fixed_width and len(date_str) == fixed_width[0]:
+                parsed_date = datetime(
+                    *[int(date_str[start:end]) for start, end in fixed_width[1]]
+                )
+            else:
+                parsed_date = datetime.strptime(date_str, fmt)
 
+            if MIN_YEAR <= parsed_date.year <= MAX_YEAR:
+                self.logger.debug(
+                    f"Parsed '{date_str}' with pattern '{pattern.pattern}'"
+                )
+                return parsed_date
+        except (ValueError, IndexError):
+            pass
+        return None
+
+    def _parse_with_dateutil(self, text: str) -> Optional[datetime]:
+        """Parse using dateutil's flexible parser."""
+        try:
             # Use fuzzy parsing to find a date within the string
-            parsed_date, fuzzy_tokens = dateutil_parse_func(
-                text, fuzzy_with_tokens=True, tzinfos=tzinfos
+            parsed_date, fuzzy_tokens = dateutil_parser.parse(
+                text, fuzzy_with_tokens=True, tzinfos=self.tzinfos
             )
 
             # Reconstruct the string that was actually parsed
@@ -135,7 +416,7 @@ class DateParser:
             day_present = str(parsed_date.day) in parsed_string
 
             if month_present and day_present:
-                if 1980 <= parsed_date.year <= 2050:
+                if MIN_YEAR <= parsed_date.year <= MAX_YEAR:
                     self.logger.debug(f"Parsed '{text}' using dateutil")
                     return parsed_date
 
@@ -147,8 +428,30 @@ class DateParser:
 _default_parser = DateParser()
 
 
-def parse_date(text: str) -> Optional[datetime]:
+def parse_date(text: str, use_dateutil: bool = True) -> Optional[datetime]:
     """
     Parses a date from a string using the default EnhancedDateParser instance.
     """
-    return _default_parser.parse(text)
+    return _default_parser.parse(text, use_dateutil)
+
+
+def parse_date_cache_info() -> ShapeCacheInfo:
+    """
+    Returns the shape cache statistics of the default EnhancedDateParser instance.
+    """
+    return _default_parser.cache_info()
+
+
+def date_from_value(value: date) -> Optional[datetime]:
+    """
+    Turns a date or datetime read from metadata into a naive datetime, without a
+    round trip through text. Returns None for dates outside the supported range.
+
+    Like dates parsed from text, the result has no time zone (the local time of
+    the value is kept) and no fractional seconds.
+    """
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if not MIN_YEAR <= value.year <= MAX_YEAR:
+        return None
+    return value.replace(microsecond=0, tzinfo=None)
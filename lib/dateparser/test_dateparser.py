@@ -1,7 +1,50 @@
-from datetime import datetime
-from unittest import TestCase, main
+import random
+import re
+from datetime import date, datetime, timedelta, timezone
+from unittest import TestCase, main, skipUnless
+from unittest.mock import patch
 
-from lib.dateparser.dateparser import parse_date
+from lib.dateparser.dateparser import (
+    DATEUTIL_AVAILABLE,
+    DateParser,
+    date_from_value,
+    parse_date,
+)
+
+
+def _corpus(size, seed=0):
+    """Generates file names mixing valid, invalid and partial dates."""
+    rng = random.Random(seed)
+    prefixes = ["", "IMG", "IMG_", "img-", "VID_", "Screenshot_", "scan ", "x", "_"]
+    separators = ["", "-", "_", ".", " ", "T"]
+    suffixes = ["", ".jpg", ".mp4", "_final", "-WA0001", " (1)", "x"]
+
+    def number(digits):
+        return "".join(rng.choice("0123456789") for _ in range(digits))
+
+    def date():
+        year = "20%d%d" % (rng.randint(0, 3), rng.randint(0, 9))
+        year = rng.choice([year, year, "19" + number(2), number(4)])
+        month = rng.choice(["%02d" % rng.randint(0, 13), number(2)])
+        day = rng.choice(["%02d" % rng.randint(0, 32), number(2)])
+        sep = rng.choice(separators)
+        parts = [year, month, day]
+        if rng.random() < 0.3:
+            parts.reverse()
+        text = sep.join(parts)
+        if rng.random() < 0.5:
+            text += rng.choice(["_", "T", " ", "-"])
+            text += rng.choice([":", ""]).join(number(2) for _ in range(3))
+        return text
+
+    corpus = []
+    for _ in range(size):
+        pieces = [rng.choice(prefixes)]
+        for _ in range(rng.randint(0, 3)):
+            pieces.append(rng.choice([date, lambda: number(rng.randint(1, 9))])())
+            pieces.append(rng.choice(separators + suffixes))
+        corpus.append("".join(pieces))
+    return corpus
 
 
 class TestEnhancedDateParser(TestCase):
@@ -68,5 +111,193 @@ class TestEnhancedDateParser(TestCase):
         self.assertIsNone(parse_date(None))
 
 
+class TestDateFromValue(TestCase):
+    def test_datetime(self):
+        """Test that datetimes lose their time zone and fractional seconds."""
+        value = datetime(2023, 5, 14, 10, 15, 0, 123, timezone(timedelta(hours=2)))
+
+        self.assertEqual(date_from_value(value), datetime(2023, 5, 14, 10, 15))
+        self.assertEqual(date_from_value(value), parse_date(str(value)))
+
+    def test_date(self):
+        """Test that dates become datetimes at midnight."""
+        self.assertEqual(date_from_value(date(2023, 5, 14)), datetime(2023, 5, 14))
+
+    def test_out_of_range(self):
+        """Test that dates outside the supported range are rejected."""
+        self.assertIsNone(date_from_value(datetime(1904, 1, 1)))
+        self.assertIsNone(date_from_value(date(2107, 1, 1)))
+
+
+class TestDateutilFallback(TestCase):
+    def setUp(self):
+        """Set up a parser."""
+        self.parser = DateParser()
+
+    def test_text_without_date_material_skips_dateutil(self):
+        """Test that dateutil is not tried on texts that cannot hold a date."""
+        with patch.object(
+            self.parser, "_parse_with_dateutil", side_effect=AssertionError
+        ):
+            for text in ["holiday_beach_final.jpg", "IMG_1234.jpg", "DSC01234.JPG"]:
+                with self.subTest(text=text):
+                    self.assertIsNone(self.parser.parse(text))
+
+    def test_single_short_number_is_not_a_date(self):
+        """Test that a lone day or month is not completed with today's date."""
+        self.assertIsNone(self.parser.parse("10"))
+
+    @skipUnless(DATEUTIL_AVAILABLE, "dateutil is not installed")
+    def test_text_with_date_material_uses_dateutil(self):
+        """Test that month names and several numbers are still parsed."""
+        self.assertEqual(self.parser.parse("Party March 5 2021"), datetime(2021, 3, 5))
+        self.assertEqual(self.parser.parse("050621.jpg"), datetime(2021, 5, 6))
+
+    def test_dateutil_can_be_disabled(self):
+        """Test that dateutil is not used if the caller opts out."""
+        self.assertIsNone(self.parser.parse("Party March 5 2021", False))
+        self.assertEqual(
+            self.parser.parse("party 2021-03-05.jpg", False), datetime(2021, 3, 5)
+        )
+
+
+class TestCombinedPatterns(TestCase):
+    def setUp(self):
+        """Set up a parser."""
+        self.parser = DateParser()
+
+    def test_same_result_as_sequential_patterns(self):
+        """Test that the combined pattern keeps the priority of the patterns."""
+        for text in _corpus(20000):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.parser._parse_with_patterns(text),
+                    self.parser._parse_with_patterns_sequentially(text),
+                )
+
+    def test_invalid_match_falls_back_to_later_patterns(self):
+        """Test that an invalid date does not hide valid matches of later patterns."""
+        self.assertEqual(
+            self.parser._parse_with_patterns("20211340 2019-07-04"),
+            datetime(2019, 7, 4),
+        )
+
+    def test_text_without_year_is_skipped(self):
+        """Test that texts that cannot contain a year are not scanned."""
+        self.assertIsNone(self.parser._parse_with_patterns("IMG_1999_05_21.jpg"))
+
+    def test_same_result_without_prefilter(self):
+        """Test that the digit prefilter only skips texts without any date."""
+        for text in _corpus(1000, seed=1) + ["March", "Dec first", "no date"]:
+            expected = self.parser._parse_with_patterns_sequentially(text)
+            if expected is None and DATEUTIL_AVAILABLE:
+                expected = self.parser._parse_with_dateutil(text)
+            with self.subTest(text=text):
+                self.assertEqual(self.parser.parse(text), expected)
+
+
+class TestFixedWidthDates(TestCase):
+    def test_same_result_as_strptime(self):
+        """Test that slicing fixed-width dates agrees with strptime."""
+        parser = DateParser()
+        rng = random.Random(3)
+        widths = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+        maxima = {"Y": 2100, "m": 13, "d": 32, "H": 25, "M": 60, "S": 60}
+
+        for pattern, fmt in parser.compiled_patterns:
+            for _ in range(2000):
+                date_str = re.sub(
+                    r"%(.)",
+                    lambda m: str(rng.randint(0, maxima[m[1]])).zfill(widths[m[1]]),
+                    fmt,
+                )
+                try:
+                    expected = datetime.strptime(date_str, fmt)
+                    if not 1980 <= expected.year <= 2050:
+                        expected = None
+                except ValueError:
+                    expected = None
+                with self.subTest(date_str=date_str, fmt=fmt):
+                    self.assertEqual(
+                        parser._build_date((date_str,), fmt, pattern), expected
+                    )
+
+    def test_other_formats_use_strptime(self):
+        """Test that formats that are not fixed-width are still parsed."""
+        parser = DateParser()
+        pattern = re.compile(r"(\d+ \w+ 20\d\d)")
+
+        self.assertIsNone(parser.fixed_width_fields.get("%d %B %Y"))
+        self.assertEqual(
+            parser._build_date(("5 March 2021",), "%d %B %Y", pattern),
+            datetime(2021, 3, 5),
+        )
+
+
+class TestShapeCache(TestCase):
+    def setUp(self):
+        """Set up a parser with and one without the shape cache."""
+        self.parser = DateParser()
+        self.uncached_parser = DateParser(cache_size=0)
+
+    def test_same_result_as_uncached_parser(self):
+        """Test that remembered strategies do not change any result."""
+        corpus = _corpus(2000, seed=2)
+        for text in corpus + corpus:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.parser.parse(text), self.uncached_parser.parse(text)
+                )
+        self.assertGreater(self.parser.cache_info().hits, len(corpus) // 2)
+
+    def test_same_shape_uses_remembered_strategy(self):
+        """Test that texts of the same shape hit the cache."""
+        self.assertEqual(
+            self.parser.parse("IMG_20230312_123456.jpg"),
+            datetime(2023, 3, 12, 12, 34, 56),
+        )
+        self.assertEqual(
+            self.parser.parse("PXL_20240101_000000.jpg"), datetime(2024, 1, 1)
+        )
+        self.assertEqual(self.parser.cache_info(), (1, 1, 4096, 1))
+
+    def test_earlier_patterns_that_cannot_match_are_skipped(self):
+        """Test that a remembered strategy only tries the patterns that can match."""
+        self.parser.parse("IMG-20201105-WA0001.jpg")
+
+        with patch.object(
+            self.parser, "_parse_with_patterns", side_effect=AssertionError
+        ):
+            self.assertEqual(
+                self.parser.parse("VID-20210901-WA0000.mp4"), datetime(2021, 9, 1)
+            )
+            self.assertEqual(
+                self.parser.parse("VID-20211301-WA0000.mp4"),
+                self.uncached_parser.parse("VID-20211301-WA0000.mp4"),
+            )
+
+    def test_least_recently_used_shapes_are_evicted(self):
+        """Test that the cache does not grow beyond its size."""
+        parser = DateParser(cache_size=2)
+        for text in ["2023-01-02.jpg", "20230102.jpg", "2023-01-02.jpg", "2023_01_02"]:
+            parser.parse(text)
+
+        self.assertEqual(parser.cache_info(), (1, 3, 2, 2))
+        self.assertEqual(list(parser._strategies), ["9999-99-99.aaa", "9999_99_99"])
+
+    def test_non_ascii_text_is_not_cached(self):
+        """Test that texts with letters that may fold to ASCII ones are not cached."""
+        self.assertEqual(
+            self.parser.parse("Ferien_Über_2023_05_21.jpg"), datetime(2023, 5, 21)
+        )
+        self.assertEqual(self.parser.cache_info().misses, 0)
+
+    def test_disabled_cache(self):
+        """Test that no strategies are remembered without a cache size."""
+        self.uncached_parser.parse("IMG_20230312_123456.jpg")
+
+        self.assertEqual(self.uncached_parser.cache_info(), (0, 0, 0, 0))
+
+
 if __name__ == "__main__":
     main()
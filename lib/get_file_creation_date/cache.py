@@ -0,0 +1,156 @@
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
+    GetFileCreationDateResult,
+)
+
+# Bump whenever providers change in a way that invalidates earlier results
+CACHE_VERSION = 4
+
+CACHE_FILENAME = "creation-dates.sqlite"
+
+
+class CreationDateCache:
+    """
+    Persistent cache of creation date results, stored in a SQLite database.
+
+    Entries are keyed by (device, inode, size, mtime_ns), so they survive files
+    being moved within a file system, and are invalidated as soon as a file's
+    size or modification time changes. As dates may be taken from the file name,
+    entries found through the inode are only valid while the name is unchanged.
+    The path is kept as a secondary key for file systems without stable inode
+    numbers. Files without an inode number are stored without one, so they
+    cannot replace each other's entries.
+
+    Every process opens its own connection; the database runs in WAL mode so
+    parallel workers can share one cache.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.logger = logging.getLogger(__name__)
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.path = str(Path(cache_dir) / CACHE_FILENAME)
+
+        self._connection = sqlite3.connect(self.path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._connection:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version != CACHE_VERSION:
+                self.logger.info(f"Resetting cache {self.path} (version {version})")
+                self._connection.execute("DROP TABLE IF EXISTS creation_dates")
+                self._connection.execute(f"PRAGMA user_version={CACHE_VERSION}")
+
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS creation_dates (
+                    device INTEGER NOT NULL,
+                    inode INTEGER,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    variant TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    creation_date TEXT NOT NULL,
+                    provider TEXT,
+                    provider_info TEXT,
+                    confidence INTEGER NOT NULL,
+                    PRIMARY KEY (device, inode, size, mtime_ns, variant)
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS creation_dates_path "
+                "ON creation_dates (path, variant)"
+            )
+
+    def get(
+        self, file_path: str, stat: os.stat_result, variant: str
+    ) -> Optional[GetFileCreationDateResult]:
+        """
+        Looks up the cached result for a file.
+
+        Args:
+            file_path: The path to the file.
+            stat: The file's current stat result, used to validate the entry.
+            variant: Identifies how the result was selected (e.g. the strategy).
+
+        Returns:
+            The cached result, or None if there is no valid entry.
+        """
+        columns = "creation_date, provider, provider_info, confidence"
+        row = None
+        if stat.st_ino:
+            row = self._connection.execute(
+                f"SELECT {columns} FROM creation_dates "
+                "WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? "
+                "AND variant = ? AND name = ?",
+                (
+                    stat.st_dev,
+                    stat.st_ino,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    variant,
+                    os.path.basename(file_path),
+                ),
+            ).fetchone()
+        if row is None:
+            row = self._connection.execute(
+                f"SELECT {columns} FROM creation_dates "
+                "WHERE path = ? AND variant = ? AND size = ? AND mtime_ns = ?",
+                (file_path, variant, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row is None:
+            return None
+
+        creation_date, provider, provider_info, confidence = row
+        return GetFileCreationDateResult(
+            creation_date=datetime.fromisoformat(creation_date),
+            provider=provider,
+            provider_info=provider_info,
+            confidence=Confidence(confidence),
+        )
+
+    def put(
+        self,
+        file_path: str,
+        stat: os.stat_result,
+        variant: str,
+        result: GetFileCreationDateResult,
+    ):
+        """Stores the result for a file, replacing any earlier entry."""
+        with self._connection:
+            if not stat.st_ino:
+                # Rows without an inode never conflict, so replace them by path
+                self._connection.execute(
+                    "DELETE FROM creation_dates "
+                    "WHERE inode IS NULL AND path = ? AND variant = ?",
+                    (file_path, variant),
+                )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO creation_dates VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    stat.st_dev,
+                    stat.st_ino or None,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    variant,
+                    file_path,
+                    os.path.basename(file_path),
+                    result.creation_date.isoformat(),
+                    result.provider,
+                    result.provider_info,
+                    int(result.confidence),
+                ),
+            )
+
+    def close(self):
+        self._connection.close()
@@ -1,8 +1,22 @@
 from dataclasses import dataclass
 from datetime import datetime
+from enum import IntEnum
 from typing import Optional
 
 
+class Confidence(IntEnum):
+    """
+    How much a provider trusts the date it found.
+
+    A date written on purpose (a filename, the EXIF capture time) is HIGH, while
+    file system timestamps that change on every copy are LOW.
+    """
+
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+
 @dataclass
 class GetFileCreationDateResult:
     """
@@ -12,3 +26,4 @@ class GetFileCreationDateResult:
     creation_date: datetime
     provider: str
     provider_info: Optional[str] = None
+    confidence: Confidence = Confidence.MEDIUM
@@ -1,7 +1,10 @@
 import unittest
 from datetime import datetime
 
-from lib.get_file_creation_date.domain.create_date_result import GetFileCreationDateResult
+from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
+    GetFileCreationDateResult,
+)
 
 
 class TestGetFileCreationDateResult(unittest.TestCase):
@@ -93,6 +96,29 @@ class TestGetFileCreationDateResult(unittest.TestCase):
         
         self.assertNotEqual(result1, result2)
 
+    def test_default_confidence_is_medium(self):
+        """Test that results without an explicit confidence are MEDIUM."""
+        result = GetFileCreationDateResult(
+            creation_date=datetime(2023, 12, 25, 10, 30, 0),
+            provider="test_provider"
+        )
+
+        self.assertEqual(result.confidence, Confidence.MEDIUM)
+
+    def test_confidence_levels_are_ordered(self):
+        """Test that confidence levels can be compared against a threshold."""
+        self.assertLess(Confidence.LOW, Confidence.MEDIUM)
+        self.assertLess(Confidence.MEDIUM, Confidence.HIGH)
+
+    def test_inequality_different_confidence(self):
+        """Test inequality when confidence differs."""
+        creation_date = datetime(2023, 12, 25, 10, 30, 0)
+
+        result1 = GetFileCreationDateResult(creation_date, "test_provider", confidence=Confidence.LOW)
+        result2 = GetFileCreationDateResult(creation_date, "test_provider", confidence=Confidence.HIGH)
+
+        self.assertNotEqual(result1, result2)
+
     def test_string_representation(self):
         """Test string representation of GetFileCreationDateResult."""
         creation_date = datetime(2023, 12, 25, 10, 30, 0)
@@ -0,0 +1,170 @@
+import io
+import logging
+import os
+from typing import BinaryIO, Optional
+
+# Number of leading bytes read at once and shared by all consumers of a file.
+# Large enough for file type signatures and most EXIF or QuickTime headers.
+HEADER_SIZE = 64 * 1024
+
+
+class FileContext:
+    """
+    Per-file state shared by the file type sniffer and all providers.
+
+    The file is opened at most once. Its leading bytes are read in a single call
+    and cached, as are its stat result and, if requested, its trailing bytes.
+    Everything is loaded lazily, so a file whose date is found in its name alone
+    is never opened. Read errors are not raised but result in empty data.
+
+    Use it as a context manager, or call close() when done with the file.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        header_size: int = HEADER_SIZE,
+        stat: Optional[os.stat_result] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.file_path = file_path
+        self.header_size = header_size
+        self._stat = stat
+        self._handle: Optional[BinaryIO] = None
+        self._header: Optional[bytes] = None
+        self._tail = b""
+        self._failed = False
+
+    def __enter__(self) -> "FileContext":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_handle(self) -> Optional[BinaryIO]:
+        if self._handle is None and not self._failed:
+            try:
+                self._handle = open(self.file_path, "rb")
+            except OSError as e:
+                self.logger.debug(f"Could not open {self.file_path}: {e}")
+                self._failed = True
+        return self._handle
+
+    @property
+    def stat(self) -> Optional[os.stat_result]:
+        """The file's stat result, or None if the file cannot be accessed."""
+        if self._stat is None:
+            try:
+                self._stat = os.stat(self.file_path)
+            except OSError:
+                pass
+        return self._stat
+
+    @property
+    def size(self) -> Optional[int]:
+        """The file's size in bytes, or None if unknown."""
+        return self.stat.st_size if self.stat is not None else None
+
+    @property
+    def header(self) -> bytes:
+        """Up to header_size leading bytes of the file."""
+        if self._header is None:
+            self._header = self._read(0, self.header_size)
+        return self._header
+
+    def tail(self, size: int) -> bytes:
+        """Up to size trailing bytes of the file, cached for later calls."""
+        if size > len(self._tail):
+            file_size = self.size
+            if file_size is None:
+                return b""
+            size = min(size, file_size)
+            if file_size <= len(self.header):
+                self._tail = self.header[file_size - size :]
+            else:
+                self._tail = self._read(file_size - size, size)
+        return self._tail[len(self._tail) - size :] if size else b""
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """Reads size bytes at offset, served from the header where possible."""
+        header = self.header
+        end = offset + size
+        if end <= len(header) or len(header) < self.header_size:
+            # The whole file fits into the header if it is shorter than requested
+            return header[offset:end]
+        if offset < len(header):
+            return header[offset:] + self._read(len(header), end - len(header))
+        return self._read(offset, size)
+
+    def _read(self, offset: int, size: int) -> bytes:
+        handle = self._get_handle()
+        if handle is None:
+            return b""
+        try:
+            handle.seek(offset)
+            return handle.read(size)
+        except OSError as e:
+            self.logger.debug(f"Could not read {self.file_path}: {e}")
+            return b""
+
+    def open(self, max_size: Optional[int] = None) -> BinaryIO:
+        """
+        Returns a seekable binary file object for parsers expecting one.
+
+        It reads through this context, so the header is not read again and no
+        additional file handle is opened. Closing it leaves the context open.
+
+        Args:
+            max_size: If given, the file object pretends the file ends after this
+                many bytes, so parsers cannot read any further.
+        """
+        return io.BufferedReader(_FileContextReader(self, max_size))
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class _FileContextReader(io.RawIOBase):
+    """A raw, read only file object on top of a FileContext."""
+
+    def __init__(self, context: FileContext, max_size: Optional[int] = None):
+        super().__init__()
+        self._context = context
+        self._max_size = max_size
+        self._position = 0
+        self.name = context.file_path
+
+    @property
+    def _size(self) -> int:
+        size = self._context.size or 0
+        return size if self._max_size is None else min(size, self._max_size)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        size = len(buffer)
+        if self._max_size is not None:
+            size = max(0, min(size, self._max_size - self._position))
+        data = self._context.read_at(self._position, size)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
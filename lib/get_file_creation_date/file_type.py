@@ -0,0 +1,167 @@
+from pathlib import Path
+from typing import Optional
+
+FILE_TYPE_JPEG = "jpeg"
+FILE_TYPE_PNG = "png"
+FILE_TYPE_GIF = "gif"
+FILE_TYPE_BMP = "bmp"
+FILE_TYPE_ICO = "ico"
+FILE_TYPE_TIFF = "tiff"  # Includes TIFF based raw formats like DNG, NEF or ARW
+FILE_TYPE_PSD = "psd"
+FILE_TYPE_ISOBMFF = "isobmff"  # MP4, MOV, HEIC, 3GP, M4A, ...
+FILE_TYPE_RIFF = "riff"  # AVI, WAV, WEBP
+FILE_TYPE_MATROSKA = "matroska"
+FILE_TYPE_ASF = "asf"
+FILE_TYPE_FLV = "flv"
+FILE_TYPE_MPEG_AUDIO = "mpeg_audio"
+FILE_TYPE_FLAC = "flac"
+FILE_TYPE_OGG = "ogg"
+FILE_TYPE_AIFF = "aiff"
+FILE_TYPE_OLE2 = "ole2"  # Legacy office documents
+FILE_TYPE_ZIP = "zip"  # Includes office open XML and OpenDocument files
+FILE_TYPE_PDF = "pdf"
+FILE_TYPE_GZIP = "gzip"
+FILE_TYPE_UNKNOWN = "unknown"
+
+FILE_TYPES = [
+    FILE_TYPE_JPEG,
+    FILE_TYPE_PNG,
+    FILE_TYPE_GIF,
+    FILE_TYPE_BMP,
+    FILE_TYPE_ICO,
+    FILE_TYPE_TIFF,
+    FILE_TYPE_PSD,
+    FILE_TYPE_ISOBMFF,
+    FILE_TYPE_RIFF,
+    FILE_TYPE_MATROSKA,
+    FILE_TYPE_ASF,
+    FILE_TYPE_FLV,
+    FILE_TYPE_MPEG_AUDIO,
+    FILE_TYPE_FLAC,
+    FILE_TYPE_OGG,
+    FILE_TYPE_AIFF,
+    FILE_TYPE_OLE2,
+    FILE_TYPE_ZIP,
+    FILE_TYPE_PDF,
+    FILE_TYPE_GZIP,
+    FILE_TYPE_UNKNOWN,
+]
+
+# Number of bytes needed to recognize any of the signatures below
+SNIFF_SIZE = 16
+
+# (offset, signature, file type), checked in order
+_SIGNATURES = [
+    (0, b"\xff\xd8\xff", FILE_TYPE_JPEG),
+    (0, b"\x89PNG\r\n\x1a\n", FILE_TYPE_PNG),
+    (0, b"GIF87a", FILE_TYPE_GIF),
+    (0, b"GIF89a", FILE_TYPE_GIF),
+    (0, b"II*\x00", FILE_TYPE_TIFF),
+    (0, b"MM\x00*", FILE_TYPE_TIFF),
+    (0, b"IIRO", FILE_TYPE_TIFF),  # Olympus ORF
+    (0, b"IIU\x00", FILE_TYPE_TIFF),  # Panasonic RW2
+    (0, b"8BPS", FILE_TYPE_PSD),
+    (4, b"ftyp", FILE_TYPE_ISOBMFF),
+    # Old QuickTime files may start with any top level atom
+    (4, b"moov", FILE_TYPE_ISOBMFF),
+    (4, b"mdat", FILE_TYPE_ISOBMFF),
+    (4, b"wide", FILE_TYPE_ISOBMFF),
+    (4, b"pnot", FILE_TYPE_ISOBMFF),
+    (0, b"RIFF", FILE_TYPE_RIFF),
+    (0, b"\x1a\x45\xdf\xa3", FILE_TYPE_MATROSKA),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", FILE_TYPE_ASF),
+    (0, b"FLV\x01", FILE_TYPE_FLV),
+    (0, b"ID3", FILE_TYPE_MPEG_AUDIO),
+    (0, b"fLaC", FILE_TYPE_FLAC),
+    (0, b"OggS", FILE_TYPE_OGG),
+    (0, b"FORM", FILE_TYPE_AIFF),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", FILE_TYPE_OLE2),
+    (0, b"PK\x03\x04", FILE_TYPE_ZIP),
+    (0, b"%PDF", FILE_TYPE_PDF),
+    (0, b"\x1f\x8b", FILE_TYPE_GZIP),
+]
+
+# Used when the content has no (reliable) signature or cannot be read
+_EXTENSIONS = {
+    ".jpg": FILE_TYPE_JPEG,
+    ".jpeg": FILE_TYPE_JPEG,
+    ".png": FILE_TYPE_PNG,
+    ".gif": FILE_TYPE_GIF,
+    ".bmp": FILE_TYPE_BMP,
+    ".dib": FILE_TYPE_BMP,
+    ".ico": FILE_TYPE_ICO,
+    ".cur": FILE_TYPE_ICO,
+    ".tif": FILE_TYPE_TIFF,
+    ".tiff": FILE_TYPE_TIFF,
+    ".dng": FILE_TYPE_TIFF,
+    ".cr2": FILE_TYPE_TIFF,
+    ".nef": FILE_TYPE_TIFF,
+    ".arw": FILE_TYPE_TIFF,
+    ".orf": FILE_TYPE_TIFF,
+    ".rw2": FILE_TYPE_TIFF,
+    ".psd": FILE_TYPE_PSD,
+    ".mp4": FILE_TYPE_ISOBMFF,
+    ".m4v": FILE_TYPE_ISOBMFF,
+    ".m4a": FILE_TYPE_ISOBMFF,
+    ".mov": FILE_TYPE_ISOBMFF,
+    ".qt": FILE_TYPE_ISOBMFF,
+    ".3gp": FILE_TYPE_ISOBMFF,
+    ".heic": FILE_TYPE_ISOBMFF,
+    ".heif": FILE_TYPE_ISOBMFF,
+    ".avi": FILE_TYPE_RIFF,
+    ".wav": FILE_TYPE_RIFF,
+    ".webp": FILE_TYPE_RIFF,
+    ".mkv": FILE_TYPE_MATROSKA,
+    ".webm": FILE_TYPE_MATROSKA,
+    ".wmv": FILE_TYPE_ASF,
+    ".wma": FILE_TYPE_ASF,
+    ".asf": FILE_TYPE_ASF,
+    ".flv": FILE_TYPE_FLV,
+    ".mp3": FILE_TYPE_MPEG_AUDIO,
+    ".mp2": FILE_TYPE_MPEG_AUDIO,
+    ".mpa": FILE_TYPE_MPEG_AUDIO,
+    ".flac": FILE_TYPE_FLAC,
+    ".ogg": FILE_TYPE_OGG,
+    ".aif": FILE_TYPE_AIFF,
+    ".aiff": FILE_TYPE_AIFF,
+    ".doc": FILE_TYPE_OLE2,
+    ".xls": FILE_TYPE_OLE2,
+    ".ppt": FILE_TYPE_OLE2,
+    ".zip": FILE_TYPE_ZIP,
+    ".docx": FILE_TYPE_ZIP,
+    ".xlsx": FILE_TYPE_ZIP,
+    ".pptx": FILE_TYPE_ZIP,
+    ".odt": FILE_TYPE_ZIP,
+    ".pdf": FILE_TYPE_PDF,
+    ".gz": FILE_TYPE_GZIP,
+}
+
+
+def _read_header(file_path: str) -> bytes:
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(SNIFF_SIZE)
+    except OSError:
+        return b""
+
+
+def classify_file(file_path: str, header: Optional[bytes] = None) -> str:
+    """
+    Determines the type of a file from its leading bytes and its extension.
+
+    Args:
+        file_path: The path to the file.
+        header: The first SNIFF_SIZE bytes of the file, if already read.
+
+    Returns:
+        One of FILE_TYPES. Signatures take precedence over the extension, which is
+        only used if the content is not recognized.
+    """
+    if header is None:
+        header = _read_header(file_path)
+
+    for offset, signature, file_type in _SIGNATURES:
+        if header.startswith(signature, offset):
+            return file_type
+
+    return _EXTENSIONS.get(Path(file_path).suffix.lower(), FILE_TYPE_UNKNOWN)
@@ -1,18 +1,30 @@
-from typing import List, Optional
+import os
+from typing import Callable, Iterator, List, Optional
 
+from lib.get_file_creation_date.cache import CreationDateCache
 from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
     GetFileCreationDateResult,
 )
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.file_type import SNIFF_SIZE, classify_file
 from lib.get_file_creation_date.get_oldest_entry import get_oldest_entry
+from lib.get_file_creation_date.provider_registry import ProviderRegistry
 from lib.get_file_creation_date.providers.file_creation_date_provider import (
     FileCreationDateProvider,
 )
+from lib.get_file_creation_date.providers.exif.exif import (
+    ExifFileCreationDateProvider,
+)
 from lib.get_file_creation_date.providers.filename.filename import (
     FilenameFileCreationDateProvider,
 )
 from lib.get_file_creation_date.providers.hachoir.hachoir import (
     HachoirFileCreationDateProvider,
 )
+from lib.get_file_creation_date.providers.isobmff.isobmff import (
+    IsoBmffFileCreationDateProvider,
+)
 from lib.get_file_creation_date.providers.windows_shell.windows_shell import (
     WindowsShellFileCreationDateProvider,
 )
@@ -20,6 +32,8 @@ from lib.get_file_creation_date.providers.windows_shell.windows_shell import (
 # A list of all available file creation date providers.
 _PROVIDERS: List[FileCreationDateProvider] = [
     FilenameFileCreationDateProvider(),
+    ExifFileCreationDateProvider(),
+    IsoBmffFileCreationDateProvider(),
     HachoirFileCreationDateProvider(),
     WindowsShellFileCreationDateProvider(),
 ]
@@ -27,25 +41,180 @@ _PROVIDERS: List[FileCreationDateProvider] = [
 # A list of providers that are currently available on the system.
 _PROVIDERS_AVAILABLE = [provider for provider in _PROVIDERS if provider.is_available()]
 
+# The default routing of file types to providers.
+DEFAULT_REGISTRY = ProviderRegistry(_PROVIDERS)
+
+
+# Strategies for choosing among the dates found by the providers.
+# "oldest" asks every provider and keeps the oldest date.
+# "priority-first" stops at the first provider that finds a date.
+# "first-with-confidence" stops at the first date that is confident enough and
+# otherwise falls back to the oldest date found.
+STRATEGY_OLDEST = "oldest"
+STRATEGY_PRIORITY_FIRST = "priority-first"
+STRATEGY_FIRST_WITH_CONFIDENCE = "first-with-confidence"
+
+STRATEGIES = [
+    STRATEGY_OLDEST,
+    STRATEGY_PRIORITY_FIRST,
+    STRATEGY_FIRST_WITH_CONFIDENCE,
+]
+
 
-def get_file_creation_date(file_path: str) -> Optional[GetFileCreationDateResult]:
+def _find_entries(
+    file_path: str,
+    context: FileContext,
+    registry: ProviderRegistry,
+    on_provider: Optional[Callable[[FileCreationDateProvider], None]] = None,
+) -> Iterator[GetFileCreationDateResult]:
+    """
+    Lazily queries the providers in order of priority, skipping empty results.
+
+    The file is only classified once a provider restricted to some file types is
+    reached, so providers working on the name alone never cause the file to be read.
+    Fallback providers are skipped once a provider they stand in for found a date.
+
+    on_provider is called before a provider starts, including the classification
+    it requires, so a read that hangs is charged to that provider.
+    """
+    file_type = None
+    found_by = set()
+    for provider in _PROVIDERS_AVAILABLE:
+        if found_by and registry.is_superseded(provider, found_by):
+            continue
+        reported = False
+        if registry.is_restricted(provider):
+            if file_type is None:
+                if on_provider:
+                    on_provider(provider)
+                    reported = True
+                file_type = classify_file(file_path, context.header[:SNIFF_SIZE])
+            if not registry.handles(provider, file_type):
+                continue
+        if provider.supports_file(file_path):
+            if on_provider and not reported:
+                on_provider(provider)
+            entry = provider.get_file_creation_date(file_path, context)
+            if entry is not None:
+                found_by.add(str(provider))
+                yield entry
+
+
+def _select_entry(
+    entries: Iterator[GetFileCreationDateResult],
+    strategy: str,
+    min_confidence: Confidence,
+) -> Optional[GetFileCreationDateResult]:
+    if strategy == STRATEGY_OLDEST:
+        return get_oldest_entry(list(entries))
+
+    if strategy == STRATEGY_PRIORITY_FIRST:
+        return next(entries, None)
+
+    if strategy == STRATEGY_FIRST_WITH_CONFIDENCE:
+        found = []
+        for entry in entries:
+            if entry.confidence >= min_confidence:
+                return entry
+            found.append(entry)
+        return get_oldest_entry(found)
+
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def _cache_variant(
+    strategy: str, min_confidence: Confidence, registry: ProviderRegistry
+) -> str:
+    """Identifies the settings a cached result was selected with."""
+    variant = strategy
+    if strategy == STRATEGY_FIRST_WITH_CONFIDENCE:
+        variant += f":{min_confidence.name.lower()}"
+    if registry is not DEFAULT_REGISTRY:
+        variant += f"+routes:{registry.fingerprint()}"
+    return variant
+
+
+def get_file_creation_date(
+    file_path: str,
+    strategy: str = STRATEGY_OLDEST,
+    min_confidence: Confidence = Confidence.HIGH,
+    cache: Optional[CreationDateCache] = None,
+    registry: Optional[ProviderRegistry] = None,
+    context: Optional[FileContext] = None,
+    on_provider: Optional[Callable[[FileCreationDateProvider], None]] = None,
+) -> Optional[GetFileCreationDateResult]:
     """
     Gets the creation date of a file using a variety of providers.
 
-    This function iterates through a list of available providers and returns the
-    oldest creation date found among them.
+    Providers are queried in order of priority. Depending on the strategy, either
+    all of them are asked and the oldest creation date wins, or the chain stops
+    early as soon as a suitable date has been found.
 
     Args:
         file_path: The path to the file.
+        strategy: One of STRATEGIES, defaults to STRATEGY_OLDEST.
+        min_confidence: The confidence a date needs to end the chain early when
+            using STRATEGY_FIRST_WITH_CONFIDENCE.
+        cache: An optional persistent cache. Valid cached results are returned
+            without asking any provider, new results are added to it.
+        registry: Decides which providers are asked for which file types,
+            defaults to DEFAULT_REGISTRY.
+        context: The file's FileContext, if the caller already has one. Otherwise a
+            new one is created and closed again before returning, so the file is
+            opened and its header read at most once for all providers.
+        on_provider: Called with every provider right before it is asked, e.g. to
+            enforce time budgets per provider.
 
     Returns:
-        A GetFileCreationDateResult object containing the oldest creation date
+        A GetFileCreationDateResult object containing the selected creation date
         and the name of the provider that found it, or None if no creation date
         could be found.
     """
-    entries = [
-        provider.get_file_creation_date(file_path)
-        for provider in _PROVIDERS_AVAILABLE
-        if provider.supports_file(file_path)
-    ]
-    return get_oldest_entry([entry for entry in entries if entry is not None])
+    registry = registry or DEFAULT_REGISTRY
+
+    if context is None:
+        with FileContext(file_path) as context:
+            return _get_file_creation_date(
+                file_path,
+                strategy,
+                min_confidence,
+                cache,
+                registry,
+                context,
+                on_provider,
+            )
+    return _get_file_creation_date(
+        file_path, strategy, min_confidence, cache, registry, context, on_provider
+    )
+
+
+def _get_file_creation_date(
+    file_path: str,
+    strategy: str,
+    min_confidence: Confidence,
+    cache: Optional[CreationDateCache],
+    registry: ProviderRegistry,
+    context: FileContext,
+    on_provider: Optional[Callable[[FileCreationDateProvider], None]],
+) -> Optional[GetFileCreationDateResult]:
+    stat = None
+    if cache is not None:
+        stat = context.stat
+        if stat is not None and not stat.st_ino:
+            # Directory scans on Windows report no inode numbers, os.stat does
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stat = None
+        if stat is not None:
+            variant = _cache_variant(strategy, min_confidence, registry)
+            cached = cache.get(file_path, stat, variant)
+            if cached:
+                return cached
+
+    entries = _find_entries(file_path, context, registry, on_provider)
+    result = _select_entry(entries, strategy, min_confidence)
+
+    if result and stat is not None:
+        cache.put(file_path, stat, variant, result)
+    return result
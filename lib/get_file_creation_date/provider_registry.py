@@ -0,0 +1,103 @@
+import hashlib
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional
+
+from lib.get_file_creation_date.file_type import FILE_TYPES
+from lib.get_file_creation_date.providers.file_creation_date_provider import (
+    FileCreationDateProvider,
+)
+
+
+class ProviderRegistry:
+    """
+    Routing table deciding which providers are asked for which file types.
+
+    Every provider is either routed to a set of file types or, if its file types
+    are None, to all files. Providers that are not registered at all are asked for
+    every file as well. The defaults come from the providers' FILE_TYPES and can be
+    overridden per run.
+
+    It also records which providers are only a fallback for others (FALLBACK_FOR):
+    these are skipped for a file once one of the others has found a date.
+    """
+
+    def __init__(self, providers: Iterable[FileCreationDateProvider] = ()):
+        self._file_types: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._fallback_for: Dict[str, FrozenSet[str]] = {}
+        for provider in providers:
+            self.register(str(provider), provider.FILE_TYPES)
+            if provider.FALLBACK_FOR:
+                self.register_fallback(str(provider), provider.FALLBACK_FOR)
+
+    def register(self, provider_name: str, file_types: Optional[Iterable[str]]):
+        """
+        Routes a provider to the given file types, or to all files if None.
+
+        Raises:
+            ValueError: If one of the file types is unknown.
+        """
+        if file_types is not None:
+            file_types = frozenset(file_types)
+            unknown = file_types.difference(FILE_TYPES)
+            if unknown:
+                raise ValueError(f"Unknown file types: {', '.join(sorted(unknown))}")
+        self._file_types[provider_name] = file_types
+
+    def register_fallback(self, provider_name: str, primary_names: Iterable[str]):
+        """Makes a provider a fallback that is skipped once a primary found a date."""
+        self._fallback_for[provider_name] = frozenset(primary_names)
+
+    def copy(self) -> "ProviderRegistry":
+        registry = ProviderRegistry()
+        registry._file_types = dict(self._file_types)
+        registry._fallback_for = dict(self._fallback_for)
+        return registry
+
+    @property
+    def provider_names(self) -> List[str]:
+        return list(self._file_types)
+
+    def file_types_for(self, provider_name: str) -> Optional[FrozenSet[str]]:
+        """Returns the file types a provider is routed to, or None for all files."""
+        return self._file_types.get(provider_name)
+
+    def is_restricted(self, provider: FileCreationDateProvider) -> bool:
+        """Whether the provider is only asked for some file types."""
+        return self.file_types_for(str(provider)) is not None
+
+    def handles(self, provider: FileCreationDateProvider, file_type: str) -> bool:
+        """Whether the provider should be asked for a file of the given type."""
+        file_types = self.file_types_for(str(provider))
+        return file_types is None or file_type in file_types
+
+    def is_superseded(
+        self, provider: FileCreationDateProvider, found_by: AbstractSet[str]
+    ) -> bool:
+        """Whether the provider is a fallback for one of the providers in found_by."""
+        primaries = self._fallback_for.get(str(provider))
+        return primaries is not None and not primaries.isdisjoint(found_by)
+
+    def providers_for(
+        self, file_type: str, providers: Iterable[FileCreationDateProvider]
+    ) -> List[FileCreationDateProvider]:
+        """Filters the providers down to those routed to the given file type."""
+        return [provider for provider in providers if self.handles(provider, file_type)]
+
+    def fingerprint(self) -> str:
+        """A short, stable identifier of the routing table."""
+        table = sorted(
+            (name, sorted(file_types) if file_types is not None else None)
+            for name, file_types in self._file_types.items()
+        )
+        fallbacks = sorted(
+            (name, sorted(primaries)) for name, primaries in self._fallback_for.items()
+        )
+        if fallbacks:
+            table.append(("fallbacks", fallbacks))
+        return hashlib.sha256(repr(table).encode("utf-8")).hexdigest()[:8]
+
+    def __repr__(self) -> str:
+        routes = ", ".join(
+            f"{name}={'all' if file_types is None else ','.join(sorted(file_types))}"
+            for name, file_types in self._file_types.items()
+        )
+        return f"ProviderRegistry({routes})"
@@ -0,0 +1,258 @@
+import logging
+import struct
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from lib.dateparser.dateparser import date_from_value, parse_date
+from lib.get_file_creation_date import file_type
+from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
+    GetFileCreationDateResult,
+)
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.providers.file_creation_date_provider import (
+    FileCreationDateProvider,
+)
+
+# Reads size bytes at an offset relative to the start of the TIFF structure
+ReadFunction = Callable[[int, int], bytes]
+
+EXIF_HEADER = b"Exif\x00\x00"
+
+# Byte order of the TIFF structure, by its leading bytes. Olympus ORF and
+# Panasonic RW2 raw files use their own magic numbers, but standard IFDs.
+TIFF_BYTE_ORDERS = {
+    b"II*\x00": "<",
+    b"MM\x00*": ">",
+    b"IIRO": "<",
+    b"IIU\x00": "<",
+}
+
+TAG_DATE_TIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+TAG_DATE_TIME_ORIGINAL = 0x9003
+TAG_DATE_TIME_DIGITIZED = 0x9004
+
+TYPE_ASCII = 2
+
+# Date tags, in order of priority
+DATE_TAGS = [
+    (TAG_DATE_TIME_ORIGINAL, "DateTimeOriginal", Confidence.HIGH),
+    # Equals the capture time for cameras, but is the scan time for scans
+    (TAG_DATE_TIME_DIGITIZED, "DateTimeDigitized", Confidence.MEDIUM),
+    # Updated by most editing software
+    (TAG_DATE_TIME, "DateTime", Confidence.LOW),
+]
+
+# Guards against corrupt files
+MAX_IFD_ENTRIES = 1024
+MAX_JPEG_SEGMENTS = 64
+
+# JPEG markers without a length field
+_JPEG_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+# Start of scan and end of image, metadata segments come before them
+_JPEG_END_MARKERS = {0xDA, 0xD9}
+_JPEG_APP1 = 0xE1
+
+
+class ExifFileCreationDateProvider(FileCreationDateProvider):
+    """
+    Extract creation dates from EXIF data of JPEG and TIFF based files.
+
+    Instead of parsing the whole file, it seeks straight to the EXIF segment of a
+    JPEG (or the IFDs of a TIFF, DNG, CR2, NEF, ARW, ...) and decodes only the date
+    tags. Hachoir is used as a fallback for files it cannot read.
+    """
+
+    FILE_TYPES = frozenset([file_type.FILE_TYPE_JPEG, file_type.FILE_TYPE_TIFF])
+
+    # Date tags have a fixed format, fuzzy parsing would only turn corrupt values
+    # into dates
+    USE_DATEUTIL = False
+
+    def __init__(self):
+        """Initialize the EXIF provider."""
+        super().__init__()
+        self.logger = logging.getLogger(__name__.split(".")[-1])
+
+    def is_available(self) -> bool:
+        """Check if EXIF extraction is available."""
+        return True  # Pure Python
+
+    def supports_file(self, file_path: str) -> bool:
+        """Check if this provider supports the given file."""
+        return True  # The file type is checked on the content
+
+    def get_file_creation_date(
+        self, file_path: str, context: Optional[FileContext] = None
+    ) -> Optional[GetFileCreationDateResult]:
+        """Extract creation date from the EXIF date tags."""
+        if context is None:
+            with FileContext(file_path) as context:
+                return self.get_file_creation_date(file_path, context)
+
+        try:
+            read = self._find_tiff_structure(context)
+            if read is None:
+                self.logger.debug(f"No EXIF data found")
+                return None
+
+            found = self.find_creation_date_in_tiff(read)
+        except (struct.error, ValueError) as e:
+            self.logger.debug(f"EXIF extraction failed for {file_path}: {e}")
+            return None
+
+        if found:
+            creation_date, tag_name, confidence = found
+            self.logger.debug(f"Found creation date: {creation_date} ({tag_name})")
+
+            return GetFileCreationDateResult(
+                creation_date=creation_date,
+                provider=self.__class__.__name__,
+                provider_info=tag_name,
+                confidence=confidence,
+            )
+
+        self.logger.debug(f"No creation date found in EXIF data")
+        return None
+
+    def _find_tiff_structure(self, context: FileContext) -> Optional[ReadFunction]:
+        """Locates the TIFF structure holding the EXIF data."""
+        header = context.header
+        if header[:4] in TIFF_BYTE_ORDERS:
+            return context.read_at
+
+        if header.startswith(b"\xff\xd8"):
+            offset = self._find_jpeg_exif_segment(context)
+            if offset is not None:
+                return lambda position, size: context.read_at(offset + position, size)
+
+        return None
+
+    def _find_jpeg_exif_segment(self, context: FileContext) -> Optional[int]:
+        """Walks the JPEG segments and returns the offset of the EXIF TIFF data."""
+        offset = 2
+        for _ in range(MAX_JPEG_SEGMENTS):
+            marker = context.read_at(offset, 4)
+            if len(marker) < 4 or marker[0] != 0xFF:
+                return None
+
+            code = marker[1]
+            if code == 0xFF:  # Fill byte
+                offset += 1
+                continue
+            if code in _JPEG_STANDALONE_MARKERS:
+                offset += 2
+                continue
+            if code in _JPEG_END_MARKERS:
+                return None
+
+            (length,) = struct.unpack(">H", marker[2:])
+            if code == _JPEG_APP1 and context.read_at(offset + 4, 6) == EXIF_HEADER:
+                return offset + 4 + len(EXIF_HEADER)
+            offset += 2 + length
+
+        return None
+
+    def find_creation_date_in_tiff(
+        self, read: ReadFunction
+    ) -> Optional[Tuple[datetime, str, Confidence]]:
+        """
+        Finds the date tag with the highest priority in a TIFF structure.
+
+        Used by other providers for EXIF data embedded in other containers.
+
+        Args:
+            read: Reads size bytes at an offset relative to the TIFF header.
+
+        Returns:
+            The date, the name of its tag and its confidence, or None.
+
+        Raises:
+            struct.error, ValueError: If the TIFF structure is corrupt.
+        """
+        return self._find_creation_date(self._read_date_tags(read))
+
+    def _read_date_tags(self, read: ReadFunction) -> Dict[int, bytes]:
+        """Reads the raw date tags from IFD0 and the EXIF IFD."""
+        header = read(0, 8)
+        byte_order = TIFF_BYTE_ORDERS.get(header[:4])
+        if byte_order is None or len(header) < 8:
+            return {}
+
+        (ifd0_offset,) = struct.unpack(byte_order + "I", header[4:])
+        values = self._read_ifd(read, byte_order, ifd0_offset)
+
+        exif_ifd_offset = values.pop(TAG_EXIF_IFD, None)
+        if exif_ifd_offset:
+            exif_values = self._read_ifd(read, byte_order, exif_ifd_offset)
+            exif_values.pop(TAG_EXIF_IFD, None)
+            values.update(exif_values)
+
+        return values
+
+    def _read_ifd(self, read: ReadFunction, byte_order: str, offset: int) -> Dict:
+        """Reads the date tags and the EXIF IFD pointer from one IFD."""
+        count_data = read(offset, 2)
+        if len(count_data) < 2:
+            return {}
+        (count,) = struct.unpack(byte_order + "H", count_data)
+        entries = read(offset + 2, 12 * min(count, MAX_IFD_ENTRIES))
+
+        values = {}
+        date_tags = {tag for tag, _, _ in DATE_TAGS}
+        for position in range(0, len(entries) - 11, 12):
+            tag, value_type, value_count, value = struct.unpack(
+                byte_order + "HHI4s", entries[position : position + 12]
+            )
+            if tag == TAG_EXIF_IFD:
+                (values[tag],) = struct.unpack(byte_order + "I", value)
+            elif tag in date_tags and value_type == TYPE_ASCII:
+                if value_count <= 4:
+                    values[tag] = value[:value_count]
+                else:
+                    (value_offset,) = struct.unpack(byte_order + "I", value)
+                    values[tag] = read(value_offset, value_count)
+
+        return values
+
+    def _find_creation_date(
+        self, values: Dict[int, bytes]
+    ) -> Optional[Tuple[datetime, str, Confidence]]:
+        """Find the date tag with the highest priority holding a valid date."""
+        for tag, tag_name, confidence in DATE_TAGS:
+            if tag in values:
+                parsed_date = self._parse_exif_date(values[tag])
+                if parsed_date:
+                    return parsed_date, tag_name, confidence
+
+        return None
+
+    def _parse_exif_date(self, value: bytes) -> Optional[datetime]:
+        """Parse an EXIF date ("YYYY:MM:DD HH:MM:SS"), tolerating other formats."""
+        date_str = value.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+        if not date_str:
+            return None
+
+        if len(date_str) == 19 and date_str[4] == date_str[7] == ":":
+            try:
+                return date_from_value(
+                    datetime(
+                        int(date_str[0:4]),
+                        int(date_str[5:7]),
+                        int(date_str[8:10]),
+                        int(date_str[11:13]),
+                        int(date_str[14:16]),
+                        int(date_str[17:19]),
+                    )
+                )
+            except ValueError:
+                # Unset dates are stored as "0000:00:00 00:00:00"
+                return None
+
+        parsed_date = parse_date(date_str, self.USE_DATEUTIL)
+        if parsed_date:
+            return parsed_date
+
+        self.logger.debug(f"Could not parse EXIF date: {date_str}")
+        return None
@@ -0,0 +1,264 @@
+import os
+import struct
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from lib.get_file_creation_date.domain.create_date_result import Confidence
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.providers.exif.exif import (
+    TAG_DATE_TIME,
+    TAG_DATE_TIME_DIGITIZED,
+    TAG_DATE_TIME_ORIGINAL,
+    ExifFileCreationDateProvider,
+)
+from lib.get_file_creation_date.providers.hachoir.hachoir import (
+    HACHOIR_AVAILABLE,
+    HachoirFileCreationDateProvider,
+)
+
+
+def _tiff(ifd0_tags, exif_tags=None, byte_order="<"):
+    """Build a TIFF structure with ASCII tags in IFD0 and an optional EXIF IFD."""
+    magic = b"II*\x00" if byte_order == "<" else b"MM\x00*"
+    ifd0_tags = dict(ifd0_tags)
+    ifd0_size = 2 + 12 * (len(ifd0_tags) + (1 if exif_tags else 0)) + 4
+    exif_offset = 8 + ifd0_size
+    exif_size = 2 + 12 * len(exif_tags) + 4 if exif_tags else 0
+    data_offset = exif_offset + exif_size
+    data = b""
+
+    def build_ifd(tags, extra_entries=()):
+        nonlocal data
+        entries = list(extra_entries)
+        for tag, value in sorted(tags.items()):
+            value = value + b"\x00"
+            if len(value) <= 4:
+                field = value.ljust(4, b"\x00")
+            else:
+                field = struct.pack(byte_order + "I", data_offset + len(data))
+                data += value
+            entries.append(struct.pack(byte_order + "HHI", tag, 2, len(value)) + field)
+        return (
+            struct.pack(byte_order + "H", len(entries))
+            + b"".join(entries)
+            + b"\x00" * 4
+        )
+
+    pointer = []
+    if exif_tags:
+        pointer = [struct.pack(byte_order + "HHII", 0x8769, 4, 1, exif_offset)]
+    ifd0 = build_ifd(ifd0_tags, pointer)
+    exif_ifd = build_ifd(exif_tags) if exif_tags else b""
+    return magic + struct.pack(byte_order + "I", 8) + ifd0 + exif_ifd + data
+
+
+def _jpeg(tiff, segments_before=()):
+    """Build a JPEG with the TIFF structure in its APP1 segment."""
+    jpeg = b"\xff\xd8"
+    for marker, payload in segments_before:
+        jpeg += bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload
+    app1 = b"Exif\x00\x00" + tiff
+    jpeg += b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1
+    return jpeg + b"\xff\xda\x00\x02" + b"\x00" * 64 + b"\xff\xd9"
+
+
+class TestExifFileCreationDateProvider(unittest.TestCase):
+    def setUp(self):
+        """Set up the provider and a temporary directory."""
+        self.provider = ExifFileCreationDateProvider()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        file_path = os.path.join(self.temp_dir.name, name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def test_is_available(self):
+        """Test that the provider needs no external library."""
+        self.assertTrue(self.provider.is_available())
+
+    def test_jpeg_date_time_original(self):
+        """Test that DateTimeOriginal is read from a JPEG's EXIF segment."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(
+                _tiff(
+                    {TAG_DATE_TIME: b"2024:01:01 12:00:00"},
+                    {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"},
+                )
+            ),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        self.assertEqual(result.provider, "ExifFileCreationDateProvider")
+        self.assertEqual(result.provider_info, "DateTimeOriginal")
+        self.assertEqual(result.confidence, Confidence.HIGH)
+
+    def test_jpeg_with_leading_segments(self):
+        """Test that APP0 and other segments before the EXIF segment are skipped."""
+        tiff = _tiff({}, {TAG_DATE_TIME_DIGITIZED: b"2023:12:25 10:30:00"})
+        segments = [(0xE0, b"JFIF\x00\x01\x01" + b"\x00" * 7), (0xFE, b"comment")]
+        file_path = self._write("photo.jpg", _jpeg(tiff, segments))
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        self.assertEqual(result.confidence, Confidence.MEDIUM)
+
+    def test_modification_date_is_last_resort(self):
+        """Test that DateTime is used with low confidence if nothing else is set."""
+        file_path = self._write(
+            "photo.jpg", _jpeg(_tiff({TAG_DATE_TIME: b"2024:01:01 12:00:00"}))
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2024, 1, 1, 12, 0, 0))
+        self.assertEqual(result.provider_info, "DateTime")
+        self.assertEqual(result.confidence, Confidence.LOW)
+
+    def test_unset_date_is_skipped(self):
+        """Test that zeroed dates fall through to the next tag."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(
+                _tiff(
+                    {TAG_DATE_TIME: b"2024:01:01 12:00:00"},
+                    {TAG_DATE_TIME_ORIGINAL: b"0000:00:00 00:00:00"},
+                )
+            ),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.provider_info, "DateTime")
+
+    def test_out_of_range_date_is_skipped(self):
+        """Test that dates outside the supported years fall through to the next tag."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(
+                _tiff(
+                    {TAG_DATE_TIME: b"2024:01:01 12:00:00"},
+                    {TAG_DATE_TIME_ORIGINAL: b"1970:01:01 00:00:00"},
+                )
+            ),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2024, 1, 1, 12, 0, 0))
+        self.assertEqual(result.provider_info, "DateTime")
+
+    def test_only_out_of_range_dates(self):
+        """Test that no date is found if all dates are outside the supported years."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(_tiff({}, {TAG_DATE_TIME_ORIGINAL: b"1970:01:01 00:00:00"})),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertIsNone(result)
+
+    def test_other_date_formats(self):
+        """Test that other date formats are parsed, without fuzzy parsing."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(
+                _tiff(
+                    {TAG_DATE_TIME: b"2024-01-01 12:00:00"},
+                    {TAG_DATE_TIME_ORIGINAL: b"Camera 12 of 3"},
+                )
+            ),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2024, 1, 1, 12, 0, 0))
+        self.assertEqual(result.provider_info, "DateTime")
+
+    def test_big_endian_tiff(self):
+        """Test that Motorola byte order TIFF files (e.g. NEF) are read."""
+        file_path = self._write(
+            "photo.nef",
+            _tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2022:06:15 08:00:00"}, byte_order=">"),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2022, 6, 15, 8, 0, 0))
+
+    def test_jpeg_without_exif(self):
+        """Test that JPEGs without an EXIF segment yield no date."""
+        file_path = self._write("photo.jpg", b"\xff\xd8\xff\xda\x00\x02\xff\xd9")
+
+        self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_other_files(self):
+        """Test that files that are neither JPEG nor TIFF yield no date."""
+        file_path = self._write("photo.jpg", b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+
+        self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_truncated_file(self):
+        """Test that truncated EXIF data yields no date instead of an error."""
+        content = _jpeg(_tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"}))
+        for size in range(2, len(content), 7):
+            with self.subTest(size=size):
+                file_path = self._write("photo.jpg", content[:size])
+                result = self.provider.get_file_creation_date(file_path)
+                if result is not None:
+                    self.assertEqual(
+                        result.creation_date, datetime(2023, 12, 25, 10, 30)
+                    )
+
+    def test_missing_file(self):
+        """Test that a missing file yields no date."""
+        file_path = os.path.join(self.temp_dir.name, "missing.jpg")
+
+        self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_reads_through_context(self):
+        """Test that only the shared context's header is read for small EXIF segments."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(_tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"})),
+        )
+
+        with FileContext(file_path) as context:
+            with patch.object(context, "_read", wraps=context._read) as mock_read:
+                result = self.provider.get_file_creation_date(file_path, context)
+
+        self.assertIsNotNone(result)
+        mock_read.assert_called_once_with(0, context.header_size)
+
+    @unittest.skipUnless(HACHOIR_AVAILABLE, "Hachoir is not installed")
+    def test_same_date_as_hachoir(self):
+        """Test that the native reader agrees with Hachoir on the capture time."""
+        file_path = self._write(
+            "photo.jpg",
+            _jpeg(_tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"})),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+        expected = HachoirFileCreationDateProvider().get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, expected.creation_date)
+        self.assertEqual(result.confidence, expected.confidence)
+
+    def test_string_representation(self):
+        """Test string representation of the provider."""
+        self.assertEqual(str(self.provider), "ExifFileCreationDateProvider")
+
+
+if __name__ == "__main__":
+    unittest.main()
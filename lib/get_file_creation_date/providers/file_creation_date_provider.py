@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import FrozenSet, Optional, Tuple
 
 from lib.get_file_creation_date.domain.create_date_result import (
     GetFileCreationDateResult,
 )
+from lib.get_file_creation_date.file_context import FileContext
 
 
 class FileCreationDateProvider(ABC):
@@ -14,6 +15,18 @@ class FileCreationDateProvider(ABC):
     All providers should inherit from this class and implement the required methods.
     """
 
+    # The file types (see file_type.py) this provider is routed to by default,
+    # or None if it can handle any file.
+    FILE_TYPES: Optional[FrozenSet[str]] = None
+
+    # Names of providers this one is only a fallback for. It is not asked for a
+    # file once one of them has found a date.
+    FALLBACK_FOR: Optional[FrozenSet[str]] = None
+
+    # Whether dates this provider reads may fall back to dateutil's fuzzy parsing
+    # when none of the date patterns match.
+    USE_DATEUTIL: bool = True
+
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -39,13 +52,15 @@ class FileCreationDateProvider(ABC):
 
     @abstractmethod
     def get_file_creation_date(
-        self, file_path: str
+        self, file_path: str, context: Optional[FileContext] = None
     ) -> Optional[GetFileCreationDateResult]:
         """
         Extract the creation date from the given file.
 
         Args:
             file_path: Path to the file to analyze.
+            context: The file's shared FileContext. Providers reading the file
+                should read it through the context instead of opening it again.
 
         Returns:
             Optional[GetFileCreationDateResult]: The extracted date information,
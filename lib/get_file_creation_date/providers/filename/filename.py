@@ -4,8 +4,10 @@ from typing import Optional
 
 from lib.dateparser.dateparser import parse_date
 from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
     GetFileCreationDateResult,
 )
+from lib.get_file_creation_date.file_context import FileContext
 from lib.get_file_creation_date.providers.file_creation_date_provider import (
     FileCreationDateProvider,
 )
@@ -26,17 +28,21 @@ class FilenameFileCreationDateProvider(FileCreationDateProvider):
         return True  # Can analyze any filename
 
     def get_file_creation_date(
-        self, file_path: str
+        self, file_path: str, context: Optional[FileContext] = None
     ) -> Optional[GetFileCreationDateResult]:
         """Extract creation date from filename patterns."""
-        parsed_date = parse_date(Path(file_path).name)
+        parsed_date = parse_date(Path(file_path).name, self.USE_DATEUTIL)
         if parsed_date:
             self.logger.debug(f"Found creation date: {parsed_date}")
         else:
             self.logger.debug(f"No creation date found in filename")
 
         return (
-            GetFileCreationDateResult(creation_date=parsed_date, provider="filename")
+            GetFileCreationDateResult(
+                creation_date=parsed_date,
+                provider="filename",
+                confidence=Confidence.HIGH,
+            )
             if parsed_date
             else None
         )
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import patch, Mock
 from datetime import datetime
 
-from lib.get_file_creation_date.domain.create_date_result import GetFileCreationDateResult
+from lib.get_file_creation_date.domain.create_date_result import Confidence, GetFileCreationDateResult
 from lib.get_file_creation_date.providers.filename.filename import FilenameFileCreationDateProvider
 
 
@@ -45,7 +45,7 @@ class TestFilenameFileCreationDateProvider(unittest.TestCase):
         result = self.provider.get_file_creation_date(file_path)
         
         # Verify parse_date was called with the filename
-        mock_parse_date.assert_called_once_with("IMG_20231225_103000.jpg")
+        mock_parse_date.assert_called_once_with("IMG_20231225_103000.jpg", True)
         
         # Verify result
         self.assertIsNotNone(result)
@@ -53,6 +53,7 @@ class TestFilenameFileCreationDateProvider(unittest.TestCase):
         self.assertEqual(result.creation_date, test_date)
         self.assertEqual(result.provider, "filename")
         self.assertIsNone(result.provider_info)
+        self.assertEqual(result.confidence, Confidence.HIGH)
 
     @patch('lib.get_file_creation_date.providers.filename.filename.parse_date')
     def test_get_file_creation_date_with_no_date(self, mock_parse_date):
@@ -63,7 +64,7 @@ class TestFilenameFileCreationDateProvider(unittest.TestCase):
         result = self.provider.get_file_creation_date(file_path)
         
         # Verify parse_date was called with the filename
-        mock_parse_date.assert_called_once_with("random_filename.jpg")
+        mock_parse_date.assert_called_once_with("random_filename.jpg", True)
         
         # Verify result is None
         self.assertIsNone(result)
@@ -87,7 +88,7 @@ class TestFilenameFileCreationDateProvider(unittest.TestCase):
                 expected_filename = Path(file_path).name
                 mock_parse_date.reset_mock()
                 self.provider.get_file_creation_date(file_path)
-                mock_parse_date.assert_called_once_with(expected_filename)
+                mock_parse_date.assert_called_once_with(expected_filename, True)
 
     @patch('lib.get_file_creation_date.providers.filename.filename.parse_date')
     def test_get_file_creation_date_logs_debug_messages(self, mock_parse_date):
@@ -1,6 +1,6 @@
 import logging
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Optional, Tuple
 
 try:
     from hachoir.parser import createParser
@@ -11,13 +11,26 @@ try:
 except ImportError:
     HACHOIR_AVAILABLE = False
 
-from lib.dateparser.dateparser import parse_date
+from lib.dateparser.dateparser import date_from_value, parse_date
+from lib.get_file_creation_date import file_type
 from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
     GetFileCreationDateResult,
 )
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.providers.exif.exif import (
+    ExifFileCreationDateProvider,
+)
 from lib.get_file_creation_date.providers.file_creation_date_provider import (
     FileCreationDateProvider,
 )
+from lib.get_file_creation_date.providers.isobmff.isobmff import (
+    IsoBmffFileCreationDateProvider,
+)
+
+# Hachoir may read far into large or corrupt files. Metadata sits near the start
+# of almost all supported formats, so parsing is cut off after this many bytes.
+MAX_READ_SIZE = 4 * 1024 * 1024
 
 
 class HachoirFileCreationDateProvider(FileCreationDateProvider):
@@ -28,13 +41,71 @@ class HachoirFileCreationDateProvider(FileCreationDateProvider):
     - Images (JPEG, PNG, TIFF, etc.)
     - Videos (MP4, AVI, MOV, etc.)
     - Audio (MP3, FLAC, etc.)
-    - Documents (PDF, etc.)
+    - Legacy office documents (DOC, XLS, etc.)
     """
 
-    def __init__(self):
-        """Initialize the Hachoir provider."""
+    # Hachoir also reads archives and executables, but their timestamps describe
+    # when they were packed or built, so it is only routed to media and documents.
+    FILE_TYPES = frozenset(
+        [
+            file_type.FILE_TYPE_JPEG,
+            file_type.FILE_TYPE_PNG,
+            file_type.FILE_TYPE_GIF,
+            file_type.FILE_TYPE_BMP,
+            file_type.FILE_TYPE_ICO,
+            file_type.FILE_TYPE_TIFF,
+            file_type.FILE_TYPE_PSD,
+            file_type.FILE_TYPE_ISOBMFF,
+            file_type.FILE_TYPE_RIFF,
+            file_type.FILE_TYPE_MATROSKA,
+            file_type.FILE_TYPE_ASF,
+            file_type.FILE_TYPE_FLV,
+            file_type.FILE_TYPE_MPEG_AUDIO,
+            file_type.FILE_TYPE_FLAC,
+            file_type.FILE_TYPE_OGG,
+            file_type.FILE_TYPE_AIFF,
+            file_type.FILE_TYPE_OLE2,
+        ]
+    )
+
+    # Full parses are slow, so files with dates found by a native reader are skipped
+    FALLBACK_FOR = frozenset(
+        [
+            ExifFileCreationDateProvider.__name__,
+            IsoBmffFileCreationDateProvider.__name__,
+        ]
+    )
+
+    # Metadata fields holding a date, in order of priority
+    DATE_FIELDS = [
+        # --- High Priority ---
+        # Most reliable EXIF and common metadata tags for creation time.
+        ("date_time_original", Confidence.HIGH),  # (EXIF) Original image creation.
+        ("creation_date", Confidence.HIGH),  # A very common and explicit tag.
+        ("date_created", Confidence.HIGH),  # Clear and widely used.
+        ("created", Confidence.HIGH),  # Another common variant.
+        # --- Medium Priority ---
+        # Good for specific file types like video and audio.
+        ("recording_date", Confidence.MEDIUM),  # Specific to video/audio.
+        ("shotdate", Confidence.MEDIUM),  # (XMP) Explicitly for when a video was shot.
+        # --- Low Priority (Last Resort) ---
+        # These are often modification dates, but can be a fallback.
+        ("date_time", Confidence.LOW),  # (EXIF) Often the modification date.
+        ("modification_date", Confidence.LOW),
+        ("last_modification", Confidence.LOW),
+    ]
+
+    def __init__(self, max_read_size: Optional[int] = MAX_READ_SIZE):
+        """
+        Initialize the Hachoir provider.
+
+        Args:
+            max_read_size: The number of leading bytes Hachoir may read from a file,
+                or None to let it read whole files.
+        """
         super().__init__()
         self.logger = logging.getLogger(__name__.split(".")[-1])
+        self.max_read_size = max_read_size
 
         if not HACHOIR_AVAILABLE:
             self.logger.warning(
@@ -52,11 +123,20 @@ class HachoirFileCreationDateProvider(FileCreationDateProvider):
         return True
 
     def get_file_creation_date(
-        self, file_path: str
+        self, file_path: str, context: Optional[FileContext] = None
     ) -> Optional[GetFileCreationDateResult]:
         """Extract creation date using Hachoir metadata."""
+        if context is None:
+            with FileContext(file_path) as context:
+                return self.get_file_creation_date(file_path, context)
+
+        truncated = (
+            self.max_read_size is not None and (context.size or 0) > self.max_read_size
+        )
         try:
-            parser = createParser(file_path)
+            # Read through the shared context, so the header read by the file
+            # type sniffer is reused instead of opening the file again
+            parser = createParser(context.open(self.max_read_size))
             if not parser:
                 self.logger.debug(f"Hachoir could not create parser")
                 return None
@@ -66,12 +146,20 @@ class HachoirFileCreationDateProvider(FileCreationDateProvider):
                 self.logger.debug(f"Hachoir could not extract metadata")
                 return None
 
-            creation_date = self._find_creation_date(metadata)
-            if creation_date:
+            found = self._find_creation_date(metadata)
+            if found:
+                creation_date, confidence = found
                 self.logger.debug(f"Found creation date: {creation_date}")
 
                 return GetFileCreationDateResult(
-                    creation_date=creation_date, provider=self.__class__.__name__
+                    creation_date=creation_date,
+                    provider=self.__class__.__name__,
+                    provider_info=(
+                        f"truncated to {self.max_read_size} bytes"
+                        if truncated
+                        else None
+                    ),
+                    confidence=confidence,
                 )
 
             self.logger.debug(f"No creation date found in Hachoir metadata")
@@ -89,33 +177,15 @@ class HachoirFileCreationDateProvider(FileCreationDateProvider):
                 except:
                     pass
 
-    def _find_creation_date(self, metadata) -> Optional[datetime]:
-        """Find creation date in Hachoir metadata."""
-        date_fields = [
-            # --- High Priority ---
-            # Most reliable EXIF and common metadata tags for creation time.
-            "date_time_original",  # (EXIF) The ideal tag for original image creation.
-            "creation_date",  # A very common and explicit tag.
-            "date_created",  # Clear and widely used.
-            "created",  # Another common variant.
-            # --- Medium Priority ---
-            # Good for specific file types like video and audio.
-            "recording_date",  # Specific to video/audio.
-            "shotdate",  # (XMP) Explicitly for when a video was shot.
-            # --- Low Priority (Last Resort) ---
-            # These are often modification dates, but can be a fallback.
-            "date_time",  # (EXIF) Often the modification date, use with caution.
-            "modification_date",
-            "last_modification",
-        ]
-
-        for field_name in date_fields:
+    def _find_creation_date(self, metadata) -> Optional[Tuple[datetime, Confidence]]:
+        """Find creation date in Hachoir metadata, along with its confidence."""
+        for field_name, confidence in self.DATE_FIELDS:
             try:
                 value = metadata.get(field_name)
                 if value:
                     parsed_date = self._parse_metadata_date(value)
                     if parsed_date:
-                        return parsed_date
+                        return parsed_date, confidence
             except Exception as e:
                 self.logger.debug(f"Error accessing field '{field_name}': {e}")
                 continue
@@ -127,12 +197,16 @@ class HachoirFileCreationDateProvider(FileCreationDateProvider):
         if not value:
             return None
 
+        # Hachoir already decodes most date fields
+        if isinstance(value, date):
+            return date_from_value(value)
+
         date_str = str(value).strip()
 
         if not date_str:
             return None
 
-        parsed_date = parse_date(date_str)
+        parsed_date = parse_date(date_str, self.USE_DATEUTIL)
         if parsed_date:
             return parsed_date
 
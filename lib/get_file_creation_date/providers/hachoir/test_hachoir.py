@@ -1,11 +1,25 @@
+import os
+import struct
+import tempfile
 import unittest
 from unittest.mock import patch, Mock, MagicMock
-from datetime import datetime
+from datetime import date, datetime
 
-from lib.get_file_creation_date.domain.create_date_result import GetFileCreationDateResult
+from lib.get_file_creation_date.domain.create_date_result import Confidence, GetFileCreationDateResult
+from lib.get_file_creation_date.file_context import FileContext
 from lib.get_file_creation_date.providers.hachoir.hachoir import HachoirFileCreationDateProvider
 
 
+def _jpeg_with_exif_date(date):
+    """Build a minimal JPEG whose EXIF data only holds DateTimeOriginal."""
+    value = date + b"\x00"
+    ifd0 = struct.pack("<H", 1) + struct.pack("<HHII", 0x8769, 4, 1, 26) + struct.pack("<I", 0)
+    exif_ifd = struct.pack("<H", 1) + struct.pack("<HHII", 0x9003, 2, len(value), 44) + struct.pack("<I", 0)
+    tiff = b"II*\x00" + struct.pack("<I", 8) + ifd0 + exif_ifd + value
+    app1 = b"Exif\x00\x00" + tiff
+    return b"\xff\xd8\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + b"\xff\xd9"
+
+
 class TestHachoirFileCreationDateProvider(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
@@ -68,12 +82,12 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         test_date = datetime(2023, 12, 25, 10, 30, 0)
         
         # Mock the _find_creation_date method
-        with patch.object(self.provider, '_find_creation_date', return_value=test_date):
+        with patch.object(self.provider, '_find_creation_date', return_value=(test_date, Confidence.HIGH)):
             file_path = "/path/to/test.jpg"
             result = self.provider.get_file_creation_date(file_path)
             
             # Verify calls
-            mock_create_parser.assert_called_once_with(file_path)
+            self.assertEqual(mock_create_parser.call_args.args[0].name, file_path)
             mock_extract.assert_called_once_with(mock_parser)
             
             # Verify result
@@ -81,6 +95,7 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
             self.assertIsInstance(result, GetFileCreationDateResult)
             self.assertEqual(result.creation_date, test_date)
             self.assertEqual(result.provider, "HachoirFileCreationDateProvider")
+            self.assertEqual(result.confidence, Confidence.HIGH)
 
     @patch('lib.get_file_creation_date.providers.hachoir.hachoir.createParser')
     @patch('lib.get_file_creation_date.providers.hachoir.hachoir.HACHOIR_AVAILABLE', True)
@@ -92,7 +107,7 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         result = self.provider.get_file_creation_date(file_path)
         
         self.assertIsNone(result)
-        mock_create_parser.assert_called_once_with(file_path)
+        self.assertEqual(mock_create_parser.call_args.args[0].name, file_path)
 
     @patch('lib.get_file_creation_date.providers.hachoir.hachoir.createParser')
     @patch('lib.get_file_creation_date.providers.hachoir.hachoir.extractMetadata')
@@ -150,7 +165,7 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         with patch.object(self.provider, '_parse_metadata_date', return_value=test_date) as mock_parse:
             result = self.provider._find_creation_date(mock_metadata)
             
-            self.assertEqual(result, test_date)
+            self.assertEqual(result, (test_date, Confidence.HIGH))
             mock_parse.assert_called_with("2023-12-25 10:30:00")
 
     def test_find_creation_date_tries_all_fields(self):
@@ -169,7 +184,8 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         with patch.object(self.provider, '_parse_metadata_date', return_value=test_date):
             result = self.provider._find_creation_date(mock_metadata)
             
-            self.assertEqual(result, test_date)
+            # Modification dates are only a last resort
+            self.assertEqual(result, (test_date, Confidence.LOW))
             # Should have tried multiple fields
             self.assertGreater(mock_metadata.get.call_count, 1)
 
@@ -191,7 +207,23 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         result = self.provider._parse_metadata_date("2023-12-25 10:30:00")
         
         self.assertEqual(result, test_date)
-        mock_parse_date.assert_called_once_with("2023-12-25 10:30:00")
+        mock_parse_date.assert_called_once_with("2023-12-25 10:30:00", True)
+
+    @patch('lib.get_file_creation_date.providers.hachoir.hachoir.parse_date')
+    def test_parse_metadata_date_typed_values(self, mock_parse_date):
+        """Test _parse_metadata_date with values Hachoir already decoded."""
+        self.assertEqual(
+            self.provider._parse_metadata_date(datetime(2023, 12, 25, 10, 30, 0, 5)),
+            datetime(2023, 12, 25, 10, 30, 0),
+        )
+        self.assertEqual(
+            self.provider._parse_metadata_date(date(2023, 12, 25)),
+            datetime(2023, 12, 25),
+        )
+        # Unset MP4 timestamps are decoded as 1904-01-01
+        self.assertIsNone(self.provider._parse_metadata_date(datetime(1904, 1, 1)))
+
+        mock_parse_date.assert_not_called()
 
     @patch('lib.get_file_creation_date.providers.hachoir.hachoir.parse_date')
     def test_parse_metadata_date_empty_value(self, mock_parse_date):
@@ -214,7 +246,64 @@ class TestHachoirFileCreationDateProvider(unittest.TestCase):
         result = self.provider._parse_metadata_date("invalid date")
         
         self.assertIsNone(result)
-        mock_parse_date.assert_called_once_with("invalid date")
+        mock_parse_date.assert_called_once_with("invalid date", True)
+
+    @patch('lib.get_file_creation_date.providers.hachoir.hachoir.createParser')
+    @patch('lib.get_file_creation_date.providers.hachoir.hachoir.HACHOIR_AVAILABLE', True)
+    def test_get_file_creation_date_reads_through_context(self, mock_create_parser):
+        """Test that Hachoir parses a file object of the shared context."""
+        mock_create_parser.return_value = None
+        context = Mock()
+        context.size = 1024
+
+        self.provider.get_file_creation_date("/path/to/test.jpg", context)
+
+        context.open.assert_called_once_with(self.provider.max_read_size)
+        mock_create_parser.assert_called_once_with(context.open.return_value)
+
+    def test_get_file_creation_date_from_context(self):
+        """Test a real extraction that only reads through the shared context."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "photo.jpg")
+            with open(file_path, "wb") as f:
+                f.write(_jpeg_with_exif_date(b"2023:12:25 10:30:00"))
+
+            with FileContext(file_path) as context:
+                with patch('builtins.open', side_effect=open) as mock_open:
+                    result = self.provider.get_file_creation_date(file_path, context)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        mock_open.assert_called_once_with(file_path, "rb")
+
+    def test_read_size_is_capped(self):
+        """Test that Hachoir does not read beyond the size limit and marks the result."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "photo.jpg")
+            with open(file_path, "wb") as f:
+                f.write(_jpeg_with_exif_date(b"2023:12:25 10:30:00") + b"\x00" * 100000)
+
+            provider = HachoirFileCreationDateProvider(max_read_size=1024)
+            with FileContext(file_path, header_size=512) as context:
+                with patch.object(context, "_read", wraps=context._read) as mock_read:
+                    result = provider.get_file_creation_date(file_path, context)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        self.assertEqual(result.provider_info, "truncated to 1024 bytes")
+        for call in mock_read.call_args_list:
+            offset, size = call.args
+            self.assertLessEqual(offset + size, 1024)
+
+    def test_small_files_are_not_marked_truncated(self):
+        """Test that files within the size limit are parsed completely."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "photo.jpg")
+            with open(file_path, "wb") as f:
+                f.write(_jpeg_with_exif_date(b"2023:12:25 10:30:00"))
+
+            result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        self.assertIsNone(result.provider_info)
 
     def test_string_representation(self):
         """Test string representation of the provider."""
@@ -0,0 +1,265 @@
+import logging
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+from lib.dateparser.dateparser import date_from_value
+from lib.get_file_creation_date import file_type
+from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
+    GetFileCreationDateResult,
+)
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.providers.exif.exif import (
+    ExifFileCreationDateProvider,
+)
+from lib.get_file_creation_date.providers.file_creation_date_provider import (
+    FileCreationDateProvider,
+)
+
+# Timestamps in movie and track headers count seconds since 1904-01-01 (UTC)
+EPOCH_1904 = datetime(1904, 1, 1)
+
+# Box types a file may start with (see file_type.py)
+TOP_LEVEL_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"pnot", b"free", b"skip"}
+
+# Guards against corrupt files
+MAX_BOXES = 256
+MAX_ITEMS = 4096
+
+
+class IsoBmffFileCreationDateProvider(FileCreationDateProvider):
+    """
+    Extract creation dates from ISO base media files (MP4, MOV, 3GP, HEIC, ...).
+
+    Only box headers are read, seeking from one box to the next, so the media
+    data itself is never touched. Videos yield the creation time of their movie
+    header (moov/mvhd, or the first track header), HEIC images the date tags of
+    their Exif item (meta/iinf/iloc).
+    """
+
+    FILE_TYPES = frozenset([file_type.FILE_TYPE_ISOBMFF])
+
+    def __init__(self):
+        """Initialize the ISO base media file provider."""
+        super().__init__()
+        self.logger = logging.getLogger(__name__.split(".")[-1])
+        self._exif = ExifFileCreationDateProvider()
+
+    def is_available(self) -> bool:
+        """Check if ISO base media file extraction is available."""
+        return True  # Pure Python
+
+    def supports_file(self, file_path: str) -> bool:
+        """Check if this provider supports the given file."""
+        return True  # The file type is checked on the content
+
+    def get_file_creation_date(
+        self, file_path: str, context: Optional[FileContext] = None
+    ) -> Optional[GetFileCreationDateResult]:
+        """Extract creation date from the movie header or the Exif item."""
+        if context is None:
+            with FileContext(file_path) as context:
+                return self.get_file_creation_date(file_path, context)
+
+        try:
+            found = self._find_creation_date(context)
+        except (struct.error, ValueError, IndexError, OverflowError) as e:
+            self.logger.debug(f"ISO base media extraction failed for {file_path}: {e}")
+            return None
+
+        if found:
+            creation_date, source, confidence = found
+            self.logger.debug(f"Found creation date: {creation_date} ({source})")
+
+            return GetFileCreationDateResult(
+                creation_date=creation_date,
+                provider=self.__class__.__name__,
+                provider_info=source,
+                confidence=confidence,
+            )
+
+        self.logger.debug(f"No creation date found in ISO base media boxes")
+        return None
+
+    def _find_creation_date(
+        self, context: FileContext
+    ) -> Optional[Tuple[datetime, str, Confidence]]:
+        size = context.size
+        if not size or context.header[4:8] not in TOP_LEVEL_BOXES:
+            return None
+
+        boxes = {}
+        for box_type, start, end in self._iter_boxes(context, 0, size):
+            boxes.setdefault(box_type, (start, end))
+
+        if b"moov" in boxes:
+            found = self._find_movie_creation_date(context, *boxes[b"moov"])
+            if found:
+                return found
+
+        if b"meta" in boxes:
+            return self._find_exif_item_creation_date(context, *boxes[b"meta"])
+
+        return None
+
+    def _iter_boxes(
+        self, context: FileContext, start: int, end: int
+    ) -> Iterator[Tuple[bytes, int, int]]:
+        """Yields the type, payload offset and end offset of the boxes in a range."""
+        offset = start
+        for _ in range(MAX_BOXES):
+            header = context.read_at(offset, 16)
+            if offset + 8 > end or len(header) < 8:
+                return
+
+            size, box_type = struct.unpack(">I4s", header[:8])
+            header_size = 8
+            if size == 1:  # 64 bit size
+                if len(header) < 16:
+                    return
+                (size,) = struct.unpack(">Q", header[8:])
+                header_size = 16
+            elif size == 0:  # Extends to the end of the file
+                size = end - offset
+            if size < header_size:
+                return
+
+            yield box_type, offset + header_size, min(offset + size, end)
+            offset += size
+
+    def _find_movie_creation_date(
+        self, context: FileContext, start: int, end: int
+    ) -> Optional[Tuple[datetime, str, Confidence]]:
+        """Reads the creation time of the movie header, or of the first track."""
+        track = None
+        for box_type, box_start, box_end in self._iter_boxes(context, start, end):
+            if box_type == b"mvhd":
+                creation_date = self._read_header_creation_time(context, box_start)
+                if creation_date:
+                    return creation_date, "mvhd", Confidence.HIGH
+            elif box_type == b"trak" and track is None:
+                track = (box_start, box_end)
+
+        if track:
+            for box_type, box_start, _ in self._iter_boxes(context, *track):
+                if box_type == b"tkhd":
+                    creation_date = self._read_header_creation_time(context, box_start)
+                    if creation_date:
+                        return creation_date, "tkhd", Confidence.MEDIUM
+
+        return None
+
+    def _read_header_creation_time(
+        self, context: FileContext, offset: int
+    ) -> Optional[datetime]:
+        """Reads the creation time from a movie or track header (full box)."""
+        data = context.read_at(offset, 12)
+        if data[:1] == b"\x01":
+            (seconds,) = struct.unpack(">Q", data[4:12])
+        else:
+            (seconds,) = struct.unpack(">I", data[4:8])
+
+        # Unset timestamps are zero, and some writers count from 1970 instead of
+        # 1904. Both end up outside the supported years and are rejected.
+        try:
+            return date_from_value(EPOCH_1904 + timedelta(seconds=seconds))
+        except OverflowError:
+            return None
+
+    def _find_exif_item_creation_date(
+        self, context: FileContext, start: int, end: int
+    ) -> Optional[Tuple[datetime, str, Confidence]]:
+        """Reads the date tags from the Exif item of a HEIF image."""
+        # The meta box is a full box, its children start after version and flags
+        children = {}
+        for box_type, box_start, box_end in self._iter_boxes(context, start + 4, end):
+            children.setdefault(box_type, (box_start, box_end))
+        if b"iinf" not in children or b"iloc" not in children:
+            return None
+
+        item_id = self._find_exif_item_id(context, *children[b"iinf"])
+        if item_id is None:
+            return None
+        location = self._read_item_locations(context, *children[b"iloc"]).get(item_id)
+        if location is None:
+            return None
+
+        # The item starts with the offset of the TIFF header, usually skipping "Exif\0\0"
+        item_offset, item_length = location
+        (tiff_offset,) = struct.unpack(">I", context.read_at(item_offset, 4))
+        tiff_start = item_offset + 4 + tiff_offset
+        found = self._exif.find_creation_date_in_tiff(
+            lambda position, size: context.read_at(tiff_start + position, size)
+        )
+        if found:
+            creation_date, tag_name, confidence = found
+            return creation_date, f"Exif {tag_name}", confidence
+        return None
+
+    def _find_exif_item_id(
+        self, context: FileContext, start: int, end: int
+    ) -> Optional[int]:
+        """Finds the ID of the Exif item in the item information box."""
+        # Version and flags are followed by a 16 bit entry count in version 0,
+        # by a 32 bit one otherwise
+        version = context.read_at(start, 1)
+        entries_start = start + (6 if version == b"\x00" else 8)
+
+        for box_type, box_start, _ in self._iter_boxes(context, entries_start, end):
+            if box_type != b"infe":
+                continue
+            data = context.read_at(box_start, 12)
+            if data[0] == 2:
+                item_id, item_type = struct.unpack(">H2x4s", data[4:12])
+            elif data[0] == 3:
+                item_id, item_type = struct.unpack(
+                    ">I2x4s", context.read_at(box_start + 4, 10)
+                )
+            else:
+                continue
+            if item_type == b"Exif":
+                return item_id
+
+        return None
+
+    def _read_item_locations(
+        self, context: FileContext, start: int, end: int
+    ) -> Dict[int, Tuple[int, int]]:
+        """Reads the file offset and length of the items' first extents."""
+        data = context.read_at(start, end - start)
+        if len(data) < 6:
+            return {}
+        version = data[0]
+        offset_size, length_size = data[4] >> 4, data[4] & 0x0F
+        base_offset_size = data[5] >> 4
+        index_size = data[5] & 0x0F if version in (1, 2) else 0
+        position = 6
+
+        def read_uint(size):
+            nonlocal position
+            if position + size > len(data):
+                raise ValueError("Item location box is truncated")
+            value = int.from_bytes(data[position : position + size], "big")
+            position += size
+            return value
+
+        item_count = read_uint(2 if version < 2 else 4)
+        locations = {}
+        for _ in range(min(item_count, MAX_ITEMS)):
+            item_id = read_uint(2 if version < 2 else 4)
+            construction_method = read_uint(2) & 0x0F if version in (1, 2) else 0
+            read_uint(2)  # Data reference index
+            base_offset = read_uint(base_offset_size)
+            extent_count = read_uint(2)
+            extents = []
+            for _ in range(extent_count):
+                read_uint(index_size)
+                extents.append((read_uint(offset_size), read_uint(length_size)))
+
+            # Only items stored in the file itself are supported
+            if construction_method == 0 and extents:
+                extent_offset, extent_length = extents[0]
+                locations[item_id] = (base_offset + extent_offset, extent_length)
+
+        return locations
@@ -0,0 +1,219 @@
+import os
+import struct
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from lib.get_file_creation_date.domain.create_date_result import Confidence
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.providers.exif.exif import TAG_DATE_TIME_ORIGINAL
+from lib.get_file_creation_date.providers.exif.test_exif import _tiff
+from lib.get_file_creation_date.providers.hachoir.hachoir import (
+    HACHOIR_AVAILABLE,
+    HachoirFileCreationDateProvider,
+)
+from lib.get_file_creation_date.providers.isobmff.isobmff import (
+    IsoBmffFileCreationDateProvider,
+)
+
+# 2023-12-21 10:40:00 in seconds since 1904-01-01
+SECONDS_1904 = 3786000000
+# Seconds between the 1904 and 1970 epochs
+EPOCH_1970_OFFSET = 2082844800
+
+
+def _box(box_type, payload):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _full_box(box_type, version, payload):
+    return _box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def _mvhd(seconds, version=0, box_type=b"mvhd"):
+    if version == 1:
+        times = struct.pack(">QQIQ", seconds, seconds, 1000, 0)
+    else:
+        times = struct.pack(">IIII", seconds, seconds, 1000, 0)
+    return _full_box(box_type, version, times + b"\x00" * 80)
+
+
+def _ftyp(brand=b"isom"):
+    return _box(b"ftyp", brand + b"\x00\x00\x00\x00" + brand)
+
+
+def _heic(tiff):
+    """Build a HEIC file whose Exif item is stored in the mdat box."""
+    exif_item = struct.pack(">I", 6) + b"Exif\x00\x00" + tiff
+
+    def meta(item_offset):
+        infe_image = _full_box(
+            b"infe", 2, struct.pack(">HH4s", 1, 0, b"hvc1") + b"\x00"
+        )
+        infe_exif = _full_box(b"infe", 2, struct.pack(">HH4s", 2, 0, b"Exif") + b"\x00")
+        iinf = _full_box(b"iinf", 0, struct.pack(">H", 2) + infe_image + infe_exif)
+        # Offsets and lengths of 4 bytes, no base offset
+        iloc = _full_box(
+            b"iloc",
+            0,
+            bytes([0x44, 0x00])
+            + struct.pack(">H", 2)
+            + struct.pack(">HHHII", 1, 0, 1, 0, 0)
+            + struct.pack(">HHHII", 2, 0, 1, item_offset, len(exif_item)),
+        )
+        hdlr = _full_box(b"hdlr", 0, b"\x00" * 4 + b"pict" + b"\x00" * 13)
+        return _full_box(b"meta", 0, hdlr + iinf + iloc)
+
+    head = _ftyp(b"heic") + meta(0)
+    item_offset = len(head) + 8
+    return _ftyp(b"heic") + meta(item_offset) + _box(b"mdat", exif_item)
+
+
+class TestIsoBmffFileCreationDateProvider(unittest.TestCase):
+    def setUp(self):
+        """Set up the provider and a temporary directory."""
+        self.provider = IsoBmffFileCreationDateProvider()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        file_path = os.path.join(self.temp_dir.name, name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def test_movie_header(self):
+        """Test that the creation time of the movie header is read."""
+        file_path = self._write(
+            "video.mp4",
+            _ftyp() + _box(b"moov", _mvhd(SECONDS_1904)) + _box(b"mdat", b"\x00" * 64),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 21, 10, 40))
+        self.assertEqual(result.provider, "IsoBmffFileCreationDateProvider")
+        self.assertEqual(result.provider_info, "mvhd")
+        self.assertEqual(result.confidence, Confidence.HIGH)
+
+    def test_64_bit_movie_header(self):
+        """Test that version 1 movie headers with 64 bit times are read."""
+        file_path = self._write(
+            "video.mov", _ftyp(b"qt  ") + _box(b"moov", _mvhd(SECONDS_1904, version=1))
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 21, 10, 40))
+
+    def test_media_data_is_skipped(self):
+        """Test that a large mdat box before moov is skipped without being read."""
+        mdat = struct.pack(">I4sQ", 1, b"mdat", 16 + 10**6) + b"\x00" * 10**6
+        head = _ftyp() + mdat[:16]
+        file_path = self._write(
+            "video.mp4", _ftyp() + mdat + _box(b"moov", _mvhd(SECONDS_1904))
+        )
+
+        with FileContext(file_path, header_size=64) as context:
+            with patch.object(context, "_read", wraps=context._read) as mock_read:
+                result = self.provider.get_file_creation_date(file_path, context)
+
+        reads = [call.args for call in mock_read.call_args_list]
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 21, 10, 40))
+        # Apart from the shared header, nothing inside the media data is read
+        self.assertLess(sum(size for _, size in reads), 1024)
+        for offset, size in reads[1:]:
+            self.assertFalse(len(head) < offset + size and offset < len(head) + 10**6)
+
+    def test_track_header_fallback(self):
+        """Test that the track header is used if the movie header is unset."""
+        trak = _box(b"trak", _mvhd(SECONDS_1904, box_type=b"tkhd"))
+        file_path = self._write("video.mp4", _ftyp() + _box(b"moov", _mvhd(0) + trak))
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 21, 10, 40))
+        self.assertEqual(result.provider_info, "tkhd")
+        self.assertEqual(result.confidence, Confidence.MEDIUM)
+
+    def test_unset_creation_time(self):
+        """Test that zero timestamps yield no date."""
+        file_path = self._write("video.mp4", _ftyp() + _box(b"moov", _mvhd(0)))
+
+        self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_out_of_range_creation_time(self):
+        """Test that timestamps outside the supported years yield no date."""
+        # One day after the 1904 epoch, and a date counted from 1970 instead
+        for seconds in [86400, SECONDS_1904 - EPOCH_1970_OFFSET]:
+            file_path = self._write(
+                "video.mp4", _ftyp() + _box(b"moov", _mvhd(seconds))
+            )
+
+            self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_out_of_range_movie_header_falls_back(self):
+        """Test that the track header is used if the movie header is out of range."""
+        trak = _box(b"trak", _mvhd(SECONDS_1904, box_type=b"tkhd"))
+        file_path = self._write(
+            "video.mp4", _ftyp() + _box(b"moov", _mvhd(86400) + trak)
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 21, 10, 40))
+        self.assertEqual(result.provider_info, "tkhd")
+
+    def test_heic_exif_item(self):
+        """Test that the date tags of a HEIC image's Exif item are read."""
+        tiff = _tiff(
+            {}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"}, byte_order=">"
+        )
+        file_path = self._write("photo.heic", _heic(tiff))
+
+        result = self.provider.get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30))
+        self.assertEqual(result.provider_info, "Exif DateTimeOriginal")
+        self.assertEqual(result.confidence, Confidence.HIGH)
+
+    def test_other_files(self):
+        """Test that files that are not ISO base media files yield no date."""
+        file_path = self._write("video.mp4", b"RIFF" + b"\x00" * 60)
+
+        self.assertIsNone(self.provider.get_file_creation_date(file_path))
+
+    def test_truncated_file(self):
+        """Test that truncated files yield no date instead of an error."""
+        tiff = _tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"})
+        for content in [_ftyp() + _box(b"moov", _mvhd(SECONDS_1904)), _heic(tiff)]:
+            for size in range(0, len(content), 5):
+                with self.subTest(size=size):
+                    file_path = self._write("video.mp4", content[:size])
+                    self.provider.get_file_creation_date(file_path)
+
+    @unittest.skipUnless(HACHOIR_AVAILABLE, "Hachoir is not installed")
+    def test_same_date_as_hachoir(self):
+        """Test that the box walker agrees with Hachoir on the creation time."""
+        file_path = self._write(
+            "video.mp4",
+            _ftyp() + _box(b"moov", _mvhd(SECONDS_1904)) + _box(b"mdat", b"\x00" * 64),
+        )
+
+        result = self.provider.get_file_creation_date(file_path)
+        expected = HachoirFileCreationDateProvider().get_file_creation_date(file_path)
+
+        self.assertEqual(result.creation_date, expected.creation_date)
+        self.assertEqual(result.confidence, expected.confidence)
+
+    def test_string_representation(self):
+        """Test string representation of the provider."""
+        self.assertEqual(str(self.provider), "IsoBmffFileCreationDateProvider")
+
+
+if __name__ == "__main__":
+    unittest.main()
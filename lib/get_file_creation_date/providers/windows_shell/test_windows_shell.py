@@ -1,8 +1,8 @@
 import unittest
 from unittest.mock import patch, Mock
-from datetime import datetime
+from datetime import datetime, timezone
 
-from lib.get_file_creation_date.domain.create_date_result import GetFileCreationDateResult
+from lib.get_file_creation_date.domain.create_date_result import Confidence, GetFileCreationDateResult
 from lib.get_file_creation_date.providers.windows_shell.windows_shell import WindowsShellFileCreationDateProvider
 
 
@@ -85,7 +85,7 @@ class TestWindowsShellFileCreationDateProvider(unittest.TestCase):
         mock_propsys.SHGetPropertyStoreFromParsingName.assert_called_once()
         mock_propsys.PSGetPropertyKeyFromName.assert_called()
         mock_prop_store.GetValue.assert_called()
-        mock_parse_date.assert_called_with("2023-12-25 10:30:00")
+        mock_parse_date.assert_called_with("2023-12-25 10:30:00", True)
         
         # Verify result
         self.assertIsNotNone(result)
@@ -93,6 +93,26 @@ class TestWindowsShellFileCreationDateProvider(unittest.TestCase):
         self.assertEqual(result.creation_date, test_date)
         self.assertEqual(result.provider, "windows_shell")
         self.assertEqual(result.provider_info, "System.Photo.DateTaken")  # First property in list
+        self.assertEqual(result.confidence, Confidence.HIGH)
+
+    @patch('platform.system', return_value='Windows')
+    @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.WIN32COM_AVAILABLE', True)
+    @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.shellcon')
+    @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.propsys')
+    @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.parse_date')
+    def test_get_file_creation_date_datetime_value(self, mock_parse_date, mock_propsys, mock_shellcon, mock_system):
+        """Test that datetime property values are used without parsing text."""
+        mock_prop_store = Mock()
+        mock_propsys.SHGetPropertyStoreFromParsingName.return_value = mock_prop_store
+        mock_prop_value = Mock()
+        mock_prop_value.GetValue.return_value = datetime(2023, 12, 25, 10, 30, 0, 500, tzinfo=timezone.utc)
+        mock_prop_store.GetValue.return_value = mock_prop_value
+
+        result = self.provider.get_file_creation_date("C:\\path\\to\\test.jpg")
+
+        mock_parse_date.assert_not_called()
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30, 0))
+        self.assertEqual(result.provider_info, "System.Photo.DateTaken")
 
     @patch('platform.system', return_value='Windows')
     @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.WIN32COM_AVAILABLE', True)
@@ -167,6 +187,7 @@ class TestWindowsShellFileCreationDateProvider(unittest.TestCase):
         # Should succeed with the last property
         self.assertIsNotNone(result)
         self.assertEqual(result.provider_info, "System.DateModified")  # Last property in list
+        self.assertEqual(result.confidence, Confidence.LOW)
 
     @patch('platform.system', return_value='Windows')
     @patch('lib.get_file_creation_date.providers.windows_shell.windows_shell.WIN32COM_AVAILABLE', True)
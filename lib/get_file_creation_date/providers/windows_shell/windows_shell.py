@@ -1,5 +1,6 @@
 import logging
 import platform
+from datetime import date
 from typing import Optional
 
 try:
@@ -11,10 +12,12 @@ except ImportError:
     propsys = None
     shellcon = None
 
-from lib.dateparser.dateparser import parse_date
+from lib.dateparser.dateparser import date_from_value, parse_date
 from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
     GetFileCreationDateResult,
 )
+from lib.get_file_creation_date.file_context import FileContext
 from lib.get_file_creation_date.providers.file_creation_date_provider import (
     FileCreationDateProvider,
 )
@@ -28,6 +31,14 @@ class WindowsShellFileCreationDateProvider(FileCreationDateProvider):
         "System.DateModified",  # File system modification date (fallback)
     ]
 
+    # File system dates change whenever a file is copied, so they are less trustworthy
+    PROPERTY_CONFIDENCE = {
+        "System.Photo.DateTaken": Confidence.HIGH,
+        "System.DateAcquired": Confidence.MEDIUM,
+        "System.DateCreated": Confidence.LOW,
+        "System.DateModified": Confidence.LOW,
+    }
+
     def __init__(self):
         self.logger = logging.getLogger(__name__.split(".")[-1])
 
@@ -40,7 +51,7 @@ class WindowsShellFileCreationDateProvider(FileCreationDateProvider):
         return True  # Can work on any file
 
     def get_file_creation_date(
-        self, file_path: str
+        self, file_path: str, context: Optional[FileContext] = None
     ) -> Optional[GetFileCreationDateResult]:
         """Use modern Windows Property System with universal PKEYs"""
         if not self.is_available():
@@ -62,9 +73,13 @@ class WindowsShellFileCreationDateProvider(FileCreationDateProvider):
                     prop_value = prop_store.GetValue(prop_key)
 
                     if prop_value and prop_value.GetValue():
-                        # Convert to string and parse date
-                        value_str = str(prop_value.GetValue())
-                        parsed_date = parse_date(value_str)
+                        value = prop_value.GetValue()
+                        if isinstance(value, date):
+                            # Date properties are returned as datetime objects
+                            parsed_date = date_from_value(value)
+                        else:
+                            # Convert to string and parse date
+                            parsed_date = parse_date(str(value), self.USE_DATEUTIL)
 
                         if parsed_date:
                             self.logger.debug(
@@ -74,6 +89,7 @@ class WindowsShellFileCreationDateProvider(FileCreationDateProvider):
                                 provider="windows_shell",
                                 provider_info=prop_name,
                                 creation_date=parsed_date,
+                                confidence=self.PROPERTY_CONFIDENCE[prop_name],
                             )
 
                 except Exception as e:
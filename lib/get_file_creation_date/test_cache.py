@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+from lib.get_file_creation_date.cache import CACHE_FILENAME, CreationDateCache
+from lib.get_file_creation_date.domain.create_date_result import (
+    Confidence,
+    GetFileCreationDateResult,
+)
+
+
+class TestCreationDateCache(unittest.TestCase):
+    def setUp(self):
+        """Create a cache and a file in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.cache = CreationDateCache(str(self.root / "cache"))
+        self.file_path = str(self.root / "photo.jpg")
+        Path(self.file_path).write_bytes(b"content")
+        self.result = GetFileCreationDateResult(
+            creation_date=datetime(2023, 5, 14, 10, 15),
+            provider="HachoirFileCreationDateProvider",
+            provider_info="info",
+            confidence=Confidence.HIGH,
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_creates_database_in_cache_dir(self):
+        """Test that the database file is created inside the cache directory."""
+        self.assertTrue((self.root / "cache" / CACHE_FILENAME).is_file())
+
+    def test_miss_for_unknown_file(self):
+        """Test that an unknown file is not found."""
+        self.assertIsNone(
+            self.cache.get(self.file_path, os.stat(self.file_path), "oldest")
+        )
+
+    def test_roundtrip(self):
+        """Test that a stored result is returned unchanged."""
+        stat = os.stat(self.file_path)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        self.assertEqual(self.cache.get(self.file_path, stat, "oldest"), self.result)
+
+    def test_roundtrip_keeps_timezone(self):
+        """Test that timezone-aware dates survive the roundtrip."""
+        stat = os.stat(self.file_path)
+        self.result.creation_date = datetime(2023, 5, 14, 10, 15, tzinfo=timezone.utc)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        self.assertEqual(
+            self.cache.get(self.file_path, stat, "oldest").creation_date,
+            self.result.creation_date,
+        )
+
+    def test_variants_are_separate(self):
+        """Test that results selected with another strategy are not reused."""
+        stat = os.stat(self.file_path)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        self.assertIsNone(self.cache.get(self.file_path, stat, "priority-first"))
+
+    def test_hit_after_move(self):
+        """Test that a moved file is found through its inode."""
+        stat = os.stat(self.file_path)
+        if not stat.st_ino:
+            self.skipTest("File system has no inode numbers")
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        (self.root / "moved").mkdir()
+        new_path = str(self.root / "moved" / "photo.jpg")
+        os.rename(self.file_path, new_path)
+
+        self.assertEqual(
+            self.cache.get(new_path, os.stat(new_path), "oldest"), self.result
+        )
+
+    def test_miss_after_rename(self):
+        """Test that a renamed file is analyzed again, as its date may be in the name."""
+        stat = os.stat(self.file_path)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        new_path = str(self.root / "IMG_20190101_000000.jpg")
+        os.rename(self.file_path, new_path)
+
+        self.assertIsNone(self.cache.get(new_path, os.stat(new_path), "oldest"))
+
+    def test_files_without_inode_are_kept_apart(self):
+        """Test that files without inode numbers do not replace each other's entries."""
+        other_path = str(self.root / "other.jpg")
+        other_result = GetFileCreationDateResult(
+            creation_date=datetime(2019, 1, 1), provider="other"
+        )
+        stat = os.stat(self.file_path)
+        no_inode = Mock(
+            st_dev=0, st_ino=0, st_size=stat.st_size, st_mtime_ns=stat.st_mtime_ns
+        )
+
+        self.cache.put(self.file_path, no_inode, "oldest", self.result)
+        self.cache.put(other_path, no_inode, "oldest", other_result)
+        self.cache.put(other_path, no_inode, "oldest", other_result)
+
+        self.assertEqual(
+            self.cache.get(self.file_path, no_inode, "oldest"), self.result
+        )
+        self.assertEqual(self.cache.get(other_path, no_inode, "oldest"), other_result)
+        (count,) = self.cache._connection.execute(
+            "SELECT COUNT(*) FROM creation_dates"
+        ).fetchone()
+        self.assertEqual(count, 2)
+
+    def test_invalidated_by_modification(self):
+        """Test that a changed size or mtime invalidates the entry."""
+        stat = os.stat(self.file_path)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        Path(self.file_path).write_bytes(b"changed content")
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNone(
+            self.cache.get(self.file_path, os.stat(self.file_path), "oldest")
+        )
+
+    def test_persists_across_connections(self):
+        """Test that entries are available to a new cache instance."""
+        stat = os.stat(self.file_path)
+        self.cache.put(self.file_path, stat, "oldest", self.result)
+
+        other = CreationDateCache(str(self.root / "cache"))
+        try:
+            self.assertEqual(other.get(self.file_path, stat, "oldest"), self.result)
+        finally:
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from lib.get_file_creation_date.file_context import FileContext
+
+
+class TestFileContext(unittest.TestCase):
+    def setUp(self):
+        """Create a file with known content in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = str(Path(self.temp_dir.name) / "video.mp4")
+        self.content = bytes(range(256)) * 40
+        Path(self.file_path).write_bytes(self.content)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_header_is_read_lazily_and_once(self):
+        """Test that the file is only opened on first access and read once."""
+        with patch("builtins.open", side_effect=open) as mock_open:
+            with FileContext(self.file_path, header_size=1024) as context:
+                mock_open.assert_not_called()
+                self.assertEqual(context.header, self.content[:1024])
+                self.assertEqual(context.header, self.content[:1024])
+
+        mock_open.assert_called_once_with(self.file_path, "rb")
+
+    def test_read_at_spans_header_and_file(self):
+        """Test that reads beyond the header continue from the file."""
+        with FileContext(self.file_path, header_size=1024) as context:
+            self.assertEqual(context.read_at(10, 20), self.content[10:30])
+            self.assertEqual(context.read_at(1000, 100), self.content[1000:1100])
+            self.assertEqual(context.read_at(5000, 100), self.content[5000:5100])
+            self.assertEqual(context.read_at(len(self.content), 10), b"")
+
+    def test_tail(self):
+        """Test that trailing bytes are returned and cached."""
+        with FileContext(self.file_path, header_size=1024) as context:
+            self.assertEqual(context.tail(100), self.content[-100:])
+            self.assertEqual(context.tail(50), self.content[-50:])
+            self.assertEqual(context.tail(10**6), self.content)
+
+    def test_small_file_is_served_from_header(self):
+        """Test that files shorter than the header are read only once."""
+        with FileContext(self.file_path) as context:
+            context.header
+            with patch.object(context, "_read") as mock_read:
+                self.assertEqual(context.read_at(5000, 100), self.content[5000:5100])
+                self.assertEqual(context.tail(100), self.content[-100:])
+            mock_read.assert_not_called()
+
+    def test_stat(self):
+        """Test that the stat result is loaded lazily or taken from the caller."""
+        stat = os.stat(self.file_path)
+
+        self.assertEqual(FileContext(self.file_path).stat, stat)
+        self.assertIs(FileContext(self.file_path, stat=stat).stat, stat)
+
+    def test_open_returns_seekable_file(self):
+        """Test that the file object reads and seeks like a regular file."""
+        with FileContext(self.file_path, header_size=1024) as context:
+            with context.open() as f:
+                self.assertEqual(f.name, self.file_path)
+                self.assertEqual(f.read(10), self.content[:10])
+                f.seek(2000)
+                self.assertEqual(f.read(10), self.content[2000:2010])
+                self.assertEqual(f.seek(0, os.SEEK_END), len(self.content))
+                f.seek(-5, os.SEEK_END)
+                self.assertEqual(f.read(), self.content[-5:])
+
+            # Closing the file object leaves the context usable
+            self.assertEqual(context.read_at(0, 4), self.content[:4])
+
+    def test_open_with_size_limit(self):
+        """Test that the file object ends at the size limit."""
+        with FileContext(self.file_path, header_size=1024) as context:
+            with context.open(max_size=2000) as f:
+                self.assertEqual(f.seek(0, os.SEEK_END), 2000)
+                f.seek(1990)
+                self.assertEqual(f.read(), self.content[1990:2000])
+                f.seek(5000)
+                self.assertEqual(f.read(10), b"")
+
+    def test_missing_file(self):
+        """Test that a missing file results in empty data instead of errors."""
+        with FileContext(self.file_path + ".missing") as context:
+            self.assertIsNone(context.stat)
+            self.assertEqual(context.header, b"")
+            self.assertEqual(context.read_at(0, 10), b"")
+            self.assertEqual(context.tail(10), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
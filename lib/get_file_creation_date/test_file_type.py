@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from lib.get_file_creation_date.file_type import (
+    FILE_TYPE_ISOBMFF,
+    FILE_TYPE_JPEG,
+    FILE_TYPE_MPEG_AUDIO,
+    FILE_TYPE_TIFF,
+    FILE_TYPE_UNKNOWN,
+    FILE_TYPE_ZIP,
+    FILE_TYPES,
+    SNIFF_SIZE,
+    classify_file,
+)
+
+
+class TestClassifyFile(unittest.TestCase):
+    def test_signatures(self):
+        """Test that common signatures are recognized regardless of the extension."""
+        test_cases = [
+            (b"\xff\xd8\xff\xe1\x00\x10Exif", FILE_TYPE_JPEG),
+            (b"II*\x00\x08\x00\x00\x00", FILE_TYPE_TIFF),
+            (b"MM\x00*\x00\x00\x00\x08", FILE_TYPE_TIFF),
+            (b"\x00\x00\x00\x18ftypheic", FILE_TYPE_ISOBMFF),
+            (b"\x00\x00\x00\x08wide\x00\x00", FILE_TYPE_ISOBMFF),
+            (b"ID3\x03\x00", FILE_TYPE_MPEG_AUDIO),
+            (b"PK\x03\x04\x14\x00", FILE_TYPE_ZIP),
+        ]
+
+        for header, expected in test_cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(classify_file("/path/to/file.bin", header), expected)
+
+    def test_signature_takes_precedence_over_extension(self):
+        """Test that a JPEG named .docx is still classified by its content."""
+        self.assertEqual(
+            classify_file("/path/to/file.docx", b"\xff\xd8\xff\xe0"), FILE_TYPE_JPEG
+        )
+
+    def test_extension_fallback(self):
+        """Test that the extension is used when the content is not recognized."""
+        self.assertEqual(
+            classify_file("/path/to/song.MP3", b"\xff\xfb\x90"), FILE_TYPE_MPEG_AUDIO
+        )
+        self.assertEqual(classify_file("/path/to/report.docx", b""), FILE_TYPE_ZIP)
+
+    def test_unknown(self):
+        """Test that unrecognized files are classified as unknown."""
+        self.assertEqual(
+            classify_file("/path/to/notes.txt", b"hello world"), FILE_TYPE_UNKNOWN
+        )
+        self.assertEqual(
+            classify_file("/path/to/script.py", b"import os"), FILE_TYPE_UNKNOWN
+        )
+
+    def test_reads_header_from_file(self):
+        """Test that the header is read from disk if not given."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "no_extension"
+            file_path.write_bytes(b"\x00\x00\x00\x20ftypmp42" + b"\x00" * 100)
+
+            self.assertEqual(classify_file(str(file_path)), FILE_TYPE_ISOBMFF)
+
+    def test_unreadable_file_uses_extension(self):
+        """Test that files that cannot be read are classified by extension."""
+        self.assertEqual(classify_file("/does/not/exist.jpg"), FILE_TYPE_JPEG)
+
+    def test_sniff_size_covers_offset_signatures(self):
+        """Test that SNIFF_SIZE is large enough for signatures at an offset."""
+        self.assertGreaterEqual(SNIFF_SIZE, 8)
+
+    def test_file_types_are_unique(self):
+        """Test that every file type is listed once."""
+        self.assertEqual(len(FILE_TYPES), len(set(FILE_TYPES)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,21 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 from datetime import datetime
 
-from lib.get_file_creation_date.domain.create_date_result import GetFileCreationDateResult
-from lib.get_file_creation_date.get_file_creation_date import get_file_creation_date
+from lib.get_file_creation_date.domain.create_date_result import Confidence, GetFileCreationDateResult
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.provider_registry import ProviderRegistry
+from lib.get_file_creation_date.providers.exif.exif import TAG_DATE_TIME_ORIGINAL
+from lib.get_file_creation_date.providers.exif.test_exif import _jpeg, _tiff
+from lib.get_file_creation_date.providers.hachoir.hachoir import HachoirFileCreationDateProvider
+from lib.get_file_creation_date.get_file_creation_date import (
+    DEFAULT_REGISTRY,
+    STRATEGY_FIRST_WITH_CONFIDENCE,
+    STRATEGY_PRIORITY_FIRST,
+    get_file_creation_date,
+)
 
 
 class TestGetFileCreationDate(unittest.TestCase):
@@ -38,7 +50,7 @@ class TestGetFileCreationDate(unittest.TestCase):
         # Verify results
         self.assertEqual(result, self.test_result)
         mock_provider1.supports_file.assert_called_once_with(self.test_file_path)
-        mock_provider1.get_file_creation_date.assert_called_once_with(self.test_file_path)
+        mock_provider1.get_file_creation_date.assert_called_once_with(self.test_file_path, ANY)
         mock_provider2.supports_file.assert_called_once_with(self.test_file_path)
         mock_provider2.get_file_creation_date.assert_not_called()  # Shouldn't be called since supports_file returned False
         mock_get_oldest.assert_called_once()
@@ -173,5 +185,308 @@ class TestGetFileCreationDate(unittest.TestCase):
         self.assertEqual(str(cm.exception), "Provider error")
 
 
+class TestGetFileCreationDateStrategies(unittest.TestCase):
+    def setUp(self):
+        """Set up providers returning dates of different age and confidence."""
+        self.test_file_path = "/path/to/test/IMG_20231225_103000.jpg"
+        self.low = GetFileCreationDateResult(
+            creation_date=datetime(2020, 1, 1), provider="low", confidence=Confidence.LOW
+        )
+        self.high = GetFileCreationDateResult(
+            creation_date=datetime(2023, 12, 25), provider="high", confidence=Confidence.HIGH
+        )
+        self.providers = [self._provider(self.low), self._provider(self.high), self._provider(None)]
+
+    def _provider(self, result):
+        provider = Mock()
+        provider.supports_file.return_value = True
+        provider.get_file_creation_date.return_value = result
+        return provider
+
+    def _patch_providers(self):
+        return patch(
+            'lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE',
+            self.providers,
+        )
+
+    def test_oldest_queries_all_providers(self):
+        """Test that the default strategy asks every provider and keeps the oldest date."""
+        with self._patch_providers():
+            result = get_file_creation_date(self.test_file_path)
+
+        self.assertEqual(result, self.low)
+        for provider in self.providers:
+            provider.get_file_creation_date.assert_called_once_with(self.test_file_path, ANY)
+
+    def test_priority_first_stops_at_first_result(self):
+        """Test that priority-first returns the first date and skips later providers."""
+        with self._patch_providers():
+            result = get_file_creation_date(self.test_file_path, strategy=STRATEGY_PRIORITY_FIRST)
+
+        self.assertEqual(result, self.low)
+        self.providers[1].get_file_creation_date.assert_not_called()
+        self.providers[2].get_file_creation_date.assert_not_called()
+
+    def test_first_with_confidence_stops_at_confident_result(self):
+        """Test that first-with-confidence skips unconfident dates and stops at a confident one."""
+        with self._patch_providers():
+            result = get_file_creation_date(self.test_file_path, strategy=STRATEGY_FIRST_WITH_CONFIDENCE)
+
+        self.assertEqual(result, self.high)
+        self.providers[2].get_file_creation_date.assert_not_called()
+
+    def test_first_with_confidence_falls_back_to_oldest(self):
+        """Test that first-with-confidence returns the oldest date if none is confident enough."""
+        self.providers.pop(1)
+        with self._patch_providers():
+            result = get_file_creation_date(
+                self.test_file_path,
+                strategy=STRATEGY_FIRST_WITH_CONFIDENCE,
+                min_confidence=Confidence.MEDIUM,
+            )
+
+        self.assertEqual(result, self.low)
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with self._patch_providers():
+            with self.assertRaises(ValueError):
+                get_file_creation_date(self.test_file_path, strategy="newest")
+
+
+class TestGetFileCreationDateCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a real file and a mocked cache."""
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_file.close()
+        self.test_result = GetFileCreationDateResult(
+            creation_date=datetime(2023, 12, 25, 10, 30, 0), provider="test_provider"
+        )
+        self.provider = Mock()
+        self.provider.supports_file.return_value = True
+        self.provider.get_file_creation_date.return_value = self.test_result
+        self.cache = Mock()
+
+    def tearDown(self):
+        os.unlink(self.temp_file.name)
+
+    def test_cache_hit_skips_providers(self):
+        """Test that a cached result is returned without asking any provider."""
+        self.cache.get.return_value = self.test_result
+
+        with patch('lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE', [self.provider]):
+            result = get_file_creation_date(self.temp_file.name, cache=self.cache)
+
+        self.assertEqual(result, self.test_result)
+        self.provider.get_file_creation_date.assert_not_called()
+        self.cache.put.assert_not_called()
+
+    def test_cache_miss_stores_result(self):
+        """Test that a newly found result is added to the cache."""
+        self.cache.get.return_value = None
+
+        with patch('lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE', [self.provider]):
+            result = get_file_creation_date(self.temp_file.name, cache=self.cache)
+
+        self.assertEqual(result, self.test_result)
+        file_path, stat, variant, stored = self.cache.put.call_args.args
+        self.assertEqual(file_path, self.temp_file.name)
+        self.assertEqual(stat.st_size, os.stat(self.temp_file.name).st_size)
+        self.assertEqual(variant, "oldest")
+        self.assertEqual(stored, self.test_result)
+
+    def test_cache_variant_includes_min_confidence(self):
+        """Test that first-with-confidence results are cached per confidence threshold."""
+        self.cache.get.return_value = None
+
+        with patch('lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE', [self.provider]):
+            get_file_creation_date(
+                self.temp_file.name,
+                strategy=STRATEGY_FIRST_WITH_CONFIDENCE,
+                min_confidence=Confidence.MEDIUM,
+                cache=self.cache,
+            )
+
+        self.assertEqual(self.cache.get.call_args.args[2], "first-with-confidence:medium")
+
+    def test_stat_without_inode_is_replaced(self):
+        """Test that the cache gets the inode from os.stat if the scan had none, as on Windows."""
+        self.cache.get.return_value = None
+        stat = os.stat(self.temp_file.name)
+        if not stat.st_ino:
+            self.skipTest("File system has no inode numbers")
+        scan_stat = Mock(st_dev=0, st_ino=0, st_size=stat.st_size, st_mtime_ns=stat.st_mtime_ns)
+        context = FileContext(self.temp_file.name, stat=scan_stat)
+
+        with patch('lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE', [self.provider]):
+            get_file_creation_date(self.temp_file.name, cache=self.cache, context=context)
+
+        self.assertEqual(self.cache.get.call_args.args[1].st_ino, stat.st_ino)
+        self.assertEqual(self.cache.put.call_args.args[1].st_ino, stat.st_ino)
+
+    def test_missing_file_bypasses_cache(self):
+        """Test that files that cannot be stat'ed are analyzed without the cache."""
+        with patch('lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE', [self.provider]):
+            result = get_file_creation_date("/does/not/exist.jpg", cache=self.cache)
+
+        self.assertEqual(result, self.test_result)
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+
+class TestGetFileCreationDateContext(unittest.TestCase):
+    def setUp(self):
+        """Set up providers recording the context they are given."""
+        self.temp_file = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
+        self.temp_file.write(b"\xff\xd8\xff\xe0" + b"\x00" * 100)
+        self.temp_file.close()
+        self.providers = [Mock(), Mock()]
+        for provider in self.providers:
+            provider.supports_file.return_value = True
+            provider.get_file_creation_date.return_value = None
+
+    def tearDown(self):
+        os.unlink(self.temp_file.name)
+
+    def _patch_providers(self):
+        return patch(
+            'lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE',
+            self.providers,
+        )
+
+    def test_providers_share_one_context(self):
+        """Test that all providers are handed the same context for a file."""
+        with self._patch_providers():
+            get_file_creation_date(self.temp_file.name)
+
+        contexts = [p.get_file_creation_date.call_args.args[1] for p in self.providers]
+        self.assertIsInstance(contexts[0], FileContext)
+        self.assertIs(contexts[0], contexts[1])
+        self.assertEqual(contexts[0].file_path, self.temp_file.name)
+
+    def test_given_context_is_used_and_left_open(self):
+        """Test that a context passed in by the caller is used and not closed."""
+        with FileContext(self.temp_file.name) as context:
+            context.header
+            with self._patch_providers():
+                get_file_creation_date(self.temp_file.name, context=context)
+
+            self.assertIs(self.providers[0].get_file_creation_date.call_args.args[1], context)
+            self.assertIsNotNone(context._handle)
+
+    def test_header_is_read_once(self):
+        """Test that classification and providers read the file through one open call."""
+        registry = ProviderRegistry()
+        for i, provider in enumerate(self.providers):
+            provider.__str__ = Mock(return_value=f"Provider{i}")
+            provider.get_file_creation_date.side_effect = lambda path, context: context.header and None
+            registry.register(str(provider), ["jpeg"])
+
+        with self._patch_providers(), patch('builtins.open', side_effect=open) as mock_open:
+            get_file_creation_date(self.temp_file.name, registry=registry)
+
+        mock_open.assert_called_once_with(self.temp_file.name, "rb")
+
+
+class TestGetFileCreationDateRouting(unittest.TestCase):
+    def setUp(self):
+        """Set up a name-based provider and a provider restricted to JPEG files."""
+        self.result = GetFileCreationDateResult(
+            creation_date=datetime(2023, 12, 25), provider="test_provider"
+        )
+        self.name_provider = Mock()
+        self.name_provider.__str__ = Mock(return_value="NameProvider")
+        self.name_provider.FILE_TYPES = None
+        self.name_provider.FALLBACK_FOR = None
+        self.name_provider.supports_file.return_value = True
+        self.name_provider.get_file_creation_date.return_value = None
+
+        self.jpeg_provider = Mock()
+        self.jpeg_provider.__str__ = Mock(return_value="JpegProvider")
+        self.jpeg_provider.FILE_TYPES = frozenset(["jpeg"])
+        self.jpeg_provider.FALLBACK_FOR = None
+        self.jpeg_provider.supports_file.return_value = True
+        self.jpeg_provider.get_file_creation_date.return_value = self.result
+
+        self.registry = ProviderRegistry([self.name_provider, self.jpeg_provider])
+
+    def _patch_providers(self):
+        return patch(
+            'lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE',
+            [self.name_provider, self.jpeg_provider],
+        )
+
+    @patch('lib.get_file_creation_date.get_file_creation_date.classify_file', return_value="jpeg")
+    def test_routed_provider_is_asked(self, mock_classify):
+        """Test that a restricted provider is asked for its file types."""
+        with self._patch_providers():
+            result = get_file_creation_date("/path/to/photo.jpg", registry=self.registry)
+
+        self.assertEqual(result, self.result)
+        mock_classify.assert_called_once_with("/path/to/photo.jpg", b"")
+
+    @patch('lib.get_file_creation_date.get_file_creation_date.classify_file', return_value="zip")
+    def test_unrouted_provider_is_skipped(self, mock_classify):
+        """Test that a restricted provider is not asked for other file types."""
+        with self._patch_providers():
+            result = get_file_creation_date("/path/to/report.docx", registry=self.registry)
+
+        self.assertIsNone(result)
+        self.name_provider.get_file_creation_date.assert_called_once()
+        self.jpeg_provider.supports_file.assert_not_called()
+        self.jpeg_provider.get_file_creation_date.assert_not_called()
+
+    @patch('lib.get_file_creation_date.get_file_creation_date.classify_file')
+    def test_no_classification_when_chain_stops_early(self, mock_classify):
+        """Test that a file is not classified if no restricted provider is reached."""
+        self.name_provider.get_file_creation_date.return_value = self.result
+
+        with self._patch_providers():
+            get_file_creation_date(
+                "/path/to/photo.jpg", strategy=STRATEGY_PRIORITY_FIRST, registry=self.registry
+            )
+
+        mock_classify.assert_not_called()
+
+    @patch('lib.get_file_creation_date.get_file_creation_date.classify_file')
+    def test_classification_is_reported_as_restricted_provider(self, mock_classify):
+        """Test that reading the header for the file type is charged to the provider needing it."""
+        steps = []
+        mock_classify.side_effect = lambda *args: steps.append("classify") or "jpeg"
+
+        with self._patch_providers():
+            get_file_creation_date(
+                "/path/to/photo.jpg",
+                registry=self.registry,
+                on_provider=lambda provider: steps.append(str(provider)),
+            )
+
+        self.assertEqual(steps, ["NameProvider", "JpegProvider", "classify"])
+
+    def test_hachoir_is_fallback_for_exif(self):
+        """Test that Hachoir is not asked once the native EXIF reader found a date."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "photo.jpg")
+            with open(file_path, "wb") as f:
+                f.write(_jpeg(_tiff({}, {TAG_DATE_TIME_ORIGINAL: b"2023:12:25 10:30:00"})))
+
+            with patch.object(HachoirFileCreationDateProvider, "get_file_creation_date") as mock_hachoir:
+                result = get_file_creation_date(file_path)
+
+        self.assertEqual(result.provider, "ExifFileCreationDateProvider")
+        self.assertEqual(result.creation_date, datetime(2023, 12, 25, 10, 30))
+        mock_hachoir.assert_not_called()
+
+    def test_default_registry_skips_hachoir_for_documents(self):
+        """Test that Hachoir is not routed to plain text or office open XML files."""
+        hachoir = "HachoirFileCreationDateProvider"
+
+        self.assertIn(hachoir, DEFAULT_REGISTRY.provider_names)
+        self.assertIn("jpeg", DEFAULT_REGISTRY.file_types_for(hachoir))
+        self.assertNotIn("zip", DEFAULT_REGISTRY.file_types_for(hachoir))
+        self.assertNotIn("unknown", DEFAULT_REGISTRY.file_types_for(hachoir))
+        self.assertIsNone(DEFAULT_REGISTRY.file_types_for("FilenameFileCreationDateProvider"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock
+
+from lib.get_file_creation_date.provider_registry import ProviderRegistry
+
+
+def _provider(name, file_types, fallback_for=None):
+    provider = Mock()
+    provider.__str__ = Mock(return_value=name)
+    provider.FILE_TYPES = file_types
+    provider.FALLBACK_FOR = fallback_for
+    return provider
+
+
+class TestProviderRegistry(unittest.TestCase):
+    def setUp(self):
+        """Set up a registry with an unrestricted and a restricted provider."""
+        self.everything = _provider("Everything", None)
+        self.images = _provider("Images", frozenset(["jpeg", "png"]))
+        self.registry = ProviderRegistry([self.everything, self.images])
+
+    def test_defaults_come_from_providers(self):
+        """Test that the routing table is initialized from FILE_TYPES."""
+        self.assertEqual(self.registry.provider_names, ["Everything", "Images"])
+        self.assertIsNone(self.registry.file_types_for("Everything"))
+        self.assertEqual(self.registry.file_types_for("Images"), {"jpeg", "png"})
+
+    def test_handles(self):
+        """Test that restricted providers are only routed to their file types."""
+        self.assertTrue(self.registry.handles(self.everything, "zip"))
+        self.assertTrue(self.registry.handles(self.images, "jpeg"))
+        self.assertFalse(self.registry.handles(self.images, "zip"))
+
+    def test_unregistered_providers_handle_everything(self):
+        """Test that providers missing from the table are not restricted."""
+        other = _provider("Other", frozenset(["pdf"]))
+
+        self.assertFalse(self.registry.is_restricted(other))
+        self.assertTrue(self.registry.handles(other, "zip"))
+
+    def test_providers_for(self):
+        """Test that providers are filtered by file type in their original order."""
+        providers = [self.images, self.everything]
+
+        self.assertEqual(self.registry.providers_for("png", providers), providers)
+        self.assertEqual(
+            self.registry.providers_for("zip", providers), [self.everything]
+        )
+
+    def test_override(self):
+        """Test that routes can be overridden without touching the original registry."""
+        registry = self.registry.copy()
+        registry.register("Images", None)
+        registry.register("Everything", ["pdf"])
+
+        self.assertTrue(registry.handles(self.images, "zip"))
+        self.assertFalse(registry.handles(self.everything, "zip"))
+        self.assertFalse(self.registry.handles(self.images, "zip"))
+        self.assertNotEqual(registry.fingerprint(), self.registry.fingerprint())
+
+    def test_unknown_file_type(self):
+        """Test that unknown file types are rejected."""
+        with self.assertRaises(ValueError):
+            self.registry.register("Images", ["jpeg", "docx"])
+
+    def test_fallback_is_superseded_by_its_primary(self):
+        """Test that a fallback provider is skipped once its primary found a date."""
+        fallback = _provider("Fallback", None, frozenset(["Images"]))
+        registry = ProviderRegistry([self.everything, self.images, fallback])
+
+        self.assertFalse(registry.is_superseded(fallback, set()))
+        self.assertFalse(registry.is_superseded(fallback, {"Everything"}))
+        self.assertTrue(registry.is_superseded(fallback, {"Everything", "Images"}))
+        self.assertFalse(registry.is_superseded(self.images, {"Images"}))
+
+    def test_fallbacks_survive_route_overrides(self):
+        """Test that overriding routes keeps the fallback relations."""
+        fallback = _provider("Fallback", None, frozenset(["Images"]))
+        registry = ProviderRegistry([self.images, fallback]).copy()
+        registry.register("Fallback", ["zip"])
+
+        self.assertTrue(registry.is_superseded(fallback, {"Images"}))
+
+    def test_fingerprint_is_stable(self):
+        """Test that equal routing tables have equal fingerprints."""
+        self.assertEqual(
+            self.registry.fingerprint(), self.registry.copy().fingerprint()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
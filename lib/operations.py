@@ -1,14 +1,110 @@
 import hashlib
 import logging
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import NamedTuple
 from tqdm import tqdm
 import glob
 
-from lib.dateparser.dateparser import parse_date
-from lib.get_file_creation_date.get_file_creation_date import get_file_creation_date
+from lib.dateparser.dateparser import parse_date_cache_info
+from lib.get_file_creation_date.cache import CreationDateCache
+from lib.get_file_creation_date.file_context import FileContext
+from lib.get_file_creation_date.get_file_creation_date import (
+    DEFAULT_REGISTRY,
+    STRATEGY_OLDEST,
+    get_file_creation_date,
+)
+from lib.pipeline import BackgroundIterator, ordered_map
+from lib.scan_filter import ScanFilter
 from lib.scantree import scantree
 from lib.setup_logging import setup_logging
+from lib.watchdog import Watchdog, WatchdogCrash, WatchdogTimeout
+
+# Status of files in the undated list
+STATUS_UNDATED = "undated"  # No provider found a date
+STATUS_TIMEOUT = "timeout"  # A provider exceeded its time budget
+STATUS_CRASHED = "crashed"  # The watchdog's child process died
+
+# Columns of the copy list. Lists written before the stat columns were added
+# only have the first five, lists written before hard links were detected the
+# first nine.
+COPY_LIST_HEADER = "source;date;provider;provider_info;destination;size;mtime_ns;device;inode;hardlink_of"
+
+# How copy_files treats files that are hard links of a file copied before
+HARDLINKS_LINK = "link"  # Link the destination to the copied file
+HARDLINKS_SKIP = "skip"  # Do not copy the file at all
+HARDLINKS_COPY = "copy"  # Copy the file like any other
+HARDLINKS = [HARDLINKS_LINK, HARDLINKS_SKIP, HARDLINKS_COPY]
+
+# Size of the chunks files are copied and hashed in
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class FileStat(NamedTuple):
+    """
+    Stat data of a source file, captured once while scanning.
+
+    The fields are named like those of os.stat_result, so it can be used in its
+    place, e.g. for a FileContext or the persistent cache.
+    """
+
+    st_size: int
+    st_mtime_ns: int
+    st_dev: int
+    st_ino: int
+
+
+def _scan_files(source, **scan_options):
+    """
+    Yields (path, FileStat, first link) for every file below source.
+
+    Files with several hard links are identified by device and inode. For them,
+    the first link is the path the inode was first seen at in scan order, which
+    is the file's own path for that first occurrence. It is None for files with
+    a single link and files that cannot be stat'ed, whose FileStat is None.
+    """
+    first_links = {}
+    for entry in scantree(source, **scan_options):
+        if not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            yield entry.path, None, None
+            continue
+
+        first_link = None
+        # Windows reports no inode for directory entries
+        if stat.st_nlink > 1 and stat.st_ino:
+            first_link = first_links.setdefault((stat.st_dev, stat.st_ino), entry.path)
+        file_stat = FileStat(stat.st_size, stat.st_mtime_ns, stat.st_dev, stat.st_ino)
+        yield entry.path, file_stat, first_link
+
+
+def _parse_copy_list_line(line):
+    """
+    Splits a line of a copy list into source, date, provider, provider info,
+    destination, the source's FileStat (None for lists without stat columns) and
+    the source of the copy list's file the source is a hard link of (or None).
+    """
+    fields = line.split(";")
+    source, date, provider, provider_info, destination = fields[:5]
+    file_stat = None
+    if len(fields) >= 9 and fields[5]:
+        file_stat = FileStat(*map(int, fields[5:9]))
+    hardlink_of = fields[9] if len(fields) >= 10 and fields[9] else None
+    return source, date, provider, provider_info, destination, file_stat, hardlink_of
+
+
+def _format_file_stat(file_stat):
+    if file_stat is None:
+        return ";;;"
+    return ";".join(map(str, file_stat))
 
 
 def _read_existing_entries(copy_list_filename, logger):
@@ -19,16 +115,57 @@ def _read_existing_entries(copy_list_filename, logger):
             for i, line in enumerate(f.readlines()):
                 line = line.strip()
                 if i > 1 and not line.startswith("#"):
-                    source_file_path, date, provider, provider_info, _ = line.split(";")
+                    source_file_path, date, provider, provider_info, _, file_stat, _ = (
+                        _parse_copy_list_line(line)
+                    )
+                    try:
+                        # Written by str(datetime), so no need for the date parser
+                        creation_date = datetime.fromisoformat(date)
+                    except ValueError:
+                        logger.warning(f"Invalid date in existing list: {line}")
+                        continue
                     existing_creation_dates[source_file_path] = (
-                        parse_date(date),
+                        creation_date,
                         provider,
                         provider_info,
+                        file_stat,
                     )
     logger.info(f"Found {len(existing_creation_dates)} existing entries")
     return existing_creation_dates
 
 
+def _read_undated_entries(undated_list_filename, logger):
+    logger.info(f"Reading undated list {undated_list_filename}")
+    undated_entries = {}
+    if Path(undated_list_filename).exists():
+        with open(undated_list_filename, "rt", encoding="utf-8") as f:
+            for i, line in enumerate(f.readlines()):
+                line = line.strip()
+                if i > 1 and not line.startswith("#"):
+                    status = line.rsplit(";", 1)[-1]
+                    if status in (STATUS_UNDATED, STATUS_TIMEOUT, STATUS_CRASHED):
+                        source_file_path, size, mtime_ns, _ = line.rsplit(";", 3)
+                    else:
+                        # Written before the status column was added
+                        source_file_path, size, mtime_ns = line.rsplit(";", 2)
+                        status = STATUS_UNDATED
+                    undated_entries[source_file_path] = (
+                        int(size),
+                        int(mtime_ns),
+                        status,
+                    )
+    logger.info(f"Found {len(undated_entries)} undated entries")
+    return undated_entries
+
+
+def _get_device(path):
+    """Returns the device a path is stored on, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
 def _get_destination_path(path, create_datetime, destination):
     year = create_datetime.strftime("%Y")
     month = create_datetime.strftime("%m")
@@ -40,56 +177,405 @@ def _get_destination_path(path, create_datetime, destination):
 #
 
 
-def generate_copy_list(source_dirs: list[str], destination_dir: str):
+# Open caches, one per process, thread and cache directory
+_caches = {}
+
+
+def _open_cache(cache_dir):
+    # Keyed by pid and thread as well, so forked workers and sources processed
+    # at the same time never share a connection
+    key = (os.getpid(), threading.get_ident(), cache_dir)
+    if key not in _caches:
+        _caches[key] = CreationDateCache(cache_dir)
+    return _caches[key]
+
+
+def _build_registry(routes):
+    """Applies per-run routing overrides ({provider name: file types or None})."""
+    registry = DEFAULT_REGISTRY.copy()
+    for provider_name, file_types in (routes or {}).items():
+        registry.register(provider_name, file_types)
+    return registry
+
+
+# Watchdogs enforcing provider timeouts, one per process and thread
+_watchdogs = {}
+
+
+def _open_watchdog(timeouts):
+    key = (os.getpid(), threading.get_ident(), tuple(timeouts.items()))
+    if key not in _watchdogs:
+        _watchdogs[key] = Watchdog(timeouts)
+    return _watchdogs[key]
+
+
+def _close_watchdogs():
+    owner = (os.getpid(), threading.get_ident())
+    for key in [key for key in _watchdogs if key[:2] == owner]:
+        _watchdogs.pop(key).close()
+
+
+def _find_creation_date(report, file_path, file_stat, strategy, cache_dir, registry):
     """
-    Scans source directories, extracts creation dates, and generates a copy list for each source.
+    Finds the creation date with the stat data from the scan, so neither the cache
+    nor the providers stat the file again.
+
+    In the watchdog's child process, report is called with every provider as a
+    step, otherwise it is None.
+
+    Returns the result and the (hits, misses) of the date parser's shape cache
+    while finding it, counted in the process that parsed the dates.
+    """
+    cache = _open_cache(cache_dir) if cache_dir else None
+    before = parse_date_cache_info()
+    with FileContext(file_path, stat=file_stat) as context:
+        result = get_file_creation_date(
+            file_path,
+            strategy=strategy,
+            cache=cache,
+            registry=registry,
+            context=context,
+            on_provider=(lambda provider: report(str(provider))) if report else None,
+        )
+    after = parse_date_cache_info()
+    return result, (after.hits - before.hits, after.misses - before.misses)
+
+
+def _find_creation_date_with_timeouts(
+    file_path, file_stat, strategy, cache_dir, registry, timeouts
+):
+    """
+    Finds the creation date under the watchdog, giving every provider a budget.
+
+    A provider exceeding its budget is left out and the file is analyzed again
+    by the remaining providers. If the child process dies, the file is given up.
+    Returns the result, the status of a file without one (STATUS_CRASHED,
+    STATUS_TIMEOUT if anything timed out, otherwise STATUS_UNDATED) and the
+    shape cache counts of the call that completed.
     """
     logger = logging.getLogger(__name__)
+    watchdog = _open_watchdog(timeouts)
+    status = STATUS_UNDATED
+    while True:
+        try:
+            result, shape_cache = watchdog.call(
+                _find_creation_date,
+                file_path,
+                file_stat,
+                strategy,
+                cache_dir,
+                registry,
+            )
+            return result, status, shape_cache
+        except WatchdogCrash as e:
+            # The next call starts a fresh child
+            logger.error(f"{e} for {file_path}")
+            return None, STATUS_CRASHED, (0, 0)
+        except WatchdogTimeout as e:
+            logger.warning(f"{e} for {file_path}")
+            status = STATUS_TIMEOUT
+            if e.step is None:
+                return None, status, (0, 0)
+            registry = (registry or DEFAULT_REGISTRY).copy()
+            registry.register(e.step, [])
+
+
+def _analyze_file(
+    task, strategy=STRATEGY_OLDEST, cache_dir=None, registry=None, timeouts=None
+):
+    """
+    Resolves the creation date of a single file unless it is already known.
+
+    Entries of the existing copy list are reused and files that had no date in a
+    previous run are skipped, as long as their size and modification time are
+    unchanged. Returns the file path, the first link of a hard linked file, the
+    entry for the copy list (or None), for files without a date their
+    (size, mtime_ns, status), and the (hits, misses) of the date parser's shape
+    cache while analyzing the file.
+
+    Hard links of a file analyzed before are not analyzed at all; their entry is
+    taken from the first link by the caller.
+
+    The task carries the FileStat captured by the scan, which is used for these
+    checks, the persistent cache and the copy list instead of stat'ing the file
+    again.
 
-    for source in source_dirs:
-        list_id = hashlib.sha256(bytes(source, "utf-8")).hexdigest()[:8]
-        copy_list_filename = f"copy-list-{list_id}.csv"
+    With timeouts ({provider name or None for all: seconds}), providers run under
+    a watchdog that kills them once they exceed their budget.
 
-        setup_logging(f"create_copy_list_{list_id}", stdout_level=logging.FATAL)
-        logger.info(f"Processing source: {source}")
+    Runs inside the worker processes when analysis is parallelized, so it only
+    takes and returns plain, picklable values.
+    """
+    file_path, file_stat, first_link, existing_entry, known_undated = task
+    if first_link not in (None, file_path):
+        return file_path, first_link, None, None, (0, 0)
+
+    stat_key = file_stat[:2] if file_stat else None
+    if existing_entry:
+        known_stat = existing_entry[3]
+        # Lists without stat columns cannot tell changed files apart
+        if known_stat is None or known_stat[:2] == stat_key:
+            entry = (*existing_entry[:3], file_stat)
+            return file_path, first_link, entry, None, (0, 0)
+
+    if known_undated and stat_key == known_undated[:2]:
+        return file_path, first_link, None, known_undated, (0, 0)
+
+    status = STATUS_UNDATED
+    if timeouts:
+        result, status, shape_cache = _find_creation_date_with_timeouts(
+            file_path, file_stat, strategy, cache_dir, registry, timeouts
+        )
+    else:
+        result, shape_cache = _find_creation_date(
+            None, file_path, file_stat, strategy, cache_dir, registry
+        )
+    if result:
+        entry = (result.creation_date, result.provider, result.provider_info)
+        return file_path, first_link, (*entry, file_stat), None, shape_cache
+
+    if stat_key is None:
+        return file_path, first_link, None, None, shape_cache
+    return file_path, first_link, None, (*stat_key, status), shape_cache
+
+
+class _OverallProgress:
+    """Sums up the progress of sources processed at the same time."""
+
+    def __init__(self, bar):
+        self.bar = bar
+        self._produced = {}
+        self._lock = threading.Lock()
+
+    def update(self, source, produced):
+        """Counts a processed file of a source whose scan found produced files so far."""
+        with self._lock:
+            self._produced[source] = produced
+            self.bar.total = sum(self._produced.values())
+            self.bar.update()
+
+
+def generate_copy_list(
+    source_dirs: list[str],
+    destination_dir: str,
+    workers: int = 1,
+    strategy: str = STRATEGY_OLDEST,
+    cache_dir: str = None,
+    retry_undated: bool = False,
+    routes: dict = None,
+    timeouts: dict = None,
+    scan_threads: int = 1,
+    max_depth: int = None,
+    one_file_system: bool = False,
+    scan_filter: ScanFilter = None,
+    source_jobs: int = 1,
+    jobs_per_device: int = 1,
+):
+    """
+    Scans source directories, extracts creation dates, and generates a copy list for each source.
 
-        existing_creation_dates = _read_existing_entries(copy_list_filename, logger)
+    Scanning runs in a background thread and feeds the analysis through a bounded
+    queue, so results are written while the source is still being scanned.
+    With more than one worker, date extraction is spread over a pool of processes.
+    The copy list keeps the scan order either way. The strategy decides which
+    providers are asked and which of their dates is used. With a cache directory,
+    results are reused across runs for files that have not changed.
 
-        logger.info("Scanning source directory: %s", source)
-        files = [entry.path for entry in scantree(source) if entry.is_file()]
+    Files without a date are recorded in a separate undated list and are not
+    analyzed again on the next run unless they changed or retry_undated is set.
 
-        logger.info("Start processing %d files", len(files))
-        with open(copy_list_filename, "wt", encoding="utf-8") as f:
-            f.write(f"# COPY LIST {source} -> {destination_dir}\n")
-            f.write(f"source;date;provider;provider_info;destination\n")
+    Routes override which file types a provider is asked for, mapping provider
+    names to a list of file types or None for all files.
 
-            for file_path in tqdm(files, desc=f"Analyzing {Path(source).name}"):
-                logger.info(f"Processing {file_path}")
-                if file_path in existing_creation_dates:
-                    creation_date, provider, provider_info = existing_creation_dates[
-                        file_path
-                    ]
-                else:
-                    result = get_file_creation_date(file_path)
-                    if result:
-                        creation_date, provider, provider_info = (
-                            result.creation_date,
-                            result.provider,
-                            result.provider_info,
-                        )
-                    else:
-                        logger.error(f"Could not find creation date for {file_path}!")
-                        continue
+    Timeouts map provider names, or None for all providers, to a budget in
+    seconds. A provider exceeding it is killed and the file is analyzed by the
+    remaining providers; files left without a date are marked as timed out.
 
-                destination_path = _get_destination_path(
-                    file_path, creation_date, destination_dir
-                )
-                f.write(
-                    f"{file_path};{creation_date};{provider or ''};{provider_info or ''};{destination_path}\n"
-                )
+    With more than one scan thread, directories are listed concurrently, which
+    speeds up scanning file systems with a high latency such as network shares.
+    max_depth limits how many directory levels below a source are scanned, and
+    one_file_system skips directories on other devices than the source. A scan
+    filter leaves out files and whole directories, e.g. thumbnail caches.
+
+    With more than one source job, several sources are processed at the same
+    time, each with its own workers, while at most jobs_per_device of them read
+    from the same device. An overall progress bar sums up all sources.
+    """
+    logger = logging.getLogger(__name__)
+    options = dict(
+        workers=workers,
+        strategy=strategy,
+        cache_dir=cache_dir,
+        retry_undated=retry_undated,
+        registry=_build_registry(routes) if routes else None,
+        timeouts=timeouts,
+        scan_threads=scan_threads,
+        max_depth=max_depth,
+        one_file_system=one_file_system,
+        scan_filter=scan_filter,
+    )
+    if source_jobs <= 1 or len(source_dirs) <= 1:
+        for source in source_dirs:
+            _generate_source_copy_list(source, destination_dir, **options)
+        return
+
+    # Sources on the same disk would only compete for its bandwidth
+    devices = {source: _get_device(source) for source in source_dirs}
+    semaphores = {
+        device: threading.Semaphore(jobs_per_device) for device in devices.values()
+    }
+
+    def generate(source, position):
+        with semaphores[devices[source]]:
+            _generate_source_copy_list(
+                source,
+                destination_dir,
+                **options,
+                overall=overall,
+                position=position,
+            )
+
+    logger.info("Processing %d sources with %d jobs", len(source_dirs), source_jobs)
+    with tqdm(desc="Analyzing all sources", unit=" files") as bar, ThreadPoolExecutor(
+        max_workers=source_jobs
+    ) as executor:
+        overall = _OverallProgress(bar)
+        futures = [
+            executor.submit(generate, source, position)
+            for position, source in enumerate(source_dirs, 1)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _generate_source_copy_list(
+    source,
+    destination_dir,
+    workers,
+    strategy,
+    cache_dir,
+    retry_undated,
+    registry,
+    timeouts,
+    scan_threads,
+    max_depth,
+    one_file_system,
+    scan_filter,
+    overall=None,
+    position=None,
+):
+    """
+    Generates the copy list and the undated list of a single source.
+
+    position places its progress bar below the overall progress, which is
+    updated as well, when several sources are processed at the same time.
+    """
+    logger = logging.getLogger(__name__)
+
+    list_id = hashlib.sha256(bytes(source, "utf-8")).hexdigest()[:8]
+    copy_list_filename = f"copy-list-{list_id}.csv"
+    undated_list_filename = f"undated-{list_id}.csv"
 
-            f.write(f"# END OF FILE\n")
-        logger.info(f"Generated copy list: {copy_list_filename}")
+    setup_logging(f"create_copy_list_{list_id}", stdout_level=logging.FATAL)
+    logger.info(f"Processing source: {source}")
+
+    existing_creation_dates = _read_existing_entries(copy_list_filename, logger)
+    undated_entries = (
+        {} if retry_undated else _read_undated_entries(undated_list_filename, logger)
+    )
+
+    logger.info("Scanning and processing %s with %d worker(s)", source, workers)
+    logger.info("Provider routing: %r", registry or DEFAULT_REGISTRY)
+    files = BackgroundIterator(
+        _scan_files(
+            source,
+            threads=scan_threads,
+            max_depth=max_depth,
+            one_file_system=one_file_system,
+            scan_filter=scan_filter,
+        )
+    )
+    tasks = (
+        (
+            file_path,
+            file_stat,
+            first_link,
+            existing_creation_dates.get(file_path),
+            undated_entries.get(file_path),
+        )
+        for file_path, file_stat, first_link in files
+    )
+    # Results of files with several hard links, taken over by their other links
+    first_link_results = {}
+    # Shape cache hits and misses of the analysis, summed over all workers
+    shape_hits = shape_misses = 0
+    with open(copy_list_filename, "wt", encoding="utf-8") as f, open(
+        undated_list_filename, "wt", encoding="utf-8"
+    ) as undated_f, tqdm(
+        desc=f"Analyzing {Path(source).name}", unit=" files", position=position
+    ) as progress:
+        f.write(f"# COPY LIST {source} -> {destination_dir}\n")
+        f.write(f"{COPY_LIST_HEADER}\n")
+        undated_f.write(f"# UNDATED FILES {source}\n")
+        undated_f.write(f"source;size;mtime_ns;status\n")
+
+        for file_path, first_link, entry, undated, shape_cache in ordered_map(
+            partial(
+                _analyze_file,
+                strategy=strategy,
+                cache_dir=cache_dir,
+                registry=registry,
+                timeouts=timeouts,
+            ),
+            tasks,
+            workers=workers,
+        ):
+            # The total grows while the scan is still running
+            progress.total = files.produced
+            progress.update()
+            if overall:
+                overall.update(source, files.produced)
+            shape_hits += shape_cache[0]
+            shape_misses += shape_cache[1]
+
+            logger.info(f"Processing {file_path}")
+            hardlink_of = None
+            if first_link == file_path:
+                first_link_results[file_path] = (entry, undated)
+            elif first_link is not None:
+                # The first link comes earlier in scan order and shares the
+                # inode, so its result including the stat data applies as well
+                logger.info(f"{file_path} is a hard link of {first_link}")
+                hardlink_of = first_link
+                entry, undated = first_link_results[first_link]
+            if not entry:
+                if undated and undated == undated_entries.get(file_path):
+                    logger.info(f"Skipping unchanged undated file {file_path}")
+                elif undated and undated[2] == STATUS_TIMEOUT:
+                    logger.error(f"Timed out finding creation date for {file_path}!")
+                elif undated and undated[2] == STATUS_CRASHED:
+                    logger.error(f"Crashed finding creation date for {file_path}!")
+                else:
+                    logger.error(f"Could not find creation date for {file_path}!")
+                if undated:
+                    size, mtime_ns, status = undated
+                    undated_f.write(f"{file_path};{size};{mtime_ns};{status}\n")
+                continue
+
+            creation_date, provider, provider_info, file_stat = entry
+            destination_path = _get_destination_path(
+                file_path, creation_date, destination_dir
+            )
+            f.write(
+                f"{file_path};{creation_date};{provider or ''};{provider_info or ''};{destination_path};{_format_file_stat(file_stat)};{hardlink_of or ''}\n"
+            )
+
+        f.write(f"# END OF FILE\n")
+        undated_f.write(f"# END OF FILE\n")
+    _close_watchdogs()
+    logger.info(f"Processed {files.produced} files")
+    logger.info(f"Date parser shape cache: {shape_hits} hits, {shape_misses} misses")
+    logger.info(f"Generated copy list: {copy_list_filename}")
 
 
 def _get_hash(file_path: str) -> str:
@@ -97,12 +583,103 @@ def _get_hash(file_path: str) -> str:
         return hashlib.file_digest(f, "blake2b").hexdigest()
 
 
+def _copy_with_hash(source: str, destination) -> tuple[int, int, int, int, str]:
+    """
+    Copies a file with its metadata like shutil.copy2, hashing the data while it
+    is written, so the source is read only once.
+
+    Returns the source's size and modification time before it was read, the
+    number of bytes copied, the destination's modification time and the BLAKE2b
+    hash of the data, which matches _get_hash of either file.
+    """
+    digest = hashlib.blake2b()
+    size = 0
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(source, "rb", buffering=0) as src, open(destination, "wb") as dst:
+        source_stat = os.fstat(src.fileno())
+        while length := src.readinto(buffer):
+            digest.update(view[:length])
+            dst.write(view[:length])
+            size += length
+    shutil.copystat(source, destination)
+    # Read back, as file systems store modification times at different precisions
+    return (
+        source_stat.st_size,
+        source_stat.st_mtime_ns,
+        size,
+        os.stat(destination).st_mtime_ns,
+        digest.hexdigest(),
+    )
+
+
+def _get_manifest_path(copy_list_path: str) -> str:
+    """Returns the path of the manifest next to a copy list."""
+    path = Path(copy_list_path)
+    return str(path.with_name(f"{path.stem}.manifest.csv"))
+
+
+def _read_manifest(manifest_path, logger):
+    """
+    Returns {destination: (source, source_size, source_mtime_ns, size, mtime_ns,
+    hash)} of a manifest, the latest row of a destination winning. The header
+    and rows that cannot be parsed, e.g. cut short by an interrupted run, are
+    skipped.
+    """
+    manifest = {}
+    if os.path.exists(manifest_path):
+        logger.info(f"Reading manifest {manifest_path}")
+        with open(manifest_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    (
+                        source,
+                        source_size,
+                        source_mtime_ns,
+                        destination,
+                        size,
+                        mtime_ns,
+                        file_hash,
+                    ) = line.rsplit(";", 6)
+                    manifest[destination] = (
+                        source,
+                        int(source_size),
+                        int(source_mtime_ns),
+                        int(size),
+                        int(mtime_ns),
+                        file_hash,
+                    )
+                except ValueError:
+                    logger.debug(f"Skipping manifest line: {line}")
+        logger.info(f"Found {len(manifest)} manifest entries")
+    return manifest
+
+
 #
 # Step 2: Copy
 #
-def copy_files(copy_list_path: str):
+def copy_files(copy_list_path: str, hardlinks: str = HARDLINKS_LINK):
     """
     Reads a copy list and executes the file copy operations.
+
+    A source is only compared to existing destinations of the same size, so it
+    is hashed only if such a destination exists, and at most once. The source
+    size is taken from the copy list if it has it.
+
+    Files recorded as hard links of another file in the list are handled
+    according to hardlinks, one of HARDLINKS: linked to the destination that file
+    was copied to, skipped, or copied like any other file. Links that cannot be
+    created, e.g. across drives, fall back to copying.
+
+    Files are hashed while they are copied. Every destination known to hold its
+    source is recorded in a manifest next to the copy list, with the size and
+    modification time of both files and the hash. Later runs take destination
+    hashes from it instead of reading the destination again while its size and
+    modification time are unchanged, and hash neither file if the source is
+    unchanged as well.
     """
     setup_logging(f"copy_files")
     logger = logging.getLogger(__name__)
@@ -113,36 +690,140 @@ def copy_files(copy_list_path: str):
         for i, line in enumerate(f):
             line = line.strip()
             if i > 1 and not line.startswith("#"):
-                source, date, provider, provider_info, destination = line.split(";")
-                entries.append((source, destination))
+                source, _, _, _, destination, file_stat, hardlink_of = (
+                    _parse_copy_list_line(line)
+                )
+                entries.append((source, destination, file_stat, hardlink_of))
+
+    manifest_path = _get_manifest_path(copy_list_path)
+    manifest = _read_manifest(manifest_path, logger)
+    has_header = os.path.exists(manifest_path) and os.path.getsize(manifest_path)
+    manifest_f = open(manifest_path, "at", encoding="utf-8")
+    if not has_header:
+        manifest_f.write(f"# MANIFEST {copy_list_path}\n")
+        manifest_f.write(
+            "source;source_size;source_mtime_ns;destination;size;mtime_ns;hash\n"
+        )
+
+    def record(destination, entry):
+        if manifest.get(str(destination)) != entry:
+            manifest[str(destination)] = entry
+            source, source_size, source_mtime_ns, size, mtime_ns, file_hash = entry
+            manifest_f.write(
+                f"{source};{source_size};{source_mtime_ns};"
+                f"{destination};{size};{mtime_ns};{file_hash}\n"
+            )
+
+    def get_destination_hash(destination, stat):
+        known = manifest.get(str(destination))
+        if known and known[3:5] == (stat.st_size, stat.st_mtime_ns):
+            return known[5]
+        return _get_hash(destination)
 
     logger.info(f"Copying {len(entries)} files")
     created_dirs = set()
-    for source, destination in tqdm(entries, desc="Copying files"):
-        original_destination_path = Path(destination)
-        current_destination_path = original_destination_path
-
-        dest_dir = current_destination_path.parent
-        if dest_dir not in created_dirs:
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            created_dirs.add(dest_dir)
-
-        source_hash = _get_hash(source)
-        i = 1
-        while current_destination_path.is_file():
-            destination_hash = _get_hash(current_destination_path)
-            if source_hash != destination_hash:
-                current_destination_path = original_destination_path.parent / (
-                    original_destination_path.stem
-                    + f"_dup_{i}"
-                    + original_destination_path.suffix
-                )
-                i += 1
+    # Destinations of the files other entries are hard links of
+    link_targets = {hardlink_of for *_, hardlink_of in entries if hardlink_of}
+    linked_destinations = {}
+    with manifest_f:
+        for source, destination, file_stat, hardlink_of in tqdm(
+            entries, desc="Copying files"
+        ):
+            if hardlink_of and hardlinks == HARDLINKS_SKIP:
+                logger.debug(f"Skipping hard link {source} of {hardlink_of}")
+                continue
+
+            original_destination_path = Path(destination)
+            current_destination_path = original_destination_path
+
+            dest_dir = current_destination_path.parent
+            if dest_dir not in created_dirs:
+                dest_dir.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(dest_dir)
+
+            if (
+                hardlinks == HARDLINKS_LINK
+                and hardlink_of in linked_destinations
+                and not current_destination_path.exists()
+            ):
+                target = linked_destinations[hardlink_of]
+                try:
+                    os.link(target, current_destination_path)
+                    logger.debug(f"Linked {destination} to {target}")
+                    if str(target) in manifest:
+                        # Hard links of one another share the source stat
+                        record(
+                            current_destination_path,
+                            (source, *manifest[str(target)][1:]),
+                        )
+                    continue
+                except OSError as e:
+                    logger.warning(f"Could not link {destination} to {target}: {e}")
+
+            source_size = file_stat.st_size if file_stat is not None else None
+            source_stat = None
+            source_hash = None
+            i = 1
+            while current_destination_path.is_file():
+                destination_stat = current_destination_path.stat()
+                known = manifest.get(str(current_destination_path))
+                if (
+                    known
+                    and known[0] == source
+                    and known[3:5]
+                    == (
+                        destination_stat.st_size,
+                        destination_stat.st_mtime_ns,
+                    )
+                ):
+                    # Neither file changed since the destination was recorded
+                    if source_stat is None:
+                        source_stat = Path(source).stat()
+                    if known[1:3] == (source_stat.st_size, source_stat.st_mtime_ns):
+                        logger.debug(f"Skipping recorded file: {source}")
+                        break
+                if source_size is None:
+                    source_stat = source_stat or Path(source).stat()
+                    source_size = source_stat.st_size
+                identical = destination_stat.st_size == source_size
+                if identical:
+                    # Hashed once at most, and only if a candidate of its size exists
+                    if source_hash is None:
+                        # Stat'ed first, so a change while hashing shows next time
+                        source_stat = source_stat or Path(source).stat()
+                        source_hash = _get_hash(source)
+                    identical = source_hash == get_destination_hash(
+                        current_destination_path, destination_stat
+                    )
+                if not identical:
+                    current_destination_path = original_destination_path.parent / (
+                        original_destination_path.stem
+                        + f"_dup_{i}"
+                        + original_destination_path.suffix
+                    )
+                    i += 1
+                else:
+                    logger.debug(f"Skipping identical file: {source}")
+                    record(
+                        current_destination_path,
+                        (
+                            source,
+                            source_stat.st_size,
+                            source_stat.st_mtime_ns,
+                            destination_stat.st_size,
+                            destination_stat.st_mtime_ns,
+                            source_hash,
+                        ),
+                    )
+                    break
             else:
-                logger.debug(f"Skipping identical file: {source}")
-                break
-        else:
-            shutil.copy2(source, current_destination_path)
+                record(
+                    current_destination_path,
+                    (source, *_copy_with_hash(source, current_destination_path)),
+                )
+
+            if source in link_targets:
+                linked_destinations[source] = current_destination_path
 
     logger.info("Done copying files.")
 
@@ -164,6 +845,9 @@ def _format_size(size_bytes):
 def check_files(copy_list_path: str):
     """
     Reads a copy list and checks if the files are correctly copied.
+
+    Source sizes are taken from the copy list if it has them, so the source tree
+    is not accessed at all.
     """
     setup_logging(f"check_files")
     logger = logging.getLogger(__name__)
@@ -174,8 +858,8 @@ def check_files(copy_list_path: str):
         for i, line in enumerate(f.readlines()):
             line = line.strip()
             if i > 1 and not line.startswith("#"):
-                source, _, _, _, destination = line.split(";")
-                entries.append((source, destination))
+                source, _, _, _, destination, file_stat, _ = _parse_copy_list_line(line)
+                entries.append((source, destination, file_stat))
 
     logger.info(f"Checking {len(entries)} files")
 
@@ -188,15 +872,17 @@ def check_files(copy_list_path: str):
     total_duplicate_files = 0
     mismatched_files = []
 
-    for source, destination in tqdm(entries, desc="Checking files"):
+    for source, destination, file_stat in tqdm(entries, desc="Checking files"):
         source_path = Path(source)
         destination_path = Path(destination)
 
-        if not source_path.exists():
+        if file_stat is not None:
+            source_size = file_stat.st_size
+        elif not source_path.exists():
             logger.warning(f"Source file not found: {source}")
             continue
-
-        source_size = source_path.stat().st_size
+        else:
+            source_size = source_path.stat().st_size
         total_source_size += source_size
 
         file_found_and_size_matches = False
@@ -0,0 +1,91 @@
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+_END = object()
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _apply_chunk(func, chunk):
+    return [func(item) for item in chunk]
+
+
+def ordered_map(func, items, workers=1, chunk_size=64):
+    """
+    Applies func to every item and yields the results in input order.
+
+    With more than one worker the items are submitted in chunks to a process pool.
+    At most two chunks per worker are in flight at any time, and chunks that finish
+    early are held back until every chunk submitted before them has been yielded.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunked(items, chunk_size):
+            pending.append(executor.submit(_apply_chunk, func, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class BackgroundIterator:
+    """
+    Consumes an iterable in a background thread and hands its items over through
+    a bounded queue.
+
+    The producer runs ahead of the consumer by at most maxsize items, so slow
+    producers (e.g. a directory scan on a network share) and slow consumers
+    overlap without the whole sequence being held in memory. The number of items
+    produced so far is available as `produced`, and `finished` tells whether the
+    producer is exhausted.
+    """
+
+    def __init__(self, iterable, maxsize=10000):
+        self.produced = 0
+        self.finished = False
+        self._queue = queue.Queue(maxsize)
+        self._stopped = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._produce, args=(iterable,), daemon=True
+        )
+        self._thread.start()
+
+    def _produce(self, iterable):
+        try:
+            for item in iterable:
+                if self._stopped.is_set():
+                    return
+                self._queue.put(item)
+                self.produced += 1
+        except BaseException as e:
+            self._error = e
+        finally:
+            self.finished = True
+            self._queue.put(_END)
+
+    def __iter__(self):
+        try:
+            while (item := self._queue.get()) is not _END:
+                yield item
+            if self._error:
+                raise self._error
+        finally:
+            # Unblock the producer if the consumer stopped early
+            self._stopped.set()
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
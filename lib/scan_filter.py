@@ -0,0 +1,132 @@
+import configparser
+import fnmatch
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+
+# Section of the config file holding the scan rules
+CONFIG_SECTION = "scan"
+CONFIG_KEYS = ("include", "exclude", "extensions", "exclude_extensions")
+
+
+def _compile(patterns) -> Tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+    """
+    Compiles glob patterns into one regex for patterns matching names and one
+    for patterns containing a slash, which match paths relative to the source.
+    """
+    name_patterns = [p for p in patterns if "/" not in p]
+    path_patterns = [p.strip("/") for p in patterns if "/" in p]
+    return tuple(
+        (
+            re.compile("|".join(map(fnmatch.translate, group)), re.IGNORECASE)
+            if group
+            else None
+        )
+        for group in (name_patterns, path_patterns)
+    )
+
+
+def _normalize_extension(extension: str) -> str:
+    return "." + extension.lower().lstrip(".")
+
+
+@dataclass
+class ScanFilter:
+    """
+    Include and exclude rules applied while scanning a source.
+
+    Excluded directories are not listed at all, so nothing below them is scanned.
+    Globs without a slash match file and directory names (e.g. @eaDir or *.tmp),
+    globs with a slash match paths relative to the source with forward slashes
+    (e.g. photos/cache). Files must match one of the include globs, if any, and
+    have one of the extensions, if any. Exclude globs and excluded extensions
+    take precedence. All rules are case-insensitive.
+    """
+
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    extensions: Sequence[str] = ()
+    exclude_extensions: Sequence[str] = ()
+    _include: tuple = field(init=False, repr=False, compare=False)
+    _exclude: tuple = field(init=False, repr=False, compare=False)
+    _extensions: frozenset = field(init=False, repr=False, compare=False)
+    _exclude_extensions: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude)
+        self._extensions = frozenset(map(_normalize_extension, self.extensions))
+        self._exclude_extensions = frozenset(
+            map(_normalize_extension, self.exclude_extensions)
+        )
+
+    def __bool__(self):
+        return bool(
+            self.include or self.exclude or self.extensions or self.exclude_extensions
+        )
+
+    @staticmethod
+    def _matches(patterns, relative_path: str, name: str) -> bool:
+        name_pattern, path_pattern = patterns
+        if name_pattern and name_pattern.match(name):
+            return True
+        if path_pattern:
+            return bool(path_pattern.match(relative_path.replace(os.sep, "/")))
+        return False
+
+    def includes_directory(self, relative_path: str, name: str) -> bool:
+        """Returns whether a directory is scanned."""
+        return not self._matches(self._exclude, relative_path, name)
+
+    def includes_file(self, relative_path: str, name: str) -> bool:
+        """Returns whether a file is part of the scan."""
+        if self._extensions or self._exclude_extensions:
+            extension = os.path.splitext(name)[1].lower()
+            if self._extensions and extension not in self._extensions:
+                return False
+            if extension in self._exclude_extensions:
+                return False
+        if self._matches(self._exclude, relative_path, name):
+            return False
+        return not any(self._include) or self._matches(
+            self._include, relative_path, name
+        )
+
+
+def read_scan_rules(config_path: str) -> dict:
+    """
+    Reads scan rules from the [scan] section of an INI file.
+
+    Every key of CONFIG_KEYS holds a list of values separated by commas or new
+    lines, e.g.
+
+        [scan]
+        exclude =
+            @eaDir
+            .git
+        extensions = jpg, heic, mp4
+
+    Raises:
+        ValueError: If the file cannot be read or holds unknown keys.
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(config_path, "rt", encoding="utf-8") as f:
+            parser.read_file(f)
+    except (OSError, configparser.Error) as e:
+        raise ValueError(f"cannot read config file {config_path}: {e}")
+
+    if not parser.has_section(CONFIG_SECTION):
+        return {}
+    rules = {}
+    for key, value in parser.items(CONFIG_SECTION):
+        if key not in CONFIG_KEYS:
+            raise ValueError(
+                f"unknown key '{key}' in {config_path}, "
+                f"choose from {', '.join(CONFIG_KEYS)}"
+            )
+        rules[key] = [
+            item.strip() for item in re.split(r"[,\n]", value) if item.strip()
+        ]
+    return rules
@@ -1,11 +1,132 @@
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 
-def scantree(path):
-    if Path(path).is_dir():
-        for entry in os.scandir(path):
+def scantree(path, threads=1, max_depth=None, one_file_system=False, scan_filter=None):
+    """
+    Yields the entries of all files below path, depth-first, without following
+    symlinks to directories.
+
+    The walk keeps an explicit stack of the directories it is in, so deep trees
+    neither hit the recursion limit nor pass every entry through a generator per
+    level. Directories that are their own ancestor, e.g. through bind mounts or
+    junctions, are detected by device and inode and skipped.
+
+    With more than one thread, directories are listed concurrently: as soon as a
+    directory has been listed, all of its subdirectories are queued for listing
+    while the walk descends into the first one. This hides the round trip of
+    every listing on high-latency file systems (e.g. network shares). The
+    entries are yielded in the same order as with a single thread.
+
+    Args:
+        path: The directory to scan.
+        threads: Number of threads listing directories.
+        max_depth: Number of directory levels below path to descend into, None
+            for no limit. With 0, only the files directly in path are yielded.
+        one_file_system: Whether to skip directories on other devices than path,
+            e.g. mounted drives.
+        scan_filter: A ScanFilter deciding which files are yielded and which
+            directories are listed, None to scan everything.
+    """
+    if not Path(path).is_dir():
+        return
+
+    list_dir = _list_dir
+    if scan_filter:
+        list_dir = partial(
+            _list_dir, scan_filter=scan_filter, prefix=len(os.path.join(path, ""))
+        )
+
+    if threads <= 1:
+        yield from _walk(
+            path, lambda path: partial(list_dir, path), max_depth, one_file_system
+        )
+        return
+
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        yield from _walk(
+            path,
+            lambda path: executor.submit(list_dir, path).result,
+            max_depth,
+            one_file_system,
+        )
+    finally:
+        # Pending listings are not needed if the walk is stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _directory_id(path):
+    """Returns the device and inode of the directory a path leads to."""
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+def _list_dir(path, scan_filter=None, prefix=0):
+    """
+    Lists a directory, along with the device and inode of the subdirectories to
+    descend into (None for other entries).
+
+    Entries rejected by the scan filter are left out. Their paths relative to the
+    scanned root start at prefix.
+    """
+    listing = []
+    with os.scandir(path) as entries:
+        for entry in entries:
             if entry.is_dir(follow_symlinks=False):
-                yield from scantree(entry.path)
-            else:
+                if scan_filter and not scan_filter.includes_directory(
+                    entry.path[prefix:], entry.name
+                ):
+                    continue
+                listing.append((entry, _directory_id(entry.path)))
+            elif not scan_filter or scan_filter.includes_file(
+                entry.path[prefix:], entry.name
+            ):
+                listing.append((entry, None))
+    return listing
+
+
+def _walk(path, schedule, max_depth, one_file_system):
+    """
+    Walks the tree with an explicit stack of the directories it is in.
+
+    schedule(path) starts listing a directory and returns a function that waits
+    for the listing.
+    """
+    logger = logging.getLogger(__name__)
+    root_id = _directory_id(path)
+    ancestors = set()
+    stack = []
+
+    def enter(directory_id, entries, depth):
+        """Pushes a listed directory and starts listing its subdirectories."""
+        ancestors.add(directory_id)
+        subdirectories = {}
+        if max_depth is None or depth < max_depth:
+            for entry, subdirectory_id in entries:
+                if subdirectory_id is None:
+                    continue
+                if subdirectory_id in ancestors:
+                    logger.warning(f"Skipping directory loop at {entry.path}")
+                elif one_file_system and subdirectory_id[0] != root_id[0]:
+                    logger.info(f"Skipping {entry.path} on another file system")
+                else:
+                    subdirectories[entry.path] = schedule(entry.path)
+        stack.append((directory_id, depth, iter(entries), subdirectories))
+
+    enter(root_id, schedule(path)(), 0)
+    while stack:
+        directory_id, depth, entries, subdirectories = stack[-1]
+        for entry, subdirectory_id in entries:
+            if subdirectory_id is None:
                 yield entry
+            elif entry.path in subdirectories:
+                listing = subdirectories.pop(entry.path)
+                enter(subdirectory_id, listing(), depth + 1)
+                break
+        else:
+            stack.pop()
+            ancestors.discard(directory_id)
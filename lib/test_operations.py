@@ -1,12 +1,48 @@
+import os
+import re
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, mock_open, MagicMock, call
 from pathlib import Path
 
-from lib.operations import copy_files, check_files
+from lib.get_file_creation_date.providers.filename.filename import (
+    FilenameFileCreationDateProvider,
+)
+from lib.get_file_creation_date.get_file_creation_date import get_file_creation_date
+from lib.operations import (
+    HARDLINKS,
+    HARDLINKS_COPY,
+    HARDLINKS_LINK,
+    HARDLINKS_SKIP,
+    _copy_with_hash,
+    _get_hash,
+    copy_files,
+    check_files,
+    generate_copy_list,
+)
+
+
+class _HangingProvider(FilenameFileCreationDateProvider):
+    """A provider that never returns for files with "hang" in their name."""
+
+    def get_file_creation_date(self, file_path, context=None):
+        while "hang" in file_path:
+            time.sleep(1)
+        return None
+
+
+class _CrashingProvider(FilenameFileCreationDateProvider):
+    """A provider that kills its process for files with "crash" in their name."""
+
+    def get_file_creation_date(self, file_path, context=None):
+        if "crash" in file_path:
+            os._exit(9)
+        return None
 
 
 class TestCopyFiles(unittest.TestCase):
-    @patch("lib.operations.shutil.copy2")
+    @patch("lib.operations._copy_with_hash", return_value=(6, 0, 6, 0, "hash_source"))
     @patch("lib.operations._get_hash")
     @patch("lib.operations.Path")
     @patch("lib.operations.open")
@@ -22,14 +58,15 @@ class TestCopyFiles(unittest.TestCase):
         mock_open,
         mock_Path,
         mock_get_hash,
-        mock_copy2,
+        mock_copy_with_hash,
     ):
         """
         Tests that copy_files correctly renames a file to _dup_2 when the
         original and the _dup_1 destinations already exist and have different hashes.
         """
         copy_list_content = (
-            "# header1\n# header2\n" "source/file.txt;2023-01-01;;;dest/file.txt\n"
+            "# header1\n# header2\n"
+            "source/file.txt;2023-01-01;;;dest/file.txt;6;0;0;0;\n"
         )
         mock_open.return_value.__enter__.return_value.__iter__.return_value = iter(
             copy_list_content.splitlines(True)
@@ -42,6 +79,7 @@ class TestCopyFiles(unittest.TestCase):
         mock_dest_path = MagicMock(spec=Path)
         mock_dest_path.__str__.return_value = dest_path_str
         mock_dest_path.is_file.return_value = True
+        mock_dest_path.stat.return_value.st_size = 6
 
         mock_dest_dir = MagicMock(spec=Path)
         mock_dest_dir.mkdir.return_value = None
@@ -53,6 +91,7 @@ class TestCopyFiles(unittest.TestCase):
         mock_dup1_path = MagicMock(spec=Path)
         mock_dup1_path.__str__.return_value = dup1_path_str
         mock_dup1_path.is_file.return_value = True
+        mock_dup1_path.stat.return_value.st_size = 6
 
         mock_dup2_path = MagicMock(spec=Path)
         mock_dup2_path.__str__.return_value = dup2_path_str
@@ -88,8 +127,8 @@ class TestCopyFiles(unittest.TestCase):
 
         copy_files("dummy_copy_list.csv")
 
-        mock_copy2.assert_called_once()
-        source_arg, dest_arg = mock_copy2.call_args[0]
+        mock_copy_with_hash.assert_called_once()
+        source_arg, dest_arg = mock_copy_with_hash.call_args[0]
         self.assertEqual(source_arg, "source/file.txt")
         self.assertEqual(str(dest_arg), dup2_path_str)
 
@@ -102,7 +141,7 @@ class TestCopyFiles(unittest.TestCase):
             ],
         )
 
-    @patch("lib.operations.shutil.copy2")
+    @patch("lib.operations._copy_with_hash", return_value=(6, 0, 6, 0, "hash_source"))
     @patch("lib.operations._get_hash")
     @patch("lib.operations.Path")
     @patch("lib.operations.open")
@@ -116,14 +155,15 @@ class TestCopyFiles(unittest.TestCase):
         mock_open,
         mock_Path,
         mock_get_hash,
-        mock_copy2,
+        mock_copy_with_hash,
     ):
         """
         Tests that copy_files does NOT copy a file if an identical version
         (matching hash) already exists as a duplicate.
         """
         copy_list_content = (
-            "# header1\n# header2\n" "source/file.txt;2023-01-01;;;dest/file.txt\n"
+            "# header1\n# header2\n"
+            "source/file.txt;2023-01-01;;;dest/file.txt;6;0;0;0;\n"
         )
         mock_open.return_value.__enter__.return_value.__iter__.return_value = iter(
             copy_list_content.splitlines(True)
@@ -136,6 +176,7 @@ class TestCopyFiles(unittest.TestCase):
         mock_dest_path = MagicMock(spec=Path)
         mock_dest_path.__str__.return_value = dest_path_str
         mock_dest_path.is_file.return_value = True
+        mock_dest_path.stat.return_value.st_size = 6
 
         mock_dest_dir = MagicMock(spec=Path)
         mock_dest_dir.mkdir.return_value = None
@@ -147,10 +188,12 @@ class TestCopyFiles(unittest.TestCase):
         mock_dup1_path = MagicMock(spec=Path)
         mock_dup1_path.__str__.return_value = dup1_path_str
         mock_dup1_path.is_file.return_value = True
+        mock_dup1_path.stat.return_value.st_size = 6
 
         mock_dup2_path = MagicMock(spec=Path)
         mock_dup2_path.__str__.return_value = dup2_path_str
         mock_dup2_path.is_file.return_value = True  # This one also exists
+        mock_dup2_path.stat.return_value.st_size = 6
 
         def truediv_side_effect(name):
             if name == "file_dup_1.txt":
@@ -185,9 +228,9 @@ class TestCopyFiles(unittest.TestCase):
         copy_files("dummy_copy_list.csv")
 
         # The key assertion: copy should NOT be called.
-        mock_copy2.assert_not_called()
+        mock_copy_with_hash.assert_not_called()
 
-    @patch("lib.operations.shutil.copy2")
+    @patch("lib.operations._copy_with_hash", return_value=(6, 0, 6, 0, "hash_source"))
     @patch("lib.operations._get_hash")
     @patch("lib.operations.Path")
     @patch("lib.operations.open")
@@ -201,7 +244,7 @@ class TestCopyFiles(unittest.TestCase):
         mock_open,
         mock_Path,
         mock_get_hash,
-        mock_copy2,
+        mock_copy_with_hash,
     ):
         """
         Tests that mkdir is only called once for a given destination directory,
@@ -242,6 +285,205 @@ class TestCopyFiles(unittest.TestCase):
         # Assert that mkdir was called only once for the shared directory.
         mock_dest_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
 
+    @patch("lib.operations.setup_logging")
+    def test_recorded_size_avoids_hashing_destination(self, mock_setup_logging):
+        """
+        Tests that neither the source nor a destination whose size differs from
+        the recorded source size is hashed.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            source = root / "file.txt"
+            source.write_bytes(b"source")
+            destination = root / "dest" / "file.txt"
+            destination.parent.mkdir()
+            destination.write_bytes(b"other content")
+            stat = os.stat(source)
+            copy_list = root / "copy-list.csv"
+            copy_list.write_text(
+                "# COPY LIST\n# header\n"
+                f"{source};2023-01-01 00:00:00;;;{destination};"
+                f"{stat.st_size};{stat.st_mtime_ns};{stat.st_dev};{stat.st_ino}\n",
+                encoding="utf-8",
+            )
+
+            with patch(
+                "lib.operations._get_hash", side_effect=lambda path: str(path)
+            ) as mock_get_hash:
+                copy_files(str(copy_list))
+
+            mock_get_hash.assert_not_called()
+            self.assertEqual((root / "dest" / "file_dup_1.txt").read_bytes(), b"source")
+
+    @patch("lib.operations.setup_logging")
+    def test_source_is_hashed_only_for_collisions(self, mock_setup_logging):
+        """
+        Tests that sources are not hashed when copying into an empty destination,
+        and hashed once when destinations of the same size exist.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            source = root / "file.txt"
+            source.write_bytes(b"source")
+            copy_list = root / "copy-list.csv"
+            # Written before the stat columns were added, so the size is stat'ed
+            copy_list.write_text(
+                "# COPY LIST\n# header\n"
+                f"{source};2023-01-01 00:00:00;;;{root / 'dest' / 'file.txt'}\n",
+                encoding="utf-8",
+            )
+
+            with patch("lib.operations._get_hash", wraps=_get_hash) as mock_get_hash:
+                copy_files(str(copy_list))
+            mock_get_hash.assert_not_called()
+
+            (root / "dest" / "file.txt").write_bytes(b"change")
+            (root / "dest" / "file_dup_1.txt").write_bytes(b"differ")
+            with patch("lib.operations._get_hash", wraps=_get_hash) as mock_get_hash:
+                copy_files(str(copy_list))
+
+            self.assertEqual(
+                mock_get_hash.call_args_list,
+                [
+                    call(str(source)),
+                    call(root / "dest" / "file.txt"),
+                    call(root / "dest" / "file_dup_1.txt"),
+                ],
+            )
+            self.assertEqual((root / "dest" / "file_dup_2.txt").read_bytes(), b"source")
+
+    def test_copy_with_hash(self):
+        """Tests that files are copied with their metadata and hashed on the way."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "source.bin"
+            source.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+            os.utime(source, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+            destination = Path(temp_dir) / "destination.bin"
+
+            source_size, source_mtime_ns, size, mtime_ns, file_hash = _copy_with_hash(
+                str(source), destination
+            )
+
+            self.assertEqual(destination.read_bytes(), source.read_bytes())
+            self.assertEqual(source_size, source.stat().st_size)
+            self.assertEqual(source_mtime_ns, 1_600_000_000_000_000_000)
+            self.assertEqual(size, source.stat().st_size)
+            self.assertEqual(mtime_ns, 1_600_000_000_000_000_000)
+            self.assertEqual(destination.stat().st_mtime_ns, mtime_ns)
+            self.assertEqual(file_hash, _get_hash(str(source)))
+
+    @patch("lib.operations.setup_logging")
+    def test_manifest_is_reused(self, mock_setup_logging):
+        """
+        Tests that copies are recorded in a manifest next to the copy list, which
+        spares hashing either file on the next run while both are unchanged.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            source = root / "file.txt"
+            source.write_bytes(b"source")
+            destination = root / "dest" / "file.txt"
+            copy_list = root / "copy-list-1234.csv"
+            copy_list.write_text(
+                "# COPY LIST\n# header\n"
+                f"{source};2023-01-01 00:00:00;;;{destination}\n",
+                encoding="utf-8",
+            )
+
+            copy_files(str(copy_list))
+            manifest = (root / "copy-list-1234.manifest.csv").read_text(
+                encoding="utf-8"
+            )
+            with patch("lib.operations._get_hash", wraps=_get_hash) as mock_get_hash:
+                copy_files(str(copy_list))
+
+            source_stat = source.stat()
+            stat = destination.stat()
+            self.assertEqual(
+                manifest.splitlines(),
+                [
+                    f"# MANIFEST {copy_list}",
+                    "source;source_size;source_mtime_ns;destination;size;mtime_ns;hash",
+                    f"{source};6;{source_stat.st_mtime_ns};"
+                    f"{destination};6;{stat.st_mtime_ns};{_get_hash(str(source))}",
+                ],
+            )
+            mock_get_hash.assert_not_called()
+            self.assertEqual(
+                (root / "copy-list-1234.manifest.csv").read_text(encoding="utf-8"),
+                manifest,
+            )
+
+            # A touched source is hashed, the destination's hash is still reused
+            os.utime(source, ns=(source_stat.st_mtime_ns + 10**9,) * 2)
+            with patch("lib.operations._get_hash", wraps=_get_hash) as mock_get_hash:
+                copy_files(str(copy_list))
+
+            self.assertEqual(mock_get_hash.call_args_list, [call(str(source))])
+            self.assertFalse((root / "dest" / "file_dup_1.txt").exists())
+
+    @patch("lib.operations.setup_logging")
+    def test_manifest_header_is_written_once(self, mock_setup_logging):
+        """
+        Tests that repeated runs append to the manifest without repeating its
+        header, even if no file was recorded.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            copy_list = root / "copy-list-1234.csv"
+            copy_list.write_text("# COPY LIST\n# header\n", encoding="utf-8")
+
+            for _ in range(3):
+                copy_files(str(copy_list))
+
+            self.assertEqual(
+                (root / "copy-list-1234.manifest.csv")
+                .read_text(encoding="utf-8")
+                .splitlines(),
+                [
+                    f"# MANIFEST {copy_list}",
+                    "source;source_size;source_mtime_ns;destination;size;mtime_ns;hash",
+                ],
+            )
+
+    @patch("lib.operations.setup_logging")
+    def test_hard_links(self, mock_setup_logging):
+        """Tests that hard links are linked, skipped or copied as requested."""
+        for hardlinks in HARDLINKS:
+            with self.subTest(
+                hardlinks=hardlinks
+            ), tempfile.TemporaryDirectory() as temp_dir:
+                root = Path(temp_dir)
+                source = root / "file.txt"
+                source.write_bytes(b"source")
+                link = root / "link.txt"
+                os.link(source, link)
+                copy_list = root / "copy-list.csv"
+                copy_list.write_text(
+                    "# COPY LIST\n# header\n"
+                    f"{source};2023-01-01 00:00:00;;;{root / 'dest' / 'file.txt'};;;;;\n"
+                    f"{link};2023-01-01 00:00:00;;;{root / 'dest' / 'link.txt'};;;;;{source}\n",
+                    encoding="utf-8",
+                )
+
+                with patch(
+                    "lib.operations._copy_with_hash", wraps=_copy_with_hash
+                ) as mock_copy_with_hash:
+                    copy_files(str(copy_list), hardlinks=hardlinks)
+
+                copied = os.stat(root / "dest" / "file.txt")
+                if hardlinks == HARDLINKS_SKIP:
+                    self.assertFalse((root / "dest" / "link.txt").exists())
+                else:
+                    linked = os.stat(root / "dest" / "link.txt")
+                    self.assertEqual(
+                        linked.st_ino == copied.st_ino, hardlinks == HARDLINKS_LINK
+                    )
+                self.assertEqual(
+                    mock_copy_with_hash.call_count,
+                    2 if hardlinks == HARDLINKS_COPY else 1,
+                )
+
 
 class TestCheckFiles(unittest.TestCase):
     def _run_check_files_with_mocks(
@@ -398,3 +640,413 @@ class TestCheckFiles(unittest.TestCase):
         # Assert no warning was logged for mismatch because the duplicate was found
         for call_item in mock_logging.getLogger.return_value.warning.call_args_list:
             self.assertNotIn("mismatch", call_item[0][0])
+
+    @patch("lib.operations.glob.glob")
+    @patch("lib.operations.logging")
+    @patch("lib.operations.setup_logging")
+    @patch("lib.operations.tqdm", lambda x, **kwargs: x)
+    @patch("lib.operations.open")
+    @patch("lib.operations.Path")
+    def test_check_files_uses_recorded_source_size(
+        self, mock_Path, mock_open, mock_setup_logging, mock_logging, mock_glob
+    ):
+        """Tests that the source size recorded in the copy list is used without accessing the source."""
+        source = self._create_mock_file("source/file.txt", True, 1024)
+        self._create_mock_file("dest/file.txt", True, 1024)
+
+        copy_list = "# h\n# h\nsource/file.txt;;;;dest/file.txt;1024;0;1;2"
+        self._run_check_files_with_mocks(
+            mock_Path,
+            mock_open,
+            mock_glob,
+            copy_list,
+            self.filesystem_mocks,
+            [],
+        )
+
+        source.exists.assert_not_called()
+        source.stat.assert_not_called()
+        mock_logging.getLogger.return_value.warning.assert_not_called()
+
+
+@patch("lib.operations.tqdm", MagicMock())
+@patch("lib.operations.setup_logging")
+class TestGenerateCopyList(unittest.TestCase):
+    def setUp(self):
+        """Create a source tree with dated filenames and switch into a work dir."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.source = root / "source"
+        (self.source / "sub").mkdir(parents=True)
+        for i in range(1, 13):
+            (self.source / f"IMG_2023{i:02d}01_101500.jpg").write_bytes(b"x")
+            (self.source / "sub" / f"VID_2022{i:02d}15_080000.mp4").write_bytes(b"x")
+        (self.source / "no_date.txt").write_bytes(b"x")
+
+        self.work_dir = root / "work"
+        self.work_dir.mkdir()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.temp_dir.cleanup()
+
+    def _read_copy_list(self):
+        (copy_list,) = self.work_dir.glob("copy-list-*.csv")
+        return copy_list.read_text(encoding="utf-8").splitlines()
+
+    def test_generates_copy_list(self, mock_setup_logging):
+        """Test that every dated file is listed with its destination."""
+        generate_copy_list([str(self.source)], "/dest")
+
+        lines = self._read_copy_list()
+        self.assertEqual(
+            lines[1],
+            "source;date;provider;provider_info;destination;size;mtime_ns;device;inode;hardlink_of",
+        )
+        self.assertEqual(lines[-1], "# END OF FILE")
+        self.assertEqual(len(lines), 2 + 24 + 1)
+        stat = os.stat(self.source / "IMG_20230301_101500.jpg")
+        self.assertIn(
+            f"{self.source / 'IMG_20230301_101500.jpg'};2023-03-01 10:15:00;filename;;"
+            f"{Path('/dest') / '2023' / '03' / 'IMG_20230301_101500.jpg'};"
+            f"{stat.st_size};{stat.st_mtime_ns};{stat.st_dev};{stat.st_ino};",
+            lines,
+        )
+
+    def test_shape_cache_is_logged(self, mock_setup_logging):
+        """Test that the shape cache statistics of the analysis are logged, also from workers."""
+        for workers in [1, 2]:
+            with self.subTest(workers=workers), self.assertLogs(
+                "lib.operations", "INFO"
+            ) as logs:
+                generate_copy_list([str(self.source)], "/dest", workers=workers)
+
+            (message,) = [m for m in logs.output if "Date parser shape cache:" in m]
+            hits, misses = map(int, re.findall(r"(\d+) (?:hits|misses)", message))
+            # Every dated file name is parsed, the twelve of a kind share a shape
+            self.assertGreaterEqual(hits + misses, 24)
+            self.assertGreater(hits, 0)
+
+            # Resumed entries are taken over without parsing anything
+            with self.assertLogs("lib.operations", "INFO") as logs:
+                generate_copy_list([str(self.source)], "/dest", workers=workers)
+            self.assertIn(
+                "Date parser shape cache: 0 hits, 0 misses",
+                "\n".join(logs.output),
+            )
+            for copy_list in self.work_dir.glob("*.csv"):
+                copy_list.unlink()
+
+    def test_parallel_workers_produce_identical_list(self, mock_setup_logging):
+        """Test that a process pool yields the same copy list in the same order."""
+        generate_copy_list([str(self.source)], "/dest")
+        serial_lines = self._read_copy_list()
+        for copy_list in self.work_dir.glob("copy-list-*.csv"):
+            copy_list.unlink()
+
+        generate_copy_list([str(self.source)], "/dest", workers=3)
+
+        self.assertEqual(self._read_copy_list(), serial_lines)
+
+    def test_parallel_scan_produces_identical_list(self, mock_setup_logging):
+        """Test that listing directories concurrently keeps the scan order."""
+        generate_copy_list([str(self.source)], "/dest")
+        serial_lines = self._read_copy_list()
+        for copy_list in self.work_dir.glob("copy-list-*.csv"):
+            copy_list.unlink()
+
+        generate_copy_list([str(self.source)], "/dest", scan_threads=4)
+
+        self.assertEqual(self._read_copy_list(), serial_lines)
+
+    def _create_second_source(self):
+        other = self.source.parent / "other"
+        other.mkdir()
+        for i in range(1, 13):
+            (other / f"IMG_2021{i:02d}01_101500.jpg").write_bytes(b"x")
+        return other
+
+    def test_concurrent_sources_produce_identical_lists(self, mock_setup_logging):
+        """Test that sources processed at the same time yield the same copy lists."""
+        sources = [str(self.source), str(self._create_second_source())]
+        generate_copy_list(sources, "/dest")
+        serial_lists = {
+            copy_list.name: copy_list.read_text(encoding="utf-8")
+            for copy_list in self.work_dir.glob("copy-list-*.csv")
+        }
+        for copy_list in self.work_dir.glob("*.csv"):
+            copy_list.unlink()
+
+        generate_copy_list(sources, "/dest", source_jobs=2, jobs_per_device=2)
+
+        self.assertEqual(len(serial_lists), 2)
+        self.assertEqual(
+            {
+                copy_list.name: copy_list.read_text(encoding="utf-8")
+                for copy_list in self.work_dir.glob("copy-list-*.csv")
+            },
+            serial_lists,
+        )
+
+    def test_jobs_per_device(self, mock_setup_logging):
+        """Test that sources on the same device are limited to jobs_per_device."""
+        sources = [str(self.source), str(self._create_second_source())]
+        running = []
+        concurrency = []
+
+        def generate_source_copy_list(source, *args, **kwargs):
+            running.append(source)
+            concurrency.append(len(running))
+            time.sleep(0.2)
+            running.remove(source)
+
+        with patch(
+            "lib.operations._generate_source_copy_list",
+            side_effect=generate_source_copy_list,
+        ):
+            generate_copy_list(sources, "/dest", source_jobs=2)
+            self.assertEqual(max(concurrency), 1)
+
+            concurrency.clear()
+            generate_copy_list(sources, "/dest", source_jobs=2, jobs_per_device=2)
+            self.assertEqual(max(concurrency), 2)
+
+    def test_hard_links_are_analyzed_once(self, mock_setup_logging):
+        """Test that further hard links of a file take over its date."""
+        first = self.source / "IMG_20230101_101500.jpg"
+        os.link(first, self.source / "sub" / "copy.jpg")
+        os.link(first, self.source / "sub" / "other copy.jpg")
+
+        with patch(
+            "lib.operations.get_file_creation_date", wraps=get_file_creation_date
+        ) as mock_get_date:
+            generate_copy_list([str(self.source)], "/dest")
+
+        analyzed = [c.args[0] for c in mock_get_date.call_args_list]
+        rows = [line.split(";") for line in self._read_copy_list()[2:-1]]
+        links = [row for row in rows if Path(row[0]).name.endswith("copy.jpg")]
+        (first_row,) = [row for row in rows if row[0] == str(first)]
+        self.assertEqual(len(analyzed), 25)
+        self.assertEqual(len(rows), 26)
+        self.assertEqual(len(links), 2)
+        for link in links:
+            self.assertNotIn(link[0], analyzed)
+            self.assertEqual(link[1:4], first_row[1:4])
+            self.assertEqual(link[-1], str(first))
+            self.assertEqual(Path(link[4]).name, Path(link[0]).name)
+
+    def test_resume_skips_known_files(self, mock_setup_logging):
+        """Test that files already in the copy list are not analyzed again."""
+        generate_copy_list([str(self.source)], "/dest")
+        first_run = self._read_copy_list()
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            mock_get_date.return_value = None
+            generate_copy_list([str(self.source)], "/dest")
+
+        mock_get_date.assert_not_called()
+        self.assertEqual(self._read_copy_list(), first_run)
+
+    def test_changed_file_is_analyzed_again(self, mock_setup_logging):
+        """Test that a listed file is analyzed again once its size changed."""
+        generate_copy_list([str(self.source)], "/dest")
+        changed = self.source / "IMG_20230301_101500.jpg"
+        changed.write_bytes(b"changed")
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            mock_get_date.return_value = None
+            generate_copy_list([str(self.source)], "/dest")
+
+        analyzed = [c.args[0] for c in mock_get_date.call_args_list]
+        self.assertEqual(analyzed, [str(changed)])
+
+    def test_copy_list_without_stat_columns_is_read(self, mock_setup_logging):
+        """Test that copy lists written before the stat columns still skip files."""
+        generate_copy_list([str(self.source)], "/dest")
+        (copy_list,) = self.work_dir.glob("copy-list-*.csv")
+        lines = copy_list.read_text(encoding="utf-8").splitlines()
+        copy_list.write_text(
+            "\n".join(
+                [lines[0], "source;date;provider;provider_info;destination"]
+                + [";".join(line.split(";")[:5]) for line in lines[2:-1]]
+                + [lines[-1], ""]
+            ),
+            encoding="utf-8",
+        )
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            generate_copy_list([str(self.source)], "/dest")
+
+        mock_get_date.assert_not_called()
+        self.assertEqual(self._read_copy_list(), lines)
+
+    def test_source_files_are_stat_once(self, mock_setup_logging):
+        """Test that the stat data of the scan is reused by the persistent cache."""
+        cache_dir = str(self.work_dir / "cache")
+
+        with patch("os.stat", side_effect=os.stat) as mock_stat:
+            generate_copy_list([str(self.source)], "/dest", cache_dir=cache_dir)
+
+        stat_paths = [Path(c.args[0]) for c in mock_stat.call_args_list]
+        self.assertEqual(
+            [
+                path
+                for path in stat_paths
+                if self.source in path.parents and path.is_file()
+            ],
+            [],
+        )
+
+    def test_undated_files_are_recorded(self, mock_setup_logging):
+        """Test that files without a date are written to the undated list."""
+        generate_copy_list([str(self.source)], "/dest")
+
+        (undated_list,) = self.work_dir.glob("undated-*.csv")
+        lines = undated_list.read_text(encoding="utf-8").splitlines()
+        stat = os.stat(self.source / "no_date.txt")
+        self.assertEqual(
+            lines[1:],
+            [
+                "source;size;mtime_ns;status",
+                f"{self.source / 'no_date.txt'};{stat.st_size};{stat.st_mtime_ns};undated",
+                "# END OF FILE",
+            ],
+        )
+
+    def test_changed_undated_file_is_analyzed_again(self, mock_setup_logging):
+        """Test that an undated file is analyzed again once it has changed."""
+        generate_copy_list([str(self.source)], "/dest")
+        (self.source / "no_date.txt").write_bytes(b"changed")
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            mock_get_date.return_value = None
+            generate_copy_list([str(self.source)], "/dest")
+
+        analyzed = [c.args[0] for c in mock_get_date.call_args_list]
+        self.assertEqual(analyzed, [str(self.source / "no_date.txt")])
+
+    def test_retry_undated(self, mock_setup_logging):
+        """Test that retry_undated analyzes known undated files again."""
+        generate_copy_list([str(self.source)], "/dest")
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            mock_get_date.return_value = None
+            generate_copy_list([str(self.source)], "/dest", retry_undated=True)
+
+        analyzed = [c.args[0] for c in mock_get_date.call_args_list]
+        self.assertEqual(analyzed, [str(self.source / "no_date.txt")])
+
+    def test_cache_reused_after_copy_list_is_deleted(self, mock_setup_logging):
+        """Test that the persistent cache avoids re-analysis when the copy list is gone."""
+        cache_dir = str(self.work_dir / "cache")
+        generate_copy_list([str(self.source)], "/dest", cache_dir=cache_dir)
+        first_run = self._read_copy_list()
+        for copy_list in self.work_dir.glob("copy-list-*.csv"):
+            copy_list.unlink()
+
+        with patch(
+            "lib.get_file_creation_date.get_file_creation_date._find_entries"
+        ) as mock_find_entries:
+            mock_find_entries.return_value = iter([])
+            generate_copy_list([str(self.source)], "/dest", cache_dir=cache_dir)
+
+        mock_find_entries.assert_not_called()
+        self.assertEqual(self._read_copy_list(), first_run)
+
+    def test_cache_not_reused_after_rename(self, mock_setup_logging):
+        """Test that a renamed file gets the date of its new name despite the cache."""
+        cache_dir = str(self.work_dir / "cache")
+        generate_copy_list([str(self.source)], "/dest", cache_dir=cache_dir)
+        os.rename(
+            self.source / "IMG_20230501_101500.jpg",
+            self.source / "IMG_20190101_000000.jpg",
+        )
+
+        generate_copy_list([str(self.source)], "/dest", cache_dir=cache_dir)
+
+        self.assertTrue(
+            any(
+                "IMG_20190101_000000.jpg;2019-01-01 00:00:00;filename;" in line
+                for line in self._read_copy_list()
+            )
+        )
+
+    def test_undated_list_without_status_is_read(self, mock_setup_logging):
+        """Test that undated lists written before the status column still skip files."""
+        generate_copy_list([str(self.source)], "/dest")
+        (undated_list,) = self.work_dir.glob("undated-*.csv")
+        stat = os.stat(self.source / "no_date.txt")
+        undated_list.write_text(
+            f"# UNDATED FILES {self.source}\nsource;size;mtime_ns\n"
+            f"{self.source / 'no_date.txt'};{stat.st_size};{stat.st_mtime_ns}\n"
+            "# END OF FILE\n",
+            encoding="utf-8",
+        )
+
+        with patch("lib.operations.get_file_creation_date") as mock_get_date:
+            generate_copy_list([str(self.source)], "/dest")
+
+        mock_get_date.assert_not_called()
+
+    def test_provider_timeout(self, mock_setup_logging):
+        """Test that a hanging provider is killed and the file is marked as timed out."""
+        (self.source / "hang.bin").write_bytes(b"x")
+        (self.source / "IMG_20240101_101500_hang.jpg").write_bytes(b"x")
+        providers = [FilenameFileCreationDateProvider(), _HangingProvider()]
+
+        with patch(
+            "lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE",
+            providers,
+        ):
+            generate_copy_list(
+                [str(self.source)], "/dest", timeouts={"_HangingProvider": 0.5}
+            )
+
+        lines = self._read_copy_list()
+        self.assertEqual(len(lines), 2 + 25 + 1)
+        self.assertTrue(
+            any("IMG_20240101_101500_hang.jpg;2024-01-01" in l for l in lines)
+        )
+        (undated_list,) = self.work_dir.glob("undated-*.csv")
+        undated = {
+            line.split(";")[0]: line.split(";")[-1]
+            for line in undated_list.read_text(encoding="utf-8").splitlines()[2:-1]
+        }
+        self.assertEqual(
+            undated,
+            {
+                str(self.source / "hang.bin"): "timeout",
+                str(self.source / "no_date.txt"): "undated",
+            },
+        )
+
+    def test_provider_crash(self, mock_setup_logging):
+        """Test that a crashed provider process is replaced and the file marked as crashed."""
+        (self.source / "crash.bin").write_bytes(b"x")
+        providers = [FilenameFileCreationDateProvider(), _CrashingProvider()]
+
+        with patch(
+            "lib.get_file_creation_date.get_file_creation_date._PROVIDERS_AVAILABLE",
+            providers,
+        ):
+            generate_copy_list(
+                [str(self.source)], "/dest", timeouts={None: 5}, retry_undated=True
+            )
+
+        lines = self._read_copy_list()
+        self.assertEqual(len(lines), 2 + 24 + 1)
+        self.assertEqual(lines[-1], "# END OF FILE")
+        (undated_list,) = self.work_dir.glob("undated-*.csv")
+        undated = {
+            line.split(";")[0]: line.split(";")[-1]
+            for line in undated_list.read_text(encoding="utf-8").splitlines()[2:-1]
+        }
+        self.assertEqual(
+            undated,
+            {
+                str(self.source / "crash.bin"): "crashed",
+                str(self.source / "no_date.txt"): "undated",
+            },
+        )
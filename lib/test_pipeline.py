@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from lib.pipeline import BackgroundIterator, ordered_map
+
+
+def _square(value):
+    return value * value
+
+
+class TestOrderedMap(unittest.TestCase):
+    def test_serial_map_keeps_order(self):
+        """Test that a single worker maps items in order."""
+        self.assertEqual(
+            list(ordered_map(_square, range(10))), [x * x for x in range(10)]
+        )
+
+    def test_parallel_map_keeps_order(self):
+        """Test that results from a process pool are yielded in input order."""
+        items = range(1000)
+        results = list(ordered_map(_square, items, workers=3, chunk_size=7))
+
+        self.assertEqual(results, [x * x for x in items])
+
+    def test_parallel_map_accepts_generators(self):
+        """Test that items are consumed lazily from any iterable."""
+        items = (x for x in range(50))
+        results = list(ordered_map(_square, items, workers=2, chunk_size=4))
+
+        self.assertEqual(results, [x * x for x in range(50)])
+
+    def test_empty_input(self):
+        """Test that an empty input yields nothing."""
+        self.assertEqual(list(ordered_map(_square, [], workers=2)), [])
+
+
+class TestBackgroundIterator(unittest.TestCase):
+    def test_yields_all_items_in_order(self):
+        """Test that every produced item is handed over in order."""
+        iterator = BackgroundIterator(range(100), maxsize=5)
+
+        self.assertEqual(list(iterator), list(range(100)))
+        self.assertEqual(iterator.produced, 100)
+        self.assertTrue(iterator.finished)
+
+    def test_producer_is_bounded_by_queue_size(self):
+        """Test that the producer does not run ahead of the consumer by more than maxsize."""
+        consumed_first = threading.Event()
+        produced_before_first = []
+
+        def producer():
+            for i in range(100):
+                if i == 10:
+                    produced_before_first.append(consumed_first.is_set())
+                yield i
+
+        iterator = BackgroundIterator(producer(), maxsize=3)
+        items = iter(iterator)
+        self.assertEqual(next(items), 0)
+        consumed_first.set()
+
+        self.assertEqual(list(items), list(range(1, 100)))
+        self.assertEqual(produced_before_first, [True])
+
+    def test_producer_errors_are_raised_to_consumer(self):
+        """Test that an exception in the producer surfaces in the consumer."""
+
+        def producer():
+            yield 1
+            raise OSError("scan failed")
+
+        with self.assertRaises(OSError):
+            list(BackgroundIterator(producer()))
+
+    def test_consumer_can_stop_early(self):
+        """Test that stopping early releases a producer blocked on a full queue."""
+        iterator = BackgroundIterator(range(1000), maxsize=2)
+        items = iter(iterator)
+        next(items)
+        items.close()
+
+        iterator._thread.join(timeout=5)
+        self.assertFalse(iterator._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from lib.scan_filter import ScanFilter, read_scan_rules
+
+
+class TestScanFilter(unittest.TestCase):
+    def test_empty_filter_includes_everything(self):
+        """Test that a filter without rules is falsy and includes everything."""
+        scan_filter = ScanFilter()
+
+        self.assertFalse(scan_filter)
+        self.assertTrue(scan_filter.includes_directory("@eaDir", "@eaDir"))
+        self.assertTrue(scan_filter.includes_file("a.jpg", "a.jpg"))
+
+    def test_exclude_names(self):
+        """Test that exclude globs match file and directory names at any level."""
+        scan_filter = ScanFilter(exclude=["@eaDir", ".git", "*.tmp"])
+
+        self.assertTrue(scan_filter)
+        self.assertFalse(scan_filter.includes_directory("@eaDir", "@eaDir"))
+        self.assertFalse(
+            scan_filter.includes_directory(os.path.join("a", "b", ".git"), ".git")
+        )
+        self.assertFalse(scan_filter.includes_file(os.path.join("a", "x.TMP"), "x.TMP"))
+        self.assertTrue(scan_filter.includes_directory("photos", "photos"))
+        self.assertTrue(scan_filter.includes_file("photo.jpg", "photo.jpg"))
+
+    def test_exclude_paths(self):
+        """Test that globs with a slash match the path relative to the source."""
+        scan_filter = ScanFilter(exclude=["photos/cache"])
+
+        self.assertFalse(
+            scan_filter.includes_directory(os.path.join("photos", "cache"), "cache")
+        )
+        self.assertTrue(
+            scan_filter.includes_directory(os.path.join("videos", "cache"), "cache")
+        )
+
+    def test_include_and_extensions(self):
+        """Test that files must match the include globs and extensions."""
+        scan_filter = ScanFilter(include=["IMG_*"], extensions=["JPG", ".heic"])
+
+        self.assertTrue(scan_filter.includes_file("IMG_1.jpg", "IMG_1.jpg"))
+        self.assertTrue(scan_filter.includes_file("img_2.HEIC", "img_2.HEIC"))
+        self.assertFalse(scan_filter.includes_file("IMG_3.mp4", "IMG_3.mp4"))
+        self.assertFalse(scan_filter.includes_file("DSC_4.jpg", "DSC_4.jpg"))
+        # Include globs do not stop the scan from descending
+        self.assertTrue(scan_filter.includes_directory("2023", "2023"))
+
+    def test_excludes_take_precedence(self):
+        """Test that exclude rules win over include rules."""
+        scan_filter = ScanFilter(
+            include=["*"], exclude=["*_thumb.jpg"], exclude_extensions=["db"]
+        )
+
+        self.assertFalse(scan_filter.includes_file("a_thumb.jpg", "a_thumb.jpg"))
+        self.assertFalse(scan_filter.includes_file("Thumbs.db", "Thumbs.db"))
+        self.assertTrue(scan_filter.includes_file("a.jpg", "a.jpg"))
+
+
+class TestReadScanRules(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary directory for config files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.temp_dir.name) / "scan.ini"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_rules(self):
+        """Test that lists are split on new lines and commas."""
+        self.config_path.write_text(
+            "[scan]\nexclude =\n    @eaDir\n    .git, node_modules\n"
+            "extensions = jpg, heic\n",
+            encoding="utf-8",
+        )
+
+        self.assertEqual(
+            read_scan_rules(str(self.config_path)),
+            {
+                "exclude": ["@eaDir", ".git", "node_modules"],
+                "extensions": ["jpg", "heic"],
+            },
+        )
+
+    def test_missing_section(self):
+        """Test that a config file without a [scan] section has no rules."""
+        self.config_path.write_text("[other]\nkey = value\n", encoding="utf-8")
+
+        self.assertEqual(read_scan_rules(str(self.config_path)), {})
+
+    def test_invalid_config(self):
+        """Test that missing files and unknown keys raise a ValueError."""
+        with self.assertRaises(ValueError):
+            read_scan_rules(str(self.config_path))
+
+        self.config_path.write_text("[scan]\nexclud = .git\n", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            read_scan_rules(str(self.config_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
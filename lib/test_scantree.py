@@ -1,8 +1,13 @@
 import os
+import sys
 import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from lib import scantree as scantree_module
+from lib.scan_filter import ScanFilter
 from lib.scantree import scantree
 
 
@@ -131,5 +136,206 @@ class TestScantree(unittest.TestCase):
             self.skipTest("Symlinks not supported on this platform")
 
 
+class TestParallelScantree(unittest.TestCase):
+    def setUp(self):
+        """Set up a directory tree with several levels of subdirectories."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_root = Path(self.temp_dir.name)
+        for a in range(4):
+            for b in range(3):
+                directory = self.test_root / f"dir{a}" / f"sub{b}"
+                directory.mkdir(parents=True)
+                for c in range(2):
+                    (directory / f"file{c}.txt").write_text("content")
+            (self.test_root / f"dir{a}" / "file.txt").write_text("content")
+        (self.test_root / "file.txt").write_text("content")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_same_entries_in_same_order(self):
+        """Test that concurrent listing yields the entries of a serial walk."""
+        serial = [entry.path for entry in scantree(str(self.test_root))]
+        parallel = [entry.path for entry in scantree(str(self.test_root), threads=4)]
+
+        self.assertEqual(len(serial), 4 * (3 * 2 + 1) + 1)
+        self.assertEqual(parallel, serial)
+
+    def test_entries_are_direntries(self):
+        """Test that concurrent listing yields os.DirEntry objects."""
+        for entry in scantree(str(self.test_root), threads=4):
+            self.assertIsInstance(entry, os.DirEntry)
+
+    def test_does_not_follow_symlinks(self):
+        """Test that symlinks to directories are yielded but not descended into."""
+        try:
+            (self.test_root / "link").symlink_to(
+                self.test_root / "dir0", target_is_directory=True
+            )
+        except (OSError, NotImplementedError):
+            self.skipTest("Symlinks not supported on this platform")
+
+        paths = [entry.path for entry in scantree(str(self.test_root), threads=4)]
+
+        self.assertIn(str(self.test_root / "link"), paths)
+        self.assertFalse(any("link" + os.sep in path for path in paths))
+
+    def test_directories_are_listed_concurrently(self):
+        """Test that slow listings overlap instead of adding up."""
+        list_dir = scantree_module._list_dir
+
+        def slow_list_dir(path, **kwargs):
+            time.sleep(0.2)
+            return list_dir(path, **kwargs)
+
+        with patch.object(scantree_module, "_list_dir", side_effect=slow_list_dir):
+            start = time.monotonic()
+            entries = list(scantree(str(self.test_root), threads=16))
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(len(entries), 29)
+        # 17 directories in 3 levels, so 3.4s when listed one after another
+        self.assertLess(elapsed, 2)
+
+    def test_stopping_early(self):
+        """Test that the walk can be abandoned while listings are pending."""
+        walk = scantree(str(self.test_root), threads=2)
+        next(walk)
+        walk.close()
+
+    def test_errors_are_raised(self):
+        """Test that errors listing a directory reach the caller."""
+        with patch.object(
+            scantree_module, "_list_dir", side_effect=PermissionError("denied")
+        ):
+            with self.assertRaises(PermissionError):
+                list(scantree(str(self.test_root), threads=2))
+
+
+class TestScantreeLimits(unittest.TestCase):
+    def setUp(self):
+        """Set up a directory tree with two levels of subdirectories."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_root = Path(self.temp_dir.name)
+        for a in range(2):
+            for b in range(2):
+                directory = self.test_root / f"dir{a}" / f"sub{b}"
+                directory.mkdir(parents=True)
+                (directory / "file.txt").write_text("content")
+            (self.test_root / f"dir{a}" / "file.txt").write_text("content")
+        (self.test_root / "file.txt").write_text("content")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _scan(self, **kwargs):
+        """Scans serially and concurrently, checking that both agree."""
+        serial = [
+            str(Path(entry.path).relative_to(self.test_root))
+            for entry in scantree(str(self.test_root), **kwargs)
+        ]
+        parallel = [
+            str(Path(entry.path).relative_to(self.test_root))
+            for entry in scantree(str(self.test_root), threads=4, **kwargs)
+        ]
+        self.assertEqual(parallel, serial)
+        return sorted(serial)
+
+    def test_max_depth(self):
+        """Test that directories deeper than the maximum depth are not scanned."""
+        self.assertEqual(self._scan(max_depth=0), ["file.txt"])
+        self.assertEqual(
+            self._scan(max_depth=1),
+            ["dir0/file.txt", "dir1/file.txt", "file.txt"],
+        )
+        self.assertEqual(len(self._scan(max_depth=2)), 7)
+
+    def test_deep_tree(self):
+        """Test that trees deeper than the recursion limit can be scanned."""
+        directory = self.test_root
+        for _ in range(300):
+            directory = directory / "d"
+            directory.mkdir()
+        (directory / "deep.txt").write_text("content")
+
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            paths = self._scan()
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        self.assertEqual(len(paths), 8)
+
+    def test_directory_loop_is_skipped(self):
+        """Test that a directory leading back to an ancestor is not descended into."""
+        directory_id = scantree_module._directory_id
+        root_id = directory_id(str(self.test_root))
+
+        def looping_directory_id(path):
+            # dir1/sub0 leads back to the root, like a bind mount would
+            if Path(path) == self.test_root / "dir1" / "sub0":
+                return root_id
+            return directory_id(path)
+
+        with patch.object(
+            scantree_module, "_directory_id", side_effect=looping_directory_id
+        ), self.assertLogs("lib.scantree", "WARNING"):
+            paths = self._scan()
+
+        self.assertEqual(len(paths), 6)
+        self.assertNotIn("dir1/sub0/file.txt", paths)
+
+    def test_one_file_system(self):
+        """Test that directories on other devices are skipped if requested."""
+        directory_id = scantree_module._directory_id
+
+        def mounted_directory_id(path):
+            device, inode = directory_id(path)
+            if self.test_root / "dir1" in Path(path).parents or Path(path) == (
+                self.test_root / "dir1"
+            ):
+                return device + 1, inode
+            return device, inode
+
+        with patch.object(
+            scantree_module, "_directory_id", side_effect=mounted_directory_id
+        ):
+            self.assertEqual(len(self._scan()), 7)
+            self.assertEqual(
+                self._scan(one_file_system=True),
+                [
+                    "dir0/file.txt",
+                    "dir0/sub0/file.txt",
+                    "dir0/sub1/file.txt",
+                    "file.txt",
+                ],
+            )
+
+    def test_scan_filter(self):
+        """Test that excluded directories are never listed."""
+        list_dir = scantree_module._list_dir
+        listed = []
+
+        def recording_list_dir(path, **kwargs):
+            listed.append(Path(path))
+            return list_dir(path, **kwargs)
+
+        scan_filter = ScanFilter(exclude=["sub0", "dir1/sub1"])
+        with patch.object(
+            scantree_module, "_list_dir", side_effect=recording_list_dir
+        ):
+            paths = self._scan(scan_filter=scan_filter)
+
+        self.assertEqual(
+            paths,
+            ["dir0/file.txt", "dir0/sub1/file.txt", "dir1/file.txt", "file.txt"],
+        )
+        self.assertNotIn(self.test_root / "dir0" / "sub0", listed)
+        self.assertNotIn(self.test_root / "dir1" / "sub1", listed)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import os
+import time
+import unittest
+
+from lib.watchdog import Watchdog, WatchdogCrash, WatchdogTimeout
+
+
+def _steps(report, durations):
+    """Runs one step per (name, seconds) and returns the child's pid."""
+    for name, seconds in durations:
+        report(name)
+        time.sleep(seconds)
+    return os.getpid()
+
+
+def _fail(report):
+    raise ValueError("failed")
+
+
+def _crash(report):
+    report("crash")
+    os._exit(9)
+
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        """Set up a watchdog with a short default budget."""
+        self.watchdog = Watchdog({None: 0.5, "slow": 5})
+
+    def tearDown(self):
+        self.watchdog.close()
+
+    def test_returns_result_from_child(self):
+        """Test that calls run in a reused child process and return their result."""
+        first = self.watchdog.call(_steps, [("fast", 0)])
+        second = self.watchdog.call(_steps, [("fast", 0)])
+
+        self.assertNotEqual(first, os.getpid())
+        self.assertEqual(first, second)
+
+    def test_errors_are_raised(self):
+        """Test that exceptions in the child are raised in the caller."""
+        with self.assertRaises(ValueError):
+            self.watchdog.call(_fail)
+
+    def test_step_exceeding_budget_is_killed(self):
+        """Test that a step over its budget raises and the child is replaced."""
+        first = self.watchdog.call(_steps, [])
+
+        start = time.monotonic()
+        with self.assertRaises(WatchdogTimeout) as raised:
+            self.watchdog.call(_steps, [("fast", 0), ("hang", 60)])
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(raised.exception.step, "hang")
+        self.assertEqual(raised.exception.budget, 0.5)
+        self.assertNotEqual(self.watchdog.call(_steps, []), first)
+
+    def test_crashed_child_is_replaced(self):
+        """Test that a child dying during a call raises and is replaced."""
+        first = self.watchdog.call(_steps, [])
+
+        with self.assertRaises(WatchdogCrash) as raised:
+            self.watchdog.call(_crash)
+
+        self.assertEqual(raised.exception.step, "crash")
+        self.assertNotEqual(self.watchdog.call(_steps, []), first)
+
+    def test_budgets_are_per_step(self):
+        """Test that every step gets its own budget."""
+        self.watchdog.call(_steps, [("a", 0.3), ("b", 0.3), ("slow", 0.7)])
+
+    def test_no_default_budget(self):
+        """Test that steps without a budget are not limited."""
+        watchdog = Watchdog({"hang": 0.2})
+        try:
+            watchdog.call(_steps, [("other", 0.4)])
+            with self.assertRaises(WatchdogTimeout):
+                watchdog.call(_steps, [("hang", 60)])
+        finally:
+            watchdog.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
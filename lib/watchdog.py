@@ -0,0 +1,130 @@
+import logging
+import multiprocessing
+import time
+from typing import Callable, Dict, Optional
+
+
+class WatchdogTimeout(Exception):
+    """Raised when a step of a watched call exceeded its time budget."""
+
+    def __init__(self, step: Optional[str], budget: float):
+        super().__init__(f"{step or 'Call'} exceeded its budget of {budget}s")
+        self.step = step
+        self.budget = budget
+
+
+class WatchdogCrash(Exception):
+    """Raised when the child process died during a watched call."""
+
+    def __init__(self, step: Optional[str]):
+        super().__init__(f"Watchdog child process died during {step or 'call'}")
+        self.step = step
+
+
+def _serve(connection):
+    """Runs calls sent by the watchdog until the connection is closed."""
+
+    def report(step):
+        connection.send(("step", step))
+
+    while True:
+        try:
+            func, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            result = func(report, *args)
+        except Exception as e:
+            connection.send(("error", e))
+        else:
+            connection.send(("result", result))
+
+
+class Watchdog:
+    """
+    Runs calls in a child process and kills it when a step takes too long.
+
+    A watched function receives a report callback as its first argument and calls
+    it with the name of every step it starts (e.g. a provider name). Each step gets
+    its own wall-clock budget, looked up by name and falling back to the default
+    budget under the None key. If a step exceeds its budget, the child process is
+    killed and a fresh one is started for the next call, so a single pathological
+    file cannot block the run. The same goes for a child that dies on its own,
+    e.g. of a crash in a parser.
+
+    The child is started lazily and reused across calls. Functions and arguments
+    must be picklable.
+    """
+
+    def __init__(self, budgets: Dict[Optional[str], float]):
+        self.logger = logging.getLogger(__name__)
+        self.budgets = budgets
+        self._process = None
+        self._connection = None
+
+    def _budget_for(self, step: Optional[str]) -> Optional[float]:
+        return self.budgets.get(step, self.budgets.get(None))
+
+    def _start(self):
+        self._connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child_connection,), daemon=True
+        )
+        self._process.start()
+        child_connection.close()
+
+    def call(self, func: Callable, *args):
+        """
+        Calls func(report, *args) in the child process and returns its result.
+
+        Raises:
+            WatchdogTimeout: If a step exceeded its budget. The child is killed.
+            WatchdogCrash: If the child died, e.g. because it ran out of memory.
+            Exception: Any exception raised by func is raised again here.
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start()
+
+        self._connection.send((func, args))
+        step = None
+        budget = self._budget_for(step)
+        started = time.monotonic()
+        while True:
+            timeout = None
+            if budget is not None:
+                timeout = max(0.0, started + budget - time.monotonic())
+            if not self._connection.poll(timeout):
+                self.logger.warning(f"{step or 'Call'} timed out after {budget}s")
+                self._kill()
+                raise WatchdogTimeout(step, budget)
+
+            try:
+                kind, value = self._connection.recv()
+            except EOFError:
+                # The child died, e.g. because it ran out of memory
+                self._kill()
+                raise WatchdogCrash(step)
+            if kind == "step":
+                step, budget, started = value, self._budget_for(value), time.monotonic()
+            elif kind == "error":
+                raise value
+            else:
+                return value
+
+    def _kill(self):
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+        self._process = None
+        self._connection = None
+
+    def close(self):
+        """Stops the child process, killing it if it does not exit in time."""
+        if self._process is not None:
+            self._connection.close()
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._process = None
+            self._connection = None
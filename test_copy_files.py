@@ -5,6 +5,9 @@ from io import StringIO
 
 from copy_files import main
 
+# Options main() passes to copy_files when no optional flags are given
+DEFAULT_OPTIONS = {"hardlinks": "link"}
+
 
 class TestCopyFiles(unittest.TestCase):
     def setUp(self):
@@ -27,7 +30,27 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with correct argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
+
+    @patch('copy_files.copy_files')
+    def test_main_with_hardlinks(self, mock_copy_files):
+        """Test that --hardlinks is passed through to copy_files."""
+        sys.argv = ["copy_files.py", "--copy-list", "/list.csv", "--hardlinks", "skip"]
+
+        main()
+
+        mock_copy_files.assert_called_once_with("/list.csv", hardlinks="skip")
+
+    @patch('copy_files.copy_files')
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_main_with_invalid_hardlinks(self, mock_stderr, mock_copy_files):
+        """Test that unknown --hardlinks modes are rejected."""
+        sys.argv = ["copy_files.py", "--copy-list", "/list.csv", "--hardlinks", "symlink"]
+
+        with self.assertRaises(SystemExit):
+            main()
+
+        mock_copy_files.assert_not_called()
 
     @patch('copy_files.copy_files')
     def test_main_with_missing_required_argument(self, mock_copy_files):
@@ -83,7 +106,7 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with correct argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
     @patch('copy_files.copy_files')
     def test_main_with_windows_path(self, mock_copy_files):
@@ -96,7 +119,7 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with correct argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
     @patch('copy_files.copy_files')
     def test_main_handles_copy_files_exception(self, mock_copy_files):
@@ -113,7 +136,7 @@ class TestCopyFiles(unittest.TestCase):
             main()
         
         self.assertEqual(str(cm.exception), "Test error")
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
     def test_argument_parser_description(self):
         """Test that argument parser has correct description."""
@@ -155,7 +178,7 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with correct argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
     @patch('copy_files.copy_files')
     def test_main_with_special_characters_in_path(self, mock_copy_files):
@@ -168,7 +191,7 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with correct argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
     @patch('copy_files.copy_files')
     def test_main_preserves_exact_path(self, mock_copy_files):
@@ -181,7 +204,7 @@ class TestCopyFiles(unittest.TestCase):
         main()
         
         # Verify that copy_files was called with the exact argument
-        mock_copy_files.assert_called_once_with(test_copy_list)
+        mock_copy_files.assert_called_once_with(test_copy_list, **DEFAULT_OPTIONS)
 
 
 if __name__ == "__main__":
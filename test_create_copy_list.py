@@ -1,9 +1,28 @@
 import unittest
 from unittest.mock import patch, Mock
 import sys
+import tempfile
 from io import StringIO
+from pathlib import Path
 
 from create_copy_list import main
+from lib.scan_filter import ScanFilter
+
+# Options main() passes to generate_copy_list when no optional flags are given
+DEFAULT_OPTIONS = {
+    "workers": 1,
+    "strategy": "oldest",
+    "cache_dir": None,
+    "retry_undated": False,
+    "routes": None,
+    "timeouts": None,
+    "scan_threads": 1,
+    "max_depth": None,
+    "one_file_system": False,
+    "scan_filter": None,
+    "source_jobs": 1,
+    "jobs_per_device": 1,
+}
 
 
 class TestCreateCopyList(unittest.TestCase):
@@ -28,7 +47,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with correct arguments
-        mock_generate_copy_list.assert_called_once_with([test_source], test_destination)
+        mock_generate_copy_list.assert_called_once_with([test_source], test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_with_multiple_sources(self, mock_generate_copy_list):
@@ -42,7 +61,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with correct arguments
-        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination)
+        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_missing_source_argument(self, mock_generate_copy_list):
@@ -114,7 +133,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with correct arguments
-        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination)
+        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_with_relative_paths(self, mock_generate_copy_list):
@@ -128,7 +147,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with correct arguments
-        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination)
+        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_handles_generate_copy_list_exception(self, mock_generate_copy_list):
@@ -146,7 +165,7 @@ class TestCreateCopyList(unittest.TestCase):
             main()
         
         self.assertEqual(str(cm.exception), "Test error")
-        mock_generate_copy_list.assert_called_once_with([test_source], test_destination)
+        mock_generate_copy_list.assert_called_once_with([test_source], test_destination, **DEFAULT_OPTIONS)
 
     def test_argument_parser_description(self):
         """Test that argument parser has correct description."""
@@ -185,7 +204,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with correct arguments
-        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination)
+        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_source_action_extend_behavior(self, mock_generate_copy_list):
@@ -207,7 +226,7 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with both sources
-        mock_generate_copy_list.assert_called_once_with([test_source1, test_source2], test_destination)
+        mock_generate_copy_list.assert_called_once_with([test_source1, test_source2], test_destination, **DEFAULT_OPTIONS)
 
     @patch('create_copy_list.generate_copy_list')
     def test_main_preserves_exact_paths(self, mock_generate_copy_list):
@@ -221,7 +240,189 @@ class TestCreateCopyList(unittest.TestCase):
         main()
         
         # Verify that generate_copy_list was called with exact arguments
-        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination)
+        mock_generate_copy_list.assert_called_once_with(test_sources, test_destination, **DEFAULT_OPTIONS)
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_workers(self, mock_generate_copy_list):
+        """Test that --workers is passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--workers", "4"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst", **{**DEFAULT_OPTIONS, "workers": 4}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_scan_threads(self, mock_generate_copy_list):
+        """Test that --scan-threads is passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--scan-threads", "16"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst", **{**DEFAULT_OPTIONS, "scan_threads": 16}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_source_jobs(self, mock_generate_copy_list):
+        """Test that --source-jobs and --jobs-per-device are passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/a", "/b", "--destination", "/dst", "--source-jobs", "4", "--jobs-per-device", "2"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/a", "/b"], "/dst", **{**DEFAULT_OPTIONS, "source_jobs": 4, "jobs_per_device": 2}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_scan_limits(self, mock_generate_copy_list):
+        """Test that --max-depth and --one-file-system are passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--max-depth", "2", "--one-file-system"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst", **{**DEFAULT_OPTIONS, "max_depth": 2, "one_file_system": True}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_strategy(self, mock_generate_copy_list):
+        """Test that --strategy is passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--strategy", "priority-first"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst", **{**DEFAULT_OPTIONS, "strategy": "priority-first"}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_main_with_unknown_strategy(self, mock_stderr, mock_generate_copy_list):
+        """Test that unknown strategies are rejected."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--strategy", "newest"]
+
+        with self.assertRaises(SystemExit):
+            main()
+
+        mock_generate_copy_list.assert_not_called()
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_retry_undated(self, mock_generate_copy_list):
+        """Test that --retry-undated is passed through to generate_copy_list."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--retry-undated"]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst", **{**DEFAULT_OPTIONS, "retry_undated": True}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_routes(self, mock_generate_copy_list):
+        """Test that --route overrides are collected into a dict."""
+        sys.argv = [
+            "create_copy_list.py", "--source", "/src", "--destination", "/dst",
+            "--route", "HachoirFileCreationDateProvider=jpeg,isobmff",
+            "--route", "FilenameFileCreationDateProvider=all",
+        ]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst",
+            **{
+                **DEFAULT_OPTIONS,
+                "routes": {
+                    "HachoirFileCreationDateProvider": ["jpeg", "isobmff"],
+                    "FilenameFileCreationDateProvider": None,
+                },
+            }
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_main_with_invalid_routes(self, mock_stderr, mock_generate_copy_list):
+        """Test that routes with unknown providers or file types are rejected."""
+        for route in ["HachoirFileCreationDateProvider", "Unknown=jpeg", "HachoirFileCreationDateProvider=docx"]:
+            with self.subTest(route=route):
+                sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--route", route]
+
+                with self.assertRaises(SystemExit):
+                    main()
+
+        mock_generate_copy_list.assert_not_called()
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_provider_timeouts(self, mock_generate_copy_list):
+        """Test that --provider-timeout collects a default and per-provider budgets."""
+        sys.argv = [
+            "create_copy_list.py", "--source", "/src", "--destination", "/dst",
+            "--provider-timeout", "30",
+            "--provider-timeout", "HachoirFileCreationDateProvider=2.5",
+        ]
+
+        main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst",
+            **{**DEFAULT_OPTIONS, "timeouts": {None: 30.0, "HachoirFileCreationDateProvider": 2.5}}
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_main_with_invalid_provider_timeouts(self, mock_stderr, mock_generate_copy_list):
+        """Test that timeouts for unknown providers or without a valid duration are rejected."""
+        for timeout in ["Unknown=10", "HachoirFileCreationDateProvider=soon", "0"]:
+            with self.subTest(timeout=timeout):
+                sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--provider-timeout", timeout]
+
+                with self.assertRaises(SystemExit):
+                    main()
+
+        mock_generate_copy_list.assert_not_called()
+
+    @patch('create_copy_list.generate_copy_list')
+    def test_main_with_scan_filter(self, mock_generate_copy_list):
+        """Test that scan rules of the config file and the command line are combined."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = Path(temp_dir) / "scan.ini"
+            config_path.write_text("[scan]\nexclude = @eaDir, .git\n", encoding="utf-8")
+            sys.argv = [
+                "create_copy_list.py", "--source", "/src", "--destination", "/dst",
+                "--config", str(config_path),
+                "--exclude", "node_modules",
+                "--include", "IMG_*",
+                "--extensions", "jpg,heic",
+                "--exclude-extensions", "db",
+            ]
+
+            main()
+
+        mock_generate_copy_list.assert_called_once_with(
+            ["/src"], "/dst",
+            **{
+                **DEFAULT_OPTIONS,
+                "scan_filter": ScanFilter(
+                    include=["IMG_*"],
+                    exclude=["@eaDir", ".git", "node_modules"],
+                    extensions=["jpg", "heic"],
+                    exclude_extensions=["db"],
+                ),
+            }
+        )
+
+    @patch('create_copy_list.generate_copy_list')
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_main_with_invalid_config(self, mock_stderr, mock_generate_copy_list):
+        """Test that a missing config file is rejected."""
+        sys.argv = ["create_copy_list.py", "--source", "/src", "--destination", "/dst", "--config", "/missing/scan.ini"]
+
+        with self.assertRaises(SystemExit):
+            main()
+
+        mock_generate_copy_list.assert_not_called()
 
 
 if __name__ == "__main__":